@@ -1,3 +1,7 @@
+# optional startup profiling (WEBAPP_STARTUP_PROFILE=report.json), has to be installed before anything else is imported
+from util.startup_profiler import startup_profiler
+startup_profiler.install_from_env()
+
 import dash
 import flask
 from dash import Dash, html
@@ -45,6 +49,9 @@ fluid=True,
 className="vh-100 d-flex flex-column"
 )
 
+# writes the startup profile, if enabled
+startup_profiler.finish()
+
 if __name__ == '__main__':
 	# processes=6, threaded=False,
 	app.run(debug=True, threaded=True, host='0.0.0.0', port='8080')
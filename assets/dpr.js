@@ -2,6 +2,13 @@ window.dash_clientside = Object.assign({}, window.dash_clientside, {
 	utils: {
 		getDevicePixelRatio: function(_) {
 			return window.devicePixelRatio || 1;
+		},
+		// random id of this page load, the server uses it to drop outdated plot updates (see request_sequencer.py)
+		getSessionId: function(_) {
+			if (!window.webappSessionId) {
+				window.webappSessionId = (window.crypto && window.crypto.randomUUID) ? window.crypto.randomUUID() : Math.random().toString(36).slice(2) + Date.now().toString(36);
+			}
+			return window.webappSessionId;
 		}
 	}
-});
\ No newline at end of file
+});
@@ -0,0 +1,54 @@
+import gc
+import os
+
+# Gunicorn settings for the production server, picked up automatically from the working directory:
+# $ poetry run gunicorn app:server
+#
+# The app is imported once in the master process (preload_app), so all manifolds, distributions,
+# meshes and figures are built before forking and shared copy-on-write between the workers.
+# Command line arguments still override these settings, eg. --workers 32
+
+bind = os.environ.get("WEBAPP_BIND", "0.0.0.0:8080")
+# several workers by default, they share the preloaded (and frozen, see when_ready) app copy-on-write,
+# so each additional worker costs little memory and lets plots of different sessions compute in parallel (threads of one worker share the GIL)
+# the request sequencer only drops outdated requests of a session within one worker: requests of a drag spread over the workers
+# are all computed, the browser still only shows the newest. Behind a load balancer with sticky sessions nothing is computed twice
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+# callbacks do not modify shared state, so threads are safe
+# with several threads, outdated requests of a session queue up and are dropped (see RequestSequencer)
+threads = int(os.environ.get("WEBAPP_THREADS", 4))
+preload_app = True
+timeout = 120
+
+# numpy/scipy would otherwise start one BLAS/OpenMP thread per core in every worker
+# has to be set before the app (and with it numpy) is imported
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+	os.environ.setdefault(_var, os.environ.get("WEBAPP_BLAS_THREADS", "1"))
+
+# no collections while the app is built, the freed gaps would be refilled and dirtied later
+gc.disable()
+
+
+def when_ready(server):
+	if server.cfg.workers > 1:
+		server.log.info(f"Running {server.cfg.workers} workers, outdated plot requests of a session are only dropped within each worker (see RequestSequencer)")
+
+	# distributions are instantiated lazily on first use, which would happen once per worker
+	# build all of them here instead, so they are shared as well
+	from model.distributions.distribution_loader import DistributionLoader
+	DistributionLoader.load_all()
+
+	# the app is fully imported at this point, render it once so that dash builds its lazily created state
+	# (layout, callback map, index page) in the master as well, instead of once per worker
+	try:
+		with server.app.wsgi().test_client() as client:
+			for url in ("/", "/_dash-layout", "/_dash-dependencies"):
+				client.get(url)
+	except Exception as e:
+		server.log.warning(f"Warmup request failed: {e}")
+
+	# move everything that exists now into the permanent generation,
+	# the collectors of the workers then never touch (and thereby copy) these pages
+	gc.collect()
+	gc.freeze()
+	gc.enable()
@@ -1,6 +1,4 @@
 import numpy as np
-from scipy.spatial import ConvexHull
-import plotly.figure_factory as ff
 from scipy.spatial import Delaunay
 
 
@@ -10,6 +8,8 @@ from model.manifold import Manifold
 from renderer.plot_settings_2d import PlotSettings2D
 from model.distributions.cylinder.uniform.fibonacci_kronecker import CylinderFibUniformSampling
 from util.selectors.slider import Slider
+from util.artifact_store import artifact_store
+from util.mesh_util import MeshUtil
 
 class Cylinder(Manifold):
 	def __init__(self, resolution=100, r=1):
@@ -18,7 +18,8 @@ class Cylinder(Manifold):
 		self.distributions = DistributionLoader(CylinderDistribution, "model.distributions.cylinder").get_distributions()
 
 		self.r = r
-		self.mesh_xyz = self._init_mesh()
+		self.mesh_xyz = artifact_store.load_or_build("cylinder_mesh", self._init_mesh, resolution=3000, r=self.r)
+		self.coarse_mesh_xyz = artifact_store.load_or_build("cylinder_mesh", self._init_mesh, resolution=400, r=self.r)
 
 		axes_2d = (
 			np.arange(0, 2.5 * np.pi, np.pi / 2), # 0, π/2, π, 3π/2, 2π
@@ -58,11 +59,11 @@ class Cylinder(Manifold):
 
 		return x, y, z
 	
-	def update_sample(self, selected_distribution, selected_sampling_method, sample_options, distribution_options):
-		dist = self.distributions[selected_distribution]
-		sampling_method = dist.sampling_method_dict[selected_sampling_method]
-		new_sample = sampling_method.sample(sample_options, distribution_options)
+	@property
+	def cache_key(self):
+		return (type(self).__name__, self.r)
 
+	def convert_sample(self, new_sample):
 		if (new_sample is None) or new_sample.size == 0:
 			samples = np.empty((0, 3), dtype=float)
 			samples_2d = np.empty((0, 2), dtype=float)
@@ -94,18 +95,20 @@ class Cylinder(Manifold):
 		x, y, z = self.p_z_to_xyz(xy[:,0], xy[:,1], self.r)
 		return pdf(np.column_stack((x, y, z)))
 	
-	def generate_mesh(self, pdf, alpha=1):
+	def generate_mesh(self, pdf, alpha=1, coarse=False):
+		mesh_xyz = self.wireframe(coarse)
+
 		# mesh_xyz has nans for line segments, mask before passing to pdf
-		mask = np.all(np.isfinite(self.mesh_xyz), axis=-1)
-		dens = pdf(self.mesh_xyz[mask]) # only extrude on p, dont change z
+		mask = np.all(np.isfinite(mesh_xyz), axis=-1)
+		dens = pdf(mesh_xyz[mask]) # only extrude on p, dont change z
 
-		xyz_extruded = np.full_like(self.mesh_xyz, np.nan, dtype=float) # full of nans
+		xyz_extruded = np.full_like(mesh_xyz, np.nan, dtype=float) # full of nans
 
-		xyz_extruded[..., :2][mask] =  self.mesh_xyz[..., :2][mask] * (1 + alpha * dens[:, np.newaxis])
-		xyz_extruded[..., 2][mask] = self.mesh_xyz[..., 2][mask] # z unchanged
+		xyz_extruded[..., :2][mask] =  mesh_xyz[..., :2][mask] * (1 + alpha * dens[:, np.newaxis])
+		xyz_extruded[..., 2][mask] = mesh_xyz[..., 2][mask] # z unchanged
 		return xyz_extruded[:,0], xyz_extruded[:,1], xyz_extruded[:,2]
 	
-	def _init_mesh(self, resolution=3000):
+	def _init_mesh(self, resolution=3000, r=1):
 		pz = CylinderFibUniformSampling.sample(None, [Slider("Number of Samples", 10, resolution, resolution)] , [])
 		#pz[:, 1] = -0.1 + (pz[:, 1]) * 1.1 # extend slightly beyond [0, 2pi] so the top and bottom looks better
 
@@ -118,7 +121,7 @@ class Cylinder(Manifold):
 			pz = np.vstack((pz, np.array([p, z_bottom])))
 			pz = np.vstack((pz, np.array([p, z_top])))
 
-		x, y, z = self.p_z_to_xyz(pz[:,0], pz[:,1], self.r)
+		xyz = np.column_stack(self.p_z_to_xyz(pz[:,0], pz[:,1], r))
 
 		simplices = Delaunay(pz).simplices
 		ok_mask = (pz[:, 0] > np.pi / 4) & (pz[:, 0] < 7 * np.pi / 4) # ugly seam
@@ -146,16 +149,4 @@ class Cylinder(Manifold):
 		simplices_merged = np.vstack((simplices, simplices_2))
 		simplices_merged = np.unique(simplices_merged, axis=0)
 
-		def cf(xi, yi, zi, zmin=np.min(z), zmax=np.max(z)):
-			if zi > zmax:
-				zi = np.nextafter(zmax, zmin)
-			return zi
-
-		fig = ff.create_trisurf(x=x, y=y, z=z,
-								simplices=simplices_merged,
-								show_colorbar=False,
-								color_func=cf
-								)
-		
-		arr =  np.column_stack((fig.data[1].x, fig.data[1].y, fig.data[1].z))
-		return np.where(arr == None, np.nan, arr).astype(float) # line segments have None in them, put them to nan so we can do mult later
+		return MeshUtil.wireframe(xyz, simplices_merged) # line segments are separated by nan rows, so we can do mult later
@@ -1,4 +1,5 @@
 from pathlib import Path
+from functools import lru_cache
 import plotly
 import dash
 from dash import dcc, html, Input, Output, callback, Patch, callback_context
@@ -6,15 +7,19 @@ import plotly.graph_objects as go
 import dash_bootstrap_components as dbc
 from numpy import sqrt, linspace, pi, sign, exp, square, array, diff, matmul, zeros, meshgrid
 from numpy.random import randint
-from numpy.linalg import det, solve
+from numpy.linalg import det, inv
 
 from components.popup_box import PopupBox
 from components.label import Label
 
 
 from model.selfcontained_distribution import SelfContainedDistribution
+from util.typed_array import TypedArray
 
 class Conditional(SelfContainedDistribution):
+	# error budget of the plotted densities (see TypedArray), rescaled to height 1
+	density_tolerance = 1e-4
+
 	def __init__(self):
 		# Colors
 		col_marginal = plotly.colors.qualitative.Plotly[0]
@@ -184,28 +189,15 @@ class Conditional(SelfContainedDistribution):
 		def update(ys, ρ):
 			patched_fig = Patch()
 			# Joint Parameters
-			μ = zeros([2, 1])
-			sx = 1
-			sy = 1
-			# TODO special treatment for singular density
-			ρ = sign(ρ) * min(abs(ρ), .9999)
-			C = array([[sx**2, sx*sy*ρ], [sx*sy*ρ, sy**2]])
+			μ, C = self.joint_parameters(ρ)
 			# Marginal Parameters
-			µMarginal = µ[0]
 			CMarginal = C[0, 0]
 			marginal_fac = 1 / self.gauss1(0, 0, CMarginal)
 			# Density has been modified? 
 			if (callback_context.triggered_id == "joint-ρ") | (callback_context.triggered_id is None):
-				zMarginal = self.gauss1(self.xv, µMarginal, CMarginal) 
-				patched_fig['data'][1]['z'] = zMarginal * marginal_fac
-				# Compute new joint density values
-				# TODO should be more elegant than 2 for loops
-				zJoint = self.xm*0
-				for i in range(self.xm.shape[0]):
-					for j in range(self.xm.shape[1]):
-						zJoint[i, j] = self.gauss2(self.xm[i, j], self.ym[i, j], μ, C)
-				zJoint = zJoint / self.gauss2(0, 0, zeros([2, 1]), C)  # rescale to height 1
-				patched_fig['data'][0]['z'] = zJoint
+				zJoint, zMarginal = self.surface(ρ)
+				patched_fig['data'][1]['z'] = TypedArray.encode(zMarginal * marginal_fac, self.density_tolerance)
+				patched_fig['data'][0]['z'] = TypedArray.encode(zJoint, self.density_tolerance)
 			# Compute Conditional
 			# https://www.math.uwaterloo.ca/~hwolkowi/matrixcookbook.pdf
 			µCond = µ[0] + C[0, 1] / C[1, 1] * (ys-µ[1])
@@ -219,17 +211,41 @@ class Conditional(SelfContainedDistribution):
 			patched_fig['data'][3]['z'] = zSlice + 1e-3
 			return patched_fig
 
+	@staticmethod
+	def joint_parameters(ρ):
+		μ = zeros([2, 1])
+		sx = 1
+		sy = 1
+		# TODO special treatment for singular density
+		ρ = sign(ρ) * min(abs(ρ), .9999)
+		C = array([[sx**2, sx*sy*ρ], [sx*sy*ρ, sy**2]])
+		return μ, C
+
+	# joint density on the grid (rescaled to height 1) and marginal f(x), they only depend on ρ
+	# cached, so moving ŷ or returning to a ρ never recomputes the surface; arrays are read only
+	@lru_cache(maxsize=64)
+	def surface(self, ρ):
+		μ, C = self.joint_parameters(ρ)
+		zJoint = self.gauss2(self.xm, self.ym, μ, C)
+		zJoint = zJoint / self.gauss2(0, 0, zeros([2, 1]), C)  # rescale to height 1
+		zMarginal = self.gauss1(self.xv, μ[0], C[0, 0])
+		zJoint.flags.writeable = False
+		zMarginal.flags.writeable = False
+		return zJoint, zMarginal
+
 	@staticmethod	
 	def gauss1(x, μ, C):
 		return 1/sqrt(2*pi*C) * exp(-1/2 * square((x-μ))/C)
 
 
+	# x and y are arrays of the same shape (eg. the whole grid), the inverse and determinant are computed once for all points
 	@staticmethod
 	def gauss2(x, y, μ, C):
-		d = array([x-μ[0], y-μ[1]])
-		d = d.reshape(-1, 1)  # to column vector
-		f = 1/sqrt(det(2*pi*C)) * exp(-1/2 * matmul(d.T, solve(C, d)))
-		return f[0][0]
+		dx = x - μ[0]
+		dy = y - μ[1]
+		P = inv(C)
+		q = P[0, 0] * square(dx) + 2 * P[0, 1] * dx * dy + P[1, 1] * square(dy)
+		return 1/sqrt(det(2*pi*C)) * exp(-1/2 * q)
 
 		
 
@@ -10,6 +10,8 @@ from util.gaus_util import GausUtil as gu
 from util.cartesian_util import CartesianUtil as cu
 
 class CylinderFibCartPWNSampling(CylinderSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderSquare("Number of Samples", 4, 16, 100, 4))
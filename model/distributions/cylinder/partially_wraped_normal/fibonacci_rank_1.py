@@ -9,6 +9,8 @@ from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper
 from util.gaus_util import GausUtil as gu
 
 class CylinderFibRank1PWNSampling(CylinderSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderFib("Number of Samples", 3, 33, 21, 9, minus_1=True))
@@ -8,6 +8,8 @@ from util.gaus_util import GausUtil as gu
 
 
 class IFrolovPWNSampling(CylinderSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		def _check_input(val):
 			return val >= 1 and val <= 100003 and isinstance(val, int)
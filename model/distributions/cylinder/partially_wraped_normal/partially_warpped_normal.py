@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.stats import multivariate_normal
 
 from util.selectors.slider_float import FloatSlider 
 from util.selectors.slider_pi import PiSlider
@@ -13,6 +12,7 @@ from model.distributions.cylinder.partially_wraped_normal.improved_frolov import
 from model.distributions.cylinder.partially_wraped_normal.fibonacci_frolov import FFrolovPWNSampling
 
 from model.cylinder.cylinder import Cylinder
+from util.wrapped_normal_util import WrappedNormalUtil
 
 class PartiallyWrappedNormalDistribution(CylinderDistribution):
 	def __init__(self):
@@ -50,25 +50,14 @@ class PartiallyWrappedNormalDistribution(CylinderDistribution):
 
 		mean = np.array([mean_x, mean_y])
 
-		dist = multivariate_normal(mean=mean, cov=Cov, allow_singular=True)
-
 		def pdf(x):
 			alpha = 0.7 # scale
 
 			p, z = Cylinder.xyz_to_p_z(x[:,0], x[:,1], x[:,2])
 			p_z = np.column_stack((p, z))
 
-			# wrap until 3 * sigma_x
-			k = int(np.ceil(3 * sigma_x / (2 * np.pi)))
-
-			total_pdf = np.zeros(p_z.shape[0])
-			for i in range(-k, k+1):
-				shifted_samples = np.column_stack((p_z[:,0] + i * 2 * np.pi, p_z[:,1]))
-				total_pdf += dist.pdf(shifted_samples)
-
-			max = np.max(total_pdf)
-
-			norm = total_pdf / max
+			# wrapped on p only, all wraps in one pass, normalized to a maximum of 1
+			norm = WrappedNormalUtil.relative_density(p_z, mean, Cov, periodic=(True, False))
 			norm = norm * alpha
 			return norm
 
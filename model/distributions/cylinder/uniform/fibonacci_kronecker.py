@@ -5,6 +5,8 @@ import numpy as np
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
 
 class CylinderFibUniformSampling(CylinderSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000))
@@ -6,6 +6,8 @@ import sympy as sp
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
 
 class CylinderFibRank1UniformSampling(CylinderSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderFib("Number of Samples", 2, 34, 21, 9))
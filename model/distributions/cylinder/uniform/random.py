@@ -6,6 +6,9 @@ from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper
 
 
 class CylinderRandomUniformSampling(CylinderSamplingSchema):
+	# independent draws, more samples only append new ones
+	prefix_stable = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000))
@@ -1,6 +1,12 @@
 import importlib
 import inspect
+import json
 import pkgutil
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+
+MANIFEST_NAME = "manifest.json"
 
 
 class DistributionLoader:
@@ -8,39 +14,198 @@ class DistributionLoader:
 	Class for loading different probability distributions with a plugin pattern.
 
 	modeled after: https://www.researchgate.net/figure/Class-diagram-for-the-Plugin-Pattern_fig6_221039844
+
+	The plugins of a package are listed in its manifest.json (name, module, class, sampling methods and options),
+	so listing them does not import anything. A distribution is only imported and instantiated on first access.
+	Packages without a manifest fall back to walking and importing all modules.
+
+	Regenerate the manifests after adding or renaming distributions or sampling methods:
+	$ PYTHONPATH=$PWD poetry run python model/distributions/distribution_loader.py
 	"""
+
+	# one registry per package, so several manifold instances share the same distributions
+	_registries = {}
+	_registries_lock = threading.Lock()
+
 	def __init__(self, type, type_package):
 		self.distribution_type = type
 		self.distribution_package = type_package
-		self.distributions = {}
 
-		self.load_distributions()
+		with DistributionLoader._registries_lock:
+			if type_package not in DistributionLoader._registries:
+				DistributionLoader._registries[type_package] = DistributionRegistry(type, type_package)
+			self.distributions = DistributionLoader._registries[type_package]
+
+	def get_distributions(self):
+		return self.distributions
 
+	# instantiates every distribution of every registry created so far
+	# eg. in the gunicorn master, so the workers share them instead of each building their own
+	@staticmethod
+	def load_all():
+		with DistributionLoader._registries_lock:
+			registries = list(DistributionLoader._registries.values())
 
-	def load_distributions(self):
-		pkg = importlib.import_module(self.distribution_package)
-		if not hasattr(pkg, "__path__"):
-			raise ValueError(f"'{self.distribution_package}' is not a package (missing __path__).")
-		
-		for finder, name, ispkg in pkgutil.walk_packages(pkg.__path__, prefix=pkg.__name__ + "."):
-			if "benchmark" in name:
-				continue
+		for registry in registries:
+			registry.load_all()
+
+
+class DistributionRegistry(Mapping):
+	"""
+	Read only mapping from distribution name to distribution instance, which instantiates lazily.
+	Iteration order is the order of the manifest.
+	Distributions that fail to load are reported once and then dropped, they are no longer listed.
+	"""
+	def __init__(self, type, type_package):
+		self.distribution_type = type
+		self.distribution_package = type_package
+
+		self._instances = {}
+		self._failed = set()
+		self._lock = threading.Lock()
+
+		self.manifest = self.read_manifest(type_package)
+		if self.manifest is None:
+			print(f"No {MANIFEST_NAME} for '{type_package}', importing all modules")
+			self.manifest, self._instances = walk_package(type, type_package)
+
+		self._entries = {entry["name"]: entry for entry in self.manifest}
+
+	def __getitem__(self, name):
+		instance = self._instances.get(name)
+		if instance is not None:
+			return instance
+
+		if name in self._failed:
+			raise KeyError(name)
+		entry = self._entries[name] # KeyError for unknown names, like a dict
+
+		with self._lock:
+			# another thread might have built or failed it while waiting for the lock
+			if name in self._failed:
+				raise KeyError(name)
+			if name not in self._instances:
+				try:
+					self._instances[name] = self._instantiate(entry)
+				except KeyError:
+					self._failed.add(name)
+					raise
+			return self._instances[name]
+
+	def __iter__(self):
+		return (name for name in self._entries if name not in self._failed)
+
+	def __len__(self):
+		return len(self._entries) - len(self._failed)
+
+	# sampling method names from the manifest, without instantiating the distribution
+	def sampling_method_names(self, name):
+		return [m["name"] for m in self._entries[name]["sampling_methods"]]
+
+	def is_loaded(self, name):
+		return name in self._instances
+
+	def load_all(self):
+		for name in list(self):
 			try:
-				module = importlib.import_module(name)
-			except Exception as e:
-				print(f"Could not import distribution module '{name}': {e}")
+				self[name]
+			except KeyError:
+				pass # already reported
+
+	def _instantiate(self, entry):
+		try:
+			module = importlib.import_module(entry["module"])
+			instance = getattr(module, entry["class"])()
+		except Exception as e:
+			print(f"Could not load distribution '{entry['name']}' from '{entry['module']}': {e}")
+			raise KeyError(entry["name"]) from e
+
+		if instance.get_name() != entry["name"]:
+			print(f"Distribution '{entry['module']}.{entry['class']}' is named '{instance.get_name()}', but '{entry['name']}' in {MANIFEST_NAME}, regenerate it")
+		return instance
+
+	@staticmethod
+	def manifest_path(type_package):
+		pkg = importlib.import_module(type_package)
+		return Path(next(iter(pkg.__path__))) / MANIFEST_NAME
+
+	@staticmethod
+	def read_manifest(type_package):
+		try:
+			with open(DistributionRegistry.manifest_path(type_package), encoding="utf-8") as f:
+				return json.load(f)
+		except FileNotFoundError:
+			return None
+
+
+# imports every module of the package and instantiates every distribution found
+# returns the manifest entries and the instances, both in walk order
+def walk_package(type, type_package):
+	pkg = importlib.import_module(type_package)
+	if not hasattr(pkg, "__path__"):
+		raise ValueError(f"'{type_package}' is not a package (missing __path__).")
+
+	manifest = []
+	instances = {}
+	for finder, name, ispkg in pkgutil.walk_packages(pkg.__path__, prefix=pkg.__name__ + "."):
+		if "benchmark" in name:
+			continue
+		try:
+			module = importlib.import_module(name)
+		except Exception as e:
+			print(f"Could not import distribution module '{name}': {e}")
+			continue
+
+		for _, obj in inspect.getmembers(module, inspect.isclass):
+			# skip abstract, parametered intervace and non-subclasses
+			if obj is type:
+				continue
+			if not issubclass(obj, type):
+				continue
+			if inspect.isabstract(obj):
 				continue
 
-			for _, obj in inspect.getmembers(module, inspect.isclass):
-				# skip abstract, parametered intervace and non-subclasses
-				if obj is self.distribution_type:
-					continue
-				if not issubclass(obj, self.distribution_type):
-					continue
-				if inspect.isabstract(obj):
-					continue
+			instance = obj()
+			# classes are also members of the modules importing them
+			if instance.get_name() in instances:
+				continue
+			instances[instance.get_name()] = instance
+			manifest.append(manifest_entry(instance))
 
-				self.distributions[obj().get_name()] = obj()
+	return manifest, instances
 
-	def get_distributions(self):
-		return self.distributions
+
+def manifest_entry(distribution):
+	def option_names(options):
+		# manual input wrappers hold the actual slider
+		return [getattr(opt, "name", None) or getattr(getattr(opt, "slider", None), "name", None) for opt in options]
+
+	return {
+		"name": distribution.get_name(),
+		"module": type(distribution).__module__,
+		"class": type(distribution).__name__,
+		"distribution_options": option_names(distribution.distribution_options),
+		"sampling_methods": [
+			{"name": m.get_name(), "sample_options": option_names(m.sample_options)}
+			for m in distribution.sampling_methods
+		],
+	}
+
+
+def write_manifest(type, type_package):
+	manifest, _ = walk_package(type, type_package)
+	path = DistributionRegistry.manifest_path(type_package)
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump(manifest, f, indent="\t", ensure_ascii=False)
+		f.write("\n")
+	print(f"Wrote {len(manifest)} distributions to '{path}'")
+
+
+if __name__ == "__main__":
+	from model.distributions.sphere.sphere_distribution import SphereDistribution
+	from model.distributions.torus.torus_distribution import TorusDistribution
+	from model.distributions.cylinder.cylinder_distribution import CylinderDistribution
+
+	write_manifest(SphereDistribution, "model.distributions.sphere")
+	write_manifest(TorusDistribution, "model.distributions.torus")
+	write_manifest(CylinderDistribution, "model.distributions.cylinder")
@@ -1,6 +1,7 @@
+from functools import lru_cache
 import plotly
 import dash
-from dash import dcc, html, Input, Output, callback, Patch
+from dash import dcc, html, Input, Output, callback, Patch, ctx
 import plotly.graph_objects as go
 import dash_bootstrap_components as dbc
 from numpy import sqrt, linspace, vstack, pi, nan, full, exp, square, sort, arange, array
@@ -10,8 +11,12 @@ from pathlib import Path
 
 from components.popup_box import PopupBox
 from model.selfcontained_distribution import SelfContainedDistribution
+from util.typed_array import TypedArray
 
 class Gaus1D(SelfContainedDistribution):
+	# error budget of the plotted coordinates (see TypedArray), the x axis spans 10 units
+	coordinate_tolerance = 1e-3
+
 	def __init__(self):
 		self.methods = ['iid', 'Golden-Sequence', 'Equidistant', 'Unscented']
 
@@ -31,6 +36,29 @@ class Gaus1D(SelfContainedDistribution):
 		self.col_samples = plotly.colors.qualitative.Plotly[0]
 
 
+		# created once, the callback only patches the data of the traces
+		# https://plotly.com/python-api-reference/generated/plotly.graph_objects.Scatter.html
+		# TODO lighter fillcolor: fillcolor=matplotlib.colors.to_rgba('#aabbcc80')
+		self.fig = go.Figure(
+			data=[
+				go.Scatter(x=[], y=[], hoverinfo='skip', line={'width': 5}, line_shape='spline', name='Density', fill='tozeroy', marker_color=self.col_density, showlegend=True),
+				go.Scatter(x=[], y=[], name='Samples', mode='lines', marker_color=self.col_samples, showlegend=True),
+			]
+		)
+		# Style
+		self.fig.update_xaxes(range=self.rang, tickmode='array', tickvals=list(range(-5, 6)))
+		self.fig.update_yaxes(range=[0, None], fixedrange=True)
+		self.fig.update_layout(legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1))
+		self.fig.update_layout(dragmode="pan")
+
+		self.fig.update_layout(
+			legend=dict(
+				orientation="v",
+				xanchor="right",
+				x=0.1,
+			)
+		)
+
 		path = Path(__file__).parent / "info_text.md"
 		with open(path, 'r') as f:
 			self.info_text = dcc.Markdown(f.read(), mathjax=True)
@@ -81,7 +109,7 @@ class Gaus1D(SelfContainedDistribution):
 			)
 		]
 		self.plot_layout = [
-			dcc.Graph(id="gauss1D-graph", config=self.config, style={'height': '100%'}),
+			dcc.Graph(id="gauss1D-graph", figure=self.fig, config=self.config, style={'height': '100%'}),
 		]
 
 		self._register_callbacks()
@@ -124,60 +152,72 @@ class Gaus1D(SelfContainedDistribution):
 			Input("gauss1D-σ", "value"),
 		)
 		def update(smethod, p, L, μ, σ):
-			fig = go.Figure() # TODO use Patch here too
+			patched_fig = Patch()
+
+			# Density has been modified? the sample sliders only move the samples
+			if ctx.triggered_id in ("gauss1D-μ", "gauss1D-σ", None):
+				x, y = self.density(μ, σ)
+				patched_fig['data'][0]['x'] = TypedArray.encode(x, self.coordinate_tolerance)
+				patched_fig['data'][0]['y'] = TypedArray.encode(y, self.coordinate_tolerance)
+				if σ == 0:
+					# Dirac Delta
+					patched_fig['data'][0]['name'] = 'Dirac Delta'
+					patched_fig['data'][0]['fill'] = 'none'
+					patched_fig['data'][0]['line']['shape'] = 'linear'
+				else:
+					patched_fig['data'][0]['name'] = 'Density'
+					patched_fig['data'][0]['fill'] = 'tozeroy'
+					patched_fig['data'][0]['line']['shape'] = 'spline'
 
 			if σ == 0:
-				# Dirac Delta
-				fig.add_trace(go.Scatter(x=[self.rang[0], μ, μ, μ, self.rang[1]], y=[0, 0, 1, 0, 0], hoverinfo='skip', line={'width': 5}, name='Dirac Delta', marker_color=self.col_density, showlegend=True))
-				if L > 0:
-					fig.add_trace(go.Scatter(x=[μ, μ], y=[0, 1], name='Samples', mode='lines', marker_color=self.col_samples, showlegend=True))
-			else:
-				# Draw Samples
-				xGauss = None
-				match smethod:
-					case 'iid':
-						# xUni = sort(rand(L))
-						xGauss = sort(randn(L)*σ + μ)
-					case 'Golden-Sequence':
-						xUni = (sqrt(5)-1)/2 * (arange(L)+1+round(p)) % 1
-					case 'Equidistant':
-						xUni = (2*arange(L)+1+p)/(2*L)
-					case 'Unscented':
-						# TODO scaled unscented etc
-						xGauss = array([μ-σ, μ+σ])  # TODO parameter
-					case _:
-						raise Exception("Wrong smethod")
-				# Transform Samples
-				if xGauss is None:
-					xGauss = σ*sqrt(2)*erfinv(2*xUni-1) + μ
-				L2 = len(xGauss)
-				sample_height = full([1, L2], self.gauss1(0, 0, σ))
-				# sample_height = full([1, L], 1/L)
-				# Plot Density
-				s = linspace(self.rang[0], self.rang[1], 500)
-				# https://plotly.com/python-api-reference/generated/plotly.graph_objects.Scatter.html
-				# TODO lighter fillcolor: fillcolor=matplotlib.colors.to_rgba('#aabbcc80')
-				fig.add_trace(go.Scatter(x=s, y=self.gauss1(s, μ, σ), hoverinfo='skip', line={'width': 5}, line_shape='spline', name='Density', fill='tozeroy', marker_color=self.col_density, showlegend=True))
-				# Plot Samples
-				xp = vstack((xGauss, xGauss, full([1, L2], nan))).T.flatten()
-				yp = vstack((full([1, L2], 0), sample_height, full([1, L2], nan))).T.flatten()
-				fig.add_trace(go.Scatter(x=xp, y=yp, name='Samples', mode='lines', marker_color=self.col_samples, showlegend=True))
-			# Style
-			fig.update_xaxes(range=self.rang, tickmode='array', tickvals=list(range(-5, 6)))
-			fig.update_yaxes(range=[0, None], fixedrange=True)
-			fig.update_layout(legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1))
-			fig.update_layout(dragmode="pan")
-
-			fig.update_layout(
-				legend=dict(
-					orientation="v",
-					xanchor="right",
-					x=0.1,
-				)
-			)
-			return fig
+				patched_fig['data'][1]['x'] = [μ, μ]
+				patched_fig['data'][1]['y'] = [0, 1]
+				patched_fig['data'][1]['visible'] = L > 0
+				return patched_fig
+
+			# Draw Samples
+			xGauss = None
+			match smethod:
+				case 'iid':
+					# xUni = sort(rand(L))
+					xGauss = sort(randn(L)*σ + μ)
+				case 'Golden-Sequence':
+					xUni = (sqrt(5)-1)/2 * (arange(L)+1+round(p)) % 1
+				case 'Equidistant':
+					xUni = (2*arange(L)+1+p)/(2*L)
+				case 'Unscented':
+					# TODO scaled unscented etc
+					xGauss = array([μ-σ, μ+σ])  # TODO parameter
+				case _:
+					raise Exception("Wrong smethod")
+			# Transform Samples
+			if xGauss is None:
+				xGauss = σ*sqrt(2)*erfinv(2*xUni-1) + μ
+			L2 = len(xGauss)
+			sample_height = full([1, L2], self.gauss1(0, 0, σ))
+			# sample_height = full([1, L], 1/L)
+			# Plot Samples
+			xp = vstack((xGauss, xGauss, full([1, L2], nan))).T.flatten()
+			yp = vstack((full([1, L2], 0), sample_height, full([1, L2], nan))).T.flatten()
+			patched_fig['data'][1]['x'] = TypedArray.encode(xp, self.coordinate_tolerance)
+			patched_fig['data'][1]['y'] = TypedArray.encode(yp, self.coordinate_tolerance)
+			patched_fig['data'][1]['visible'] = True
+			return patched_fig
+
+	# density curve (x, y) for μ and σ, a dirac delta for σ = 0
+	# cached, so the sample sliders never recompute it; arrays are read only
+	@lru_cache(maxsize=64)
+	def density(self, μ, σ):
+		if σ == 0:
+			x = array([self.rang[0], μ, μ, μ, self.rang[1]], dtype=float)
+			y = array([0, 0, 1, 0, 0], dtype=float)
+		else:
+			x = linspace(self.rang[0], self.rang[1], 500)
+			y = self.gauss1(x, μ, σ)
+		x.flags.writeable = False
+		y.flags.writeable = False
+		return x, y
 		
 	@staticmethod
 	def gauss1(x, μ, σ):
 		return 1/sqrt(2*pi*σ) * exp(-1/2 * square((x-μ)/σ))
-
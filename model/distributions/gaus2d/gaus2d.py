@@ -11,10 +11,11 @@ from numpy import sqrt, linspace, vstack, hstack, pi, nan, full, exp, square, ar
 from numpy.random import randn, randint
 from numpy.linalg import cholesky, eig, det, inv
 from scipy.special import erfinv
-import deterministic_gaussian_sampling_fibonacci as dgsf
 
 from components.popup_box import PopupBox
 from model.selfcontained_distribution import SelfContainedDistribution
+from util.gaus_util import GausUtil as gu
+from util.typed_array import TypedArray
 
 # Samples Library
 # technically, this has state, but its fine because its just a cache
@@ -32,6 +33,9 @@ def get_data(url):
 	return data_dict[url]
 
 class Gaus2D(SelfContainedDistribution):
+	# error budget of the plotted coordinates (see TypedArray), the axes span about 10 units
+	coordinate_tolerance = 1e-3
+
 	def __init__(self):
 		self.smethods = ['iid', 'Fibonacci', 'LCD', 'SP-Julier04', 'SP-Menegaz11', 'Classical Frolov', 'Improved Frolov', 'Fibonacci Frolov'] # Sampling methods
 		self.tmethods = ['Cholesky', 'Eigendecomposition'] # Transformation methods
@@ -315,7 +319,7 @@ class Gaus2D(SelfContainedDistribution):
 					method = smethod.replace(' ', '')
 					method = 'Fibonacci' if method == 'FibonacciFrolov' else method
 					if L > 0:
-						grid = dgsf.get_uniform_grid(2, L, method)
+						grid = gu.get_uniform_grid(2, L, method)
 					else:
 						grid = np.empty((L, 2))
 					xyUni = grid.T
@@ -341,11 +345,11 @@ class Gaus2D(SelfContainedDistribution):
 				sizes = sqrt(abs(weights) * L2) * det(2*pi*C)**(1/4) / sqrt(L2) * 70
 			# Plot Ellipse
 			elp = matmul(C_R, sqrt(C_D) * self.circ) + μ
-			patched_fig['data'][0]['x'] = elp[0, :]
-			patched_fig['data'][0]['y'] = elp[1, :]
+			patched_fig['data'][0]['x'] = TypedArray.encode(elp[0, :], self.coordinate_tolerance)
+			patched_fig['data'][0]['y'] = TypedArray.encode(elp[1, :], self.coordinate_tolerance)
 			# Plot Samples
-			patched_fig['data'][1]['x'] = xyG[0, :]
-			patched_fig['data'][1]['y'] = xyG[1, :]
+			patched_fig['data'][1]['x'] = TypedArray.encode(xyG[0, :], self.coordinate_tolerance)
+			patched_fig['data'][1]['y'] = TypedArray.encode(xyG[1, :], self.coordinate_tolerance)
 			patched_fig['data'][1]['marker']['size'] = sizes
 			patched_fig['data'][1]['marker']['line']['width'] = sizes/20
 			return patched_fig, *silder_changes
@@ -0,0 +1,43 @@
+'''
+Compares the angular central gaussian random sampler of the bingham distribution with the previous sphstat version,
+and reports the acceptance rate of the rejection for every benchmarked λ.
+
+Run this file directly from project root with:
+
+sudo "$(poetry run which python)" -m pyperf system tune
+PYTHONPATH=$PWD poetry run python model/distributions/sphere/bingham/benchmark_random.py
+'''
+
+import pyperf
+
+from model.distributions.sphere.bingham.random import BinghamRandomSampling
+from util.selectors.selector_state import SelectorState
+
+sampler = BinghamRandomSampling()
+methods = {
+	"Angular Central Gaussian" : sampler.sample,
+	"sphstat" : sampler.sample_sphstat,
+}
+
+# corners and center of the slider domain
+lambda_pairs = [(0, 0), (10, 0), (5, 5), (10, 10)]
+sample_counts = [100, 1000, 10000]
+
+
+def benchmark(method, lambda_1, lambda_2, sample_count):
+	method((SelectorState(sample_count),), (SelectorState(lambda_1), SelectorState(lambda_2)))
+
+
+if __name__ == "__main__":
+	runner = pyperf.Runner()
+	args = runner.parse_args()
+
+	if not args.worker:
+		for lambda_1, lambda_2 in lambda_pairs:
+			lambdas = sampler.lambdas((SelectorState(lambda_1), SelectorState(lambda_2)))
+			print(f"acceptance rate (λ₁={lambda_1}, λ₂={lambda_2}): {sampler.acceptance(lambdas):.3f}")
+
+	for lambda_1, lambda_2 in lambda_pairs:
+		for sample_count in sample_counts:
+			for method_name, method in methods.items():
+				runner.bench_func(f"Bingham Random Sampling: {method_name} (λ₁={lambda_1}, λ₂={lambda_2}, sample_count={sample_count})", benchmark, method, lambda_1, lambda_2, sample_count)
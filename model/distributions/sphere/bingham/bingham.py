@@ -3,11 +3,12 @@ from model.distributions.sphere.sphere_distribution import SphereDistribution
 from util.selectors.slider import Slider 
 import numpy as np
 
-import pyrecest._backend
-from pyrecest.backend import array
-from pyrecest.distributions import BinghamDistribution
-
 from model.distributions.sphere.bingham.random import BinghamRandomSampling
+from util.fisher_bingham_util import FisherBinghamUtil
+from util.normalization_table import NormalizationTable
+
+# log normalization constants over the slider domain, exact for the integer slider states
+normalization_table = NormalizationTable("bingham_normalization", FisherBinghamUtil.bingham_log_normalizer, ((0, 10, 21), (0, 10, 21)))
 
 
 class BinghampDistribution(SphereDistribution):
@@ -33,13 +34,10 @@ class BinghampDistribution(SphereDistribution):
 		lambdas = np.sort(np.array([l1, l2, 0]))[::-1]
 		lambdas = -lambdas
 		M = np.eye(3)
-		bingham_dist = BinghamDistribution(M=array(M), Z=array(lambdas))
-
+		A = M @ np.diag(lambdas) @ M.T # exp(xᵀ M Z Mᵀ x)
 
 		def pdf(x):
-			bing = bingham_dist.pdf(array(x))
-			max = np.max(bing)
-			norm = bing / max
+			norm = self.plotted_density(x, A=A, log_normalizer=lambda: normalization_table.lookup(l1, l2))
 			norm = norm * alpha
 			return norm
 		return pdf
\ No newline at end of file
@@ -1,14 +1,19 @@
 from abc import ABC, abstractmethod
 import numpy as np
 import scipy
+import scipy.optimize
 import sphstat
 
 from model.distributions.sphere.sphere_sampling_schema import SphereSamplingSchema
 from util.selectors.silder_log import LogSlider
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
+from util.fisher_bingham_util import FisherBinghamUtil
 
 
 class BinghamRandomSampling(SphereSamplingSchema):
+	# independent draws, more samples only append new ones
+	prefix_stable = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000))	
@@ -17,7 +22,56 @@ class BinghamRandomSampling(SphereSamplingSchema):
 	def get_name(self):
 		return "Random"
 	
+	# density exp(-λ₁x² - λ₂y²) (λ₁ >= λ₂ >= 0), batch rejection from an angular central gaussian envelope
+	# (Kent, Ganeiber, Mardia, "A new unified approach for the simulation of a wide class of directional distributions")
 	def sample(self, sample_options, distribution_options):
+		lambdas = self.lambdas(distribution_options)
+		sample_count = sample_options[0].state
+
+		b = self.envelope_parameter(lambdas)
+		omega = 1 + 2 * lambdas / b
+		log_bound = self.log_bound(b)
+
+		def propose(rng, size):
+			# angular central gaussian with the matrix Ω = I + 2Λ / b, the normalized points of N(0, Ω⁻¹)
+			x = rng.standard_normal((size, 3)) / np.sqrt(omega)
+			x /= np.linalg.norm(x, axis=1)[:, np.newaxis]
+			t = np.square(x) @ lambdas # xᵀΛx
+			return x, -t + 1.5 * np.log1p(2 * t / b) - log_bound
+
+		rng = np.random.default_rng()
+		return FisherBinghamUtil.rejection_sample(propose, sample_count, rng, self.acceptance(lambdas))
+
+	def option_info_md(self, distribution_options):
+		return f"Expected acceptance rate of the rejection sampling: {self.acceptance(self.lambdas(distribution_options)):.1%}"
+
+	# [λ₁, λ₂, 0] in decreasing order
+	@staticmethod
+	def lambdas(distribution_options):
+		return np.sort(np.array([distribution_options[0].state, distribution_options[1].state, 0.0]))[::-1]
+
+	# b of the envelope with the best acceptance, the root of Σ 1 / (b + 2λᵢ) = 1 in (0, 3], 3 if all λᵢ = 0
+	@staticmethod
+	def envelope_parameter(lambdas):
+		if not np.any(lambdas):
+			return 3.0
+		return scipy.optimize.brentq(lambda b: np.sum(1 / (b + 2 * lambdas)) - 1, 1e-12, 3)
+
+	# log of the bound of exp(-xᵀΛx) / (xᵀΩx)^(-3/2), attained at xᵀΛx = (3 - b) / 2
+	@staticmethod
+	def log_bound(b):
+		return (b - 3) / 2 + 1.5 * np.log(3 / b)
+
+	# expected acceptance rate, the normalization constant of the density over the one of the bounded envelope
+	# the envelope integrates to 4π / sqrt(det Ω)
+	@staticmethod
+	def acceptance(lambdas):
+		b = BinghamRandomSampling.envelope_parameter(lambdas)
+		log_envelope = np.log(4 * np.pi) - 0.5 * np.sum(np.log1p(2 * lambdas / b))
+		return float(np.exp(FisherBinghamUtil.bingham_log_normalizer(lambdas[0], lambdas[1]) - BinghamRandomSampling.log_bound(b) - log_envelope))
+
+	# previous version, one point per loop iteration in sphstat, for the benchmark
+	def sample_sphstat(self, sample_options, distribution_options):
 		l1 = distribution_options[0].state
 		l2 = distribution_options[1].state
 
@@ -0,0 +1,45 @@
+'''
+Compares the vectorized random sampler of the kent distribution with the previous kent2 version
+and with the random sampler of the von Mises-Fisher distribution (the kent distribution with β = 0).
+
+Run this file directly from project root with:
+
+sudo "$(poetry run which python)" -m pyperf system tune
+PYTHONPATH=$PWD poetry run python model/distributions/sphere/kent/benchmark_random.py
+'''
+
+import pyperf
+
+from model.distributions.sphere.kent.random import KentRandomSampling
+from model.distributions.sphere.vonmises_fisher.random import VonMisesRandomSampling
+from util.selectors.selector_state import SelectorState
+
+sampler = KentRandomSampling()
+von_mises_sampler = VonMisesRandomSampling()
+methods = {
+	"Lambert Rejection" : sampler.sample,
+	"kent2" : sampler.sample_kent2,
+	"von Mises-Fisher" : lambda sample_options, distribution_options: von_mises_sampler.sample(sample_options, distribution_options[:1]),
+}
+
+# β = κ / 2 is the most elongated distribution the sliders allow
+parameters = [(1, 0.5), (10, 0), (10, 5), (50, 10), (50, 25)]
+sample_counts = [100, 1000, 10000]
+
+
+def benchmark(method, kappa, beta, sample_count):
+	method((SelectorState(sample_count),), (SelectorState(kappa), SelectorState(beta)))
+
+
+if __name__ == "__main__":
+	runner = pyperf.Runner()
+	args = runner.parse_args()
+
+	if not args.worker:
+		for kappa, beta in parameters:
+			print(f"acceptance rate (κ={kappa}, β={beta}): {sampler.envelope(kappa, beta).acceptance:.3f}")
+
+	for kappa, beta in parameters:
+		for sample_count in sample_counts:
+			for method_name, method in methods.items():
+				runner.bench_func(f"Kent Random Sampling: {method_name} (κ={kappa}, β={beta}, sample_count={sample_count})", benchmark, method, kappa, beta, sample_count)
@@ -7,6 +7,11 @@ import numpy as np
 
 from model.distributions.sphere.kent.random import KentRandomSampling
 from sphstat.descriptives import rotationmatrix_withaxis
+from util.fisher_bingham_util import FisherBinghamUtil
+from util.normalization_table import NormalizationTable
+
+# log normalization constants over the slider domain, exact for the integer slider states (and β = κ / 2)
+normalization_table = NormalizationTable("kent_normalization", FisherBinghamUtil.kent_log_normalizer, ((0, 50, 101), (0, 25, 51)))
 
 class KentDistribution(SphereDistribution):
 	def __init__(self):
@@ -23,30 +28,23 @@ class KentDistribution(SphereDistribution):
 		return "Kent (5-parameter Fisher-Bingham - FB5)"
 
 	def get_pdf(self, distribution_options):
-		# we don't compute the normalization constant $c(\kappa, \beta)$ here
-		# because the density fucntions are plotted not to scale anyway
-		c = 1.0
+		# the normalization constant $c(\kappa, \beta)$ is only needed for true scale plots, it is tabulated
 
 		kappa = distribution_options[0].state
 		beta = distribution_options[1].state
 		beta = min(beta, kappa / 2)
 
 		# hardcoded, same as in kent random sampling
-		y3 = np.array([1, 0, 0]).reshape(3, 1)
-		y2 = np.array([0, 1, 0]).reshape(3, 1)
-		y1 = np.array([0, 0, 1]).reshape(3, 1)
-		
+		y3 = np.array([1, 0, 0])
+		y2 = np.array([0, 1, 0])
+		y1 = np.array([0, 0, 1])
 
+		# κ y1ᵀx + β((y2ᵀx)² - (y3ᵀx)²)
+		gamma = kappa * y1
+		A = beta * (np.outer(y2, y2) - np.outer(y3, y3))
 
 		def pdf(x):
-			#print(f"{y1.T.shape} * {x.T.shape}")
-			kent = 1/c * np.exp(
-				kappa * (y1.T @ x.T) +
-				beta * ( (y2.T @ x.T)**2 - (y3.T @ x.T)**2 )
-			)
-			kent = kent.flatten()
-			max = np.max(kent)
-			norm = kent / max
+			norm = self.plotted_density(x, gamma=gamma, A=A, log_normalizer=lambda: normalization_table.lookup(kappa, beta))
 			return norm
 		return pdf
 				
\ No newline at end of file
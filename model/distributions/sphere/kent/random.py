@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
 import numpy as np
 import scipy
 import sphstat
@@ -7,10 +9,23 @@ from kent_distribution import kent2
 from model.distributions.sphere.sphere_sampling_schema import SphereSamplingSchema
 from util.selectors.silder_log import LogSlider
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
+from util.fisher_bingham_util import FisherBinghamUtil
 
 
 
+@dataclass(frozen=True)
+class KentEnvelope:
+	uniform: bool # proposals uniform on the disk instead of normal
+	slope: float # λ of the bound of the quartic
+	shift: float # λ² / β
+	precision: float # precision of the normal in u
+	acceptance: float # expected acceptance rate
+
+
 class KentRandomSampling(SphereSamplingSchema):
+	# independent draws, more samples only append new ones
+	prefix_stable = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000)),
@@ -19,13 +34,79 @@ class KentRandomSampling(SphereSamplingSchema):
 	def get_name(self):
 		return "Random"
 	
+	# density exp(κz + β(y² - x²)) with 2β <= κ (mean z, major axis y, minor axis x), batch rejection in the
+	# lambert equal area coordinates (u, v) of the sphere around the mean, the points with r² = u² + v² <= 4
+	# (Kent, Ganeiber, Mardia, "A new unified approach for the simulation of a wide class of directional distributions")
+	# there the log density is κ - (κ - 2β)u² / 2 - βu⁴ / 4 - (κ + 2β)v² / 2 + βv⁴ / 4, the area element is du dv
 	def sample(self, sample_options, distribution_options):
 		kappa = distribution_options[0].state
 		beta = distribution_options[1].state
 		beta = min(beta, kappa / 2) # TODO make this dynamic
+		sample_count = sample_options[0].state
+
+		envelope = self.envelope(kappa, beta)
+		rng = np.random.default_rng()
+		uv = FisherBinghamUtil.rejection_sample(lambda rng, size: self.propose(kappa, beta, envelope, rng, size), sample_count, rng, envelope.acceptance)
+
+		# inverse lambert projection, z = 1 - r² / 2 and the tangent direction scaled by sin θ = r sqrt(1 - r² / 4)
+		u, v = uv[:, 0], uv[:, 1]
+		r2 = np.square(u) + np.square(v)
+		scale = np.sqrt(np.maximum(1 - r2 / 4, 0))
+
+		samples = np.empty((sample_count, 3))
+		np.multiply(v, scale, out=samples[:, 0])
+		np.multiply(u, scale, out=samples[:, 1])
+		np.subtract(1, r2 / 2, out=samples[:, 2])
+		return samples
+
+	# proposals (u, v) and the log of their acceptance probabilities
+	@staticmethod
+	def propose(kappa, beta, envelope, rng, size):
+		if envelope.uniform:
+			# nearly uniform: uniform on the disk (the sphere), accepted with the density over its maximum exp(κ)
+			r = 2 * np.sqrt(rng.random(size))
+			angle = rng.uniform(0, 2 * np.pi, size)
+			uv = np.column_stack((r * np.cos(angle), r * np.sin(angle)))
+			u2, v2 = np.square(uv[:, 0]), np.square(uv[:, 1])
+			log_acceptance = -(kappa - 2 * beta) * u2 / 2 - beta * u2**2 / 4 - (kappa + 2 * beta) * v2 / 2 + beta * v2**2 / 4
+			return uv, log_acceptance
+
+		# independent normals, u with the precision of the envelope of the quartic, v with the precision κ
+		uv = rng.standard_normal((size, 2)) / np.sqrt((envelope.precision, kappa))
+		u2, v2 = np.square(uv[:, 0]), np.square(uv[:, 1])
+		# -β(u² - 2λ / β)² / 4 and -βv²(1 - v² / 4), both <= 0 on the disk
+		log_acceptance = envelope.slope * u2 - beta * u2**2 / 4 - envelope.shift - beta * v2 * (1 - v2 / 4)
+		log_acceptance[u2 + v2 > 4] = -np.inf
+		return uv, log_acceptance
+
+	# constants of the envelope, they only depend on the distribution
+	# -βu⁴ / 4 <= -λu² + λ² / β for all λ, so the u term is bounded by a normal with the precision κ - 2β + 2λ,
+	# λ = (sqrt(a² + 4β) - a) / 4 with a = κ - 2β minimizes the bound, the v term is bounded by a normal with the precision κ
+	@staticmethod
+	@lru_cache(maxsize=64)
+	def envelope(kappa, beta):
+		a = kappa - 2 * beta
+		slope = beta / (np.sqrt(a**2 + 4 * beta) + a) if beta > 0 else 0.0 # λ, without cancellation
+		shift = slope**2 / beta if beta > 0 else 0.0 # λ² / β
+		precision = a + 2 * slope
+
+		# the normal envelope of small κ is wider than the disk, uniform proposals are accepted more often there
+		uniform = kappa < 0.5
+		if uniform:
+			log_envelope = np.log(4 * np.pi) + kappa
+		else:
+			log_envelope = shift + 0.5 * np.log(4 * np.pi**2 / (precision * kappa)) + kappa
+		acceptance = float(np.exp(FisherBinghamUtil.kent_log_normalizer(kappa, beta) - log_envelope))
+		return KentEnvelope(uniform, slope, shift, precision, acceptance)
+
+	# previous version, constructs a kent2 distribution on every call, for the benchmark
+	def sample_kent2(self, sample_options, distribution_options):
+		kappa = distribution_options[0].state
+		beta = distribution_options[1].state
+		beta = min(beta, kappa / 2) # TODO make this dynamic
 
 		kent = kent2([1, 0, 0], [0, 1, 0], [0, 0, 1], kappa, beta)
 		numsamp = sample_options[0].state
 		samp = kent.rvs(n_samples=numsamp)
 		xyz = samp[:, [2, 1, 0]] # samples get returned in z,y,x order
-		return xyz
\ No newline at end of file
+		return xyz
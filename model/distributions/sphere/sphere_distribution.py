@@ -1,9 +1,21 @@
+import os
 from abc import ABC, abstractmethod
 from functools import cached_property
+
+import numpy as np
+
 from model.distribution import Distribution
+from util.fisher_bingham_util import FisherBinghamUtil
+
+DENSITY_SCALE_ENV = "WEBAPP_DENSITY_SCALE"
+# max: densities are scaled to their maximum, the shape of every distribution is fully visible
+# true: densities are drawn to scale, relative to the uniform density 1/4π, comparable across parameters and distributions
+DENSITY_SCALES = ("max", "true")
 
 
 class SphereDistribution(Distribution):
+	density_scale = os.environ.get(DENSITY_SCALE_ENV, "max")
+
 	def __init__(self):
 		self.distribution_options = []
 		# a list of objects that implement the torus_sampling_schema interface
@@ -23,4 +35,17 @@ class SphereDistribution(Distribution):
 	# returns a functions that takes a (N, 3) shape nparray and returns the pdf value at the points
 	@abstractmethod
 	def get_pdf(self, distribution_options):
-		pass
\ No newline at end of file
+		pass
+
+	# the density exp(γᵀx + xᵀAx) at the points x (n, 3) as plotted (see FisherBinghamUtil), scaled according to WEBAPP_DENSITY_SCALE
+	# log_normalizer returns the log normalization constant, it is only called for true scale
+	@staticmethod
+	def plotted_density(x, gamma=None, A=None, log_normalizer=None):
+		if SphereDistribution.density_scale == "true":
+			return 4 * np.pi * np.exp(FisherBinghamUtil.log_density(x, gamma, A) - log_normalizer())
+		return FisherBinghamUtil.relative_density(x, gamma, A)
+
+
+if SphereDistribution.density_scale not in DENSITY_SCALES:
+	print(f"Unknown {DENSITY_SCALE_ENV} '{SphereDistribution.density_scale}', expected one of {DENSITY_SCALES}, using max")
+	SphereDistribution.density_scale = "max"
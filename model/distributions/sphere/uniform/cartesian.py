@@ -8,6 +8,8 @@ from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper
 
 
 class SphereCartesianUniformSampling(SphereSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderSquare("Number of Samples", 4, 64, 100, 4))
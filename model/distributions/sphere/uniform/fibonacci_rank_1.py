@@ -9,6 +9,8 @@ from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper
 
 
 class SphereFibRank1UniformSampling(SphereSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderFib("Number of Samples", 2, 34, 21, 9))
@@ -8,6 +8,8 @@ from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper
 
 
 class SphereUniformFibSampling(SphereSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000))
@@ -7,6 +7,8 @@ from util.selectors.silder_log import LogSlider
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
 
 class VonMisesFibSampling(SphereSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000)),
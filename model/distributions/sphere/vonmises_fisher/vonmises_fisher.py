@@ -2,11 +2,11 @@ from abc import ABC, abstractmethod
 from model.distributions.sphere.sphere_distribution import SphereDistribution
 from util.selectors.silder_log import LogSlider 
 import numpy as np
-import scipy
 
 from model.distributions.sphere.vonmises_fisher.random import VonMisesRandomSampling
 from model.distributions.sphere.vonmises_fisher.fibonachi import VonMisesFibSampling
 from model.distributions.sphere.vonmises_fisher.cartesian import VonMisesCartesianSampling
+from util.fisher_bingham_util import FisherBinghamUtil
 class vonMisesFisherDistribution(SphereDistribution):
 	def __init__(self):
 		self.distribution_options = [
@@ -25,13 +25,10 @@ class vonMisesFisherDistribution(SphereDistribution):
 	def get_pdf(self, distribution_options):
 		alpha = 0.7 # scale
 		kappa = distribution_options[0].state
+		gamma = kappa * np.array([0.0, 0.0, 1.0]) # κμ
 
 		def pdf(x):
-			 
-			misf = scipy.stats.vonmises_fisher.pdf(x, mu=[0,0,1], kappa=kappa)
-			max = np.max(misf)
-
-			norm = misf / max
+			norm = self.plotted_density(x, gamma=gamma, log_normalizer=lambda: FisherBinghamUtil.vmf_log_normalizer(kappa))
 			norm = norm * alpha
 			return norm
 
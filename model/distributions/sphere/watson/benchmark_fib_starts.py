@@ -22,9 +22,11 @@ import numpy as np
 sampler = WatsonFibonachiSampling()
 methods = {
 	"Closed-Form" : sampler.sample_closed,
+	"Closed-Form (Newton erfi⁻¹)" : lambda sample_options, distribution_options: sampler.sample_closed(sample_options, distribution_options, erfi_inv=sampler.erfi_inv_newton),
 	"Inverse Interpolation" : sampler.sample_inverse_interpolation,
 	"Inverse ODE" : sampler.sample_inverse_ode,
 	"ODE Event Locations" : sampler.sample_events,
+	"ODE Event Functions" : sampler.sample_event_functions,
 }
 
 
@@ -0,0 +1,37 @@
+'''
+Compares the vectorized random sampler of the watson distribution with the previous sphstat version.
+
+Run this file directly from project root with:
+
+sudo "$(poetry run which python)" -m pyperf system tune
+PYTHONPATH=$PWD poetry run python model/distributions/sphere/watson/benchmark_random.py
+'''
+
+import numpy as np
+import pyperf
+
+from model.distributions.sphere.watson.random_sampling import WatsonRandomSampling
+from util.selectors.selector_state import SelectorState
+
+sampler = WatsonRandomSampling()
+methods = {
+	"Vectorized Rejection" : sampler.sample,
+	"sphstat" : sampler.sample_sphstat,
+}
+
+# girdle and bipolar, the uniform case (kappa = 0) is not sampled by sphstat
+kappas = [-50, -10, -1, 1, 10, 50]
+sample_counts = [100, 1000, 10000]
+
+
+def benchmark(method, kappa, sample_count):
+	method((SelectorState(sample_count),), (SelectorState(kappa),))
+
+
+if __name__ == "__main__":
+	runner = pyperf.Runner()
+
+	for kappa in kappas:
+		for sample_count in sample_counts:
+			for method_name, method in methods.items():
+				runner.bench_func(f"Watson Random Sampling: {method_name} (kappa={kappa}, sample_count={sample_count})", benchmark, method, kappa, sample_count)
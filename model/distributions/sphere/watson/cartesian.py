@@ -12,6 +12,8 @@ from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper
 
 
 class WatsonCartesianSampling(SphereSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderSquare("Number of Samples", 4, 64, 100, 4))
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import numpy as np
 import scipy
 import scipy.integrate
@@ -6,16 +7,22 @@ import scipy.interpolate
 import sphstat
 from pyrecest.backend import array
 from pyrecest.distributions import WatsonDistribution as WatsonDistributionPyrecest
-from scipy.special import erf, erfi, erfinv
+from scipy.special import dawsn, erf, erfi, erfinv
 
 from model.distributions.sphere.sphere_sampling_schema import SphereSamplingSchema
 from util.selectors.silder_log import LogSlider
 from model.sphere.sphere import Sphere
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
 
+# the table of erfi_inv ends at s = asinh(y) = 50 (x ≈ 7.2), beyond the slider domain (κ <= 50 needs x <= sqrt(50))
+# from there on the asymptotic expansion is accurate to 1e-6
+ERFI_TABLE_END = 50.0
+ERFI_TABLE_SIZE = 8193
 
 
 class WatsonFibonachiSampling(SphereSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000)),
@@ -145,8 +152,59 @@ class WatsonFibonachiSampling(SphereSamplingSchema):
 		x_i_f = np.column_stack((x_i_f_1, x_i_f_2, x_i_f_0)) # order so that mu=[0, 0, 1]
 		return x_i_f
 	
+	# inverse of erfi, linear interpolation in a table of the bulk, the asymptotic expansion in the tails
+	# and one newton step, which squares the relative error of both (below 1e-11)
+	@staticmethod
+	def erfi_inv(y):
+		y = np.asarray(y, dtype=float)
+		z = np.abs(y).ravel()
+
+		# bulk: linear in s = asinh(y), which is close to x² for large y and to y for small y
+		s = np.arcsinh(z)
+		x = np.interp(s, *WatsonFibonachiSampling.erfi_inv_table())
+
+		# tails: erfi(x) ~ exp(x²) / (x sqrt(π)) (1 + 1 / (2x²) + 3 / (4x⁴)), solved for x² by fixed point iteration
+		tail = s > ERFI_TABLE_END
+		if np.any(tail):
+			log_y = np.log(z[tail] * np.sqrt(np.pi))
+			x_tail = np.sqrt(log_y)
+			for _ in range(3):
+				inverse_square = 1 / np.square(x_tail)
+				x_tail = np.sqrt(log_y + np.log(x_tail) - np.log1p(inverse_square / 2 + 0.75 * inverse_square**2))
+			x[tail] = x_tail
+
+		# newton step, (erfi(x) - y) / erfi'(x) = D(x) - y sqrt(π) / 2 exp(-x²) with the dawson function D, does not overflow
+		correction = np.square(x)
+		np.negative(correction, out=correction)
+		np.exp(correction, out=correction)
+		correction *= z
+		correction *= np.sqrt(np.pi) / 2
+		correction -= dawsn(x)
+		x += correction
+		return np.copysign(x.reshape(y.shape), y)
+
+	# nodes s and the inverse of erfi at y = sinh(s), s uniform in [0, ERFI_TABLE_END], computed once by bisection
 	@staticmethod
-	def erfi_inv(y, iters=8, thresh=1.5):
+	@lru_cache(maxsize=1)
+	def erfi_inv_table():
+		s = np.linspace(0, ERFI_TABLE_END, ERFI_TABLE_SIZE)
+		y = np.sinh(s)
+		lo = np.zeros_like(y)
+		hi = np.full_like(y, 27.0) # erfi overflows before 27
+		for _ in range(60):
+			mid = (lo + hi) / 2
+			above = dawsn(mid) > y * (np.sqrt(np.pi) / 2) * np.exp(-np.square(mid)) # erfi(mid) > y
+			lo = np.where(above, lo, mid)
+			hi = np.where(above, mid, hi)
+		x = (lo + hi) / 2
+		x[0] = 0.0 # exact, the bisection leaves it at 27 / 2⁶¹, which the newton step cannot recover for tiny y
+		s.flags.writeable = False
+		x.flags.writeable = False
+		return s, x
+
+	# previous version of erfi_inv with a fixed number of newton iterations on the whole array, for the benchmark
+	@staticmethod
+	def erfi_inv_newton(y, iters=8, thresh=1.5):
 		y = np.asarray(y, dtype=float)
 		sgn = np.sign(y)
 		z = np.abs(y)
@@ -182,7 +240,9 @@ class WatsonFibonachiSampling(SphereSamplingSchema):
 		return sgn * x
 
 
-	def sample_closed(self, sample_options, distribution_options):
+	# erfi_inv can be replaced for the benchmark
+	def sample_closed(self, sample_options, distribution_options, erfi_inv=None):
+		erfi_inv = erfi_inv or self.erfi_inv
 
 		sample_count = sample_options[0].state
 		k = distribution_options[0].state # kappa
@@ -193,7 +253,7 @@ class WatsonFibonachiSampling(SphereSamplingSchema):
 
 		
 		if k > 0:
-			w = 1 / (np.sqrt(k)) * self.erfi_inv( ((1-2*indices + sample_count)/ sample_count) * erfi(np.sqrt(k)) )
+			w = 1 / (np.sqrt(k)) * erfi_inv( ((1-2*indices + sample_count)/ sample_count) * erfi(np.sqrt(k)) )
 		elif k < 0:
 			la = -k
 			w = 1 / (np.sqrt(la)) * erfinv( ((2*indices +1 - sample_count)/ sample_count) * erf(np.sqrt(la)) )
@@ -211,9 +271,70 @@ class WatsonFibonachiSampling(SphereSamplingSchema):
 		return x_i_f
 	
 
+	# inverse cdf via one dense output integration of the cdf over theta and a vectorized root solve for all targets
+	# always returns sample_count samples, the cost of the integration does not depend on the sample count
 	def sample_events(self, sample_options, distribution_options):
 		kappa = distribution_options[0].state
 		sample_count = sample_options[0].state
+
+		def f(t, y):
+			# ring at lattitude theta has radius 2pi * sin(theta)
+			# 2pi comes from integrating over phi from 0 to 2pi
+			# sin(theta): d S^2 = sin(theta) d theta d phi
+			# unnormalized watson pdf exp(kappa cos^2(theta)), shifted by its maximum so it does not overflow
+			return 2 * np.pi * np.exp(kappa * np.cos(t)**2 - max(kappa, 0)) * np.sin(t)
+
+		t_span = (0, np.pi) # theta from 0 to pi
+		y0 = 0 # the value of the integrated pdf at 0 is 0
+
+		sol = scipy.integrate.solve_ivp(f, t_span, [y0], dense_output=True, rtol=1e-9, atol=1e-12)
+		total = sol.y[0, -1]
+
+		# targets (centered variant, see above coment), scaled to the unnormalized cdf
+		targets = (np.linspace(0, 1, sample_count, endpoint=False) + 0.5/sample_count) * total
+
+		# bracket every target between the steps of the integration, the cdf is monotonic
+		knots = np.maximum.accumulate(sol.y[0])
+		step = np.clip(np.searchsorted(knots, targets), 1, len(knots) - 1)
+		lo = sol.t[step - 1]
+		hi = sol.t[step]
+
+		# safeguarded newton from the linear interpolation between the steps, falls back to bisection when a step leaves the bracket
+		# points are done once they are below the tolerance of the integration, only the others are evaluated again
+		fraction = (targets - knots[step - 1]) / np.maximum(knots[step] - knots[step - 1], 1e-300)
+		theta = lo + np.clip(fraction, 0, 1) * (hi - lo)
+		active = np.arange(sample_count)
+		for _ in range(50):
+			residual = sol.sol(theta[active])[0] - targets[active]
+			unconverged = np.abs(residual) > 1e-10 * total
+			active, residual = active[unconverged], residual[unconverged]
+			if active.size == 0:
+				break
+			t = theta[active]
+			lo[active] = np.where(residual < 0, t, lo[active])
+			hi[active] = np.where(residual < 0, hi[active], t)
+			newton = t - residual / np.maximum(f(t, None), 1e-300)
+			theta[active] = np.where((newton > lo[active]) & (newton < hi[active]), newton, (lo[active] + hi[active]) / 2)
+
+		# the density is symmetric to the equator, so are the targets, averaging with the mirrored samples keeps that exact
+		# and puts the median of odd sample counts on the equator, where the cdf of large κ is too flat to locate it
+		w = np.cos(theta)
+		w = (w - w[::-1]) / 2
+
+		indices = np.arange(0, sample_count)
+		gold_seq = (1+5**0.5)/2  # golden ratio
+
+		x_i_f_0 = w
+		x_i_f_1 = np.sqrt(1-w**2) * np.cos( (2 * np.pi * indices) / gold_seq)
+		x_i_f_2 = np.sqrt(1-w**2) * np.sin( (2 * np.pi * indices) / gold_seq)
+		x_i_f = np.column_stack((x_i_f_1, x_i_f_2, x_i_f_0)) # order so that mu=[0, 0, 1]
+		return x_i_f
+
+	# previous version of sample_events with one event function per sample, for the benchmark
+	# the event location cost grows with the sample count times the steps, and it can miss points
+	def sample_event_functions(self, sample_options, distribution_options):
+		kappa = distribution_options[0].state
+		sample_count = sample_options[0].state
 		
 		mu = array([0.0, 0.0, 1.0])
 		watson_dist = WatsonDistributionPyrecest(mu=mu, kappa=kappa)
@@ -19,6 +19,8 @@ from model.distributions.sphere.watson.fibonachi import WatsonFibonachiSampling
 
 
 class WatsonFibonachiRank1Sampling(SphereSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderFib("Number of Samples", 3, 33, 21, 9, minus_1=True)),
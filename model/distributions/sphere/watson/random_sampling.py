@@ -2,15 +2,20 @@ from abc import ABC, abstractmethod
 import numpy as np
 import scipy
 import sphstat
+from scipy.special import erf
 
 from model.distributions.sphere.sphere_sampling_schema import SphereSamplingSchema
 from util.selectors.silder_log import LogSlider
 from model.sphere.sphere import Sphere
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
+from util.fisher_bingham_util import FisherBinghamUtil
 
 
 
 class WatsonRandomSampling(SphereSamplingSchema):
+	# independent draws, more samples only append new ones
+	prefix_stable = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000)),
@@ -19,8 +24,50 @@ class WatsonRandomSampling(SphereSamplingSchema):
 	def get_name(self):
 		return "Random"
 	
+	# mean direction μ = [0, 0, 1], the user can just turn the sphere
+	# the cosine t = μᵀx of the polar angle has the density ∝ exp(κt²) on [-1, 1] (the sin θ of the area cancels),
+	# |t| is drawn by batch rejection, its sign and the azimuth are uniform
 	def sample(self, sample_options, distribution_options):
 		kappa = distribution_options[0].state
+		sample_count = sample_options[0].state
+
+		rng = np.random.default_rng()
+		t = FisherBinghamUtil.rejection_sample(lambda rng, size: self.propose_cosines(kappa, rng, size), sample_count, rng, self.acceptance(kappa))
+		t *= rng.choice((-1.0, 1.0), sample_count)
+		phi = rng.uniform(0, 2 * np.pi, sample_count)
+
+		r = np.sqrt(1 - t**2)
+		return np.column_stack((r * np.cos(phi), r * np.sin(phi), t))
+
+	# proposals of |t| in [0, 1] and the log of their acceptance probabilities
+	@staticmethod
+	def propose_cosines(kappa, rng, size):
+		u = rng.random(size)
+		if kappa > 0:
+			# bipolar: truncated exponential exp(κ(t - 1)) >= exp(κ(t² - 1)), accepted with exp(-κt(1 - t))
+			t = 1 + np.log1p(u * np.expm1(-kappa)) / kappa
+			return t, -kappa * t * (1 - t)
+		if kappa > -1:
+			# weak girdle and uniform: uniform proposals, accepted with exp(κt²)
+			return u, kappa * u**2
+		# girdle: half normal exp(κt²), only proposals above 1 are rejected
+		t = np.abs(rng.standard_normal(size)) / np.sqrt(-2 * kappa)
+		return t, np.where(t <= 1, 0.0, -np.inf)
+
+	# expected acceptance rate of propose_cosines, the mass ∫₀¹ exp(κt²) dt of the density over the mass of the proposal
+	# at least 0.5 (bipolar for large κ)
+	@staticmethod
+	def acceptance(kappa):
+		log_mass = FisherBinghamUtil.watson_log_normalizer(kappa) - np.log(4 * np.pi)
+		if kappa > 0:
+			return np.exp(log_mass - kappa) * kappa / -np.expm1(-kappa)
+		if kappa > -1:
+			return np.exp(log_mass)
+		return erf(np.sqrt(-kappa))
+
+	# previous version, sphstat draws 2 * numsamp points (both signs of each), half of them is chosen, for the benchmark
+	def sample_sphstat(self, sample_options, distribution_options):
+		kappa = distribution_options[0].state
 		
 		theta = 0 # can be hardcoded because the user can just turn the sphere
 		phi = 0
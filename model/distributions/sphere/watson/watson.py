@@ -3,14 +3,12 @@ from model.distributions.sphere.sphere_distribution import SphereDistribution
 from util.selectors.slider_float import FloatSlider 
 from util.selectors.slider import Slider
 import numpy as np
-import pyrecest._backend
-from pyrecest.backend import array
-from pyrecest.distributions import WatsonDistribution as WatsonDistributionPyrecest
 
 from model.distributions.sphere.watson.random_sampling import WatsonRandomSampling
 from model.distributions.sphere.watson.fibonachi import WatsonFibonachiSampling
 from model.distributions.sphere.watson.cartesian import WatsonCartesianSampling
 from model.distributions.sphere.watson.fibonachi_rank1 import WatsonFibonachiRank1Sampling			
+from util.fisher_bingham_util import FisherBinghamUtil
 
 
 class WatsonDistribution(SphereDistribution):
@@ -32,14 +30,11 @@ class WatsonDistribution(SphereDistribution):
 	def get_pdf(self, distribution_options):
 		alpha = 0.5 # scale			
 		kappa = distribution_options[0].state
-		mu = array([0.0, 0.0, 1.0])
-
-		watson_dist = WatsonDistributionPyrecest(mu=mu, kappa=kappa)
+		mu = np.array([0.0, 0.0, 1.0])
+		A = kappa * np.outer(mu, mu) # exp(κ(μᵀx)²)
 
 		def pdf(x):
-			wts = watson_dist.pdf(array(x))
-			max = np.max(wts)
-			norm = wts / max
+			norm = self.plotted_density(x, A=A, log_normalizer=lambda: FisherBinghamUtil.watson_log_normalizer(kappa))
 			norm = norm * alpha
 			return norm
 		return pdf
\ No newline at end of file
@@ -6,6 +6,8 @@ from model.distributions.torus.torus_sampling_schema import TorusSamplingSchema
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
 
 class TorusKroneckerUniformSampling(TorusSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000))
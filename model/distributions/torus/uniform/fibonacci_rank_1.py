@@ -7,6 +7,8 @@ from model.distributions.torus.torus_sampling_schema import TorusSamplingSchema
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
 
 class TorusFibRank1UniformSampling(TorusSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(SliderFib("Number of Samples", 2, 34, 21, 9))
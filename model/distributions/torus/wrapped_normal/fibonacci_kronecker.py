@@ -7,6 +7,8 @@ from util.gaus_util import GausUtil as gu
 
 
 class TorusFibKroneckerWNSampling(TorusSamplingSchema):
+	deterministic = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000))
@@ -5,6 +5,9 @@ import numpy as np
 from util.selectors.silder_manual_input_wrapper import SliderManualInputWrapper as MI
 
 class TorusRandomWrappedSampling(TorusSamplingSchema):
+	# independent draws, more samples only append new ones
+	prefix_stable = True
+
 	def __init__(self):
 		self.sample_options = [
 			MI(LogSlider("Number of Samples", 10, 100, 10000))
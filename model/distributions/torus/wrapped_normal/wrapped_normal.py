@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.stats import multivariate_normal
 
 from util.selectors.slider_float import FloatSlider 
 from util.selectors.slider_pi import PiSlider
@@ -12,6 +11,7 @@ from model.distributions.torus.wrapped_normal.frolov import CFrolovWNSampling
 from model.distributions.torus.wrapped_normal.improved_frolov import IFrolovWNSampling
 from model.distributions.torus.wrapped_normal.fibonacci_frolov import FFrolovWNSampling
 from model.torus.torus import Torus
+from util.wrapped_normal_util import WrappedNormalUtil
 class WrappedNormalTorusDistribution(TorusDistribution):
 	def __init__(self):
 		self.distribution_options = [
@@ -49,27 +49,14 @@ class WrappedNormalTorusDistribution(TorusDistribution):
 
 		mean = np.array([mean_x, mean_y])
 
-		dist = multivariate_normal(mean=mean, cov=Cov, allow_singular=True)
-
 		def pdf(x):
 			alpha = 0.7 # scale
 
 			t, p = Torus.xyz_to_t_p(x[:,0], x[:,1], x[:,2])
 			t_p = np.column_stack((t,p))
 
-			# wrap until 3 * sigma_x
-			k_t = int(np.ceil(3 * sigma_t / (2 * np.pi)))
-			k_p = int(np.ceil(3 * sigma_p / (2 * np.pi)))
-
-			total_pdf = np.zeros(t_p.shape[0])
-			for i in range(-k_t, k_t+1):
-				for j in range(-k_p, k_p+1):
-					shifted_samples = np.column_stack((t_p[:,0] + i * 2 * np.pi, t_p[:,1] + j * 2 * np.pi))
-					total_pdf += dist.pdf(shifted_samples)
-
-			max = np.max(total_pdf)
-
-			norm = total_pdf / max
+			# all wraps in one pass, normalized to a maximum of 1
+			norm = WrappedNormalUtil.relative_density(t_p, mean, Cov, periodic=(True, True))
 			norm = norm * alpha
 			return norm
 
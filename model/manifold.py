@@ -1,6 +1,23 @@
+import os
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from util.result_cache import ResultCache
+from util.snapshot_bundle import snapshot_bundle
+
+# process wide cache of deterministic samples, eg. the same lattice requested by many students
+sample_cache = ResultCache("samples", int(os.environ.get("WEBAPP_SAMPLE_CACHE_MB", 128)) * 2**20)
+# extruded density meshes and 2d heatmaps, pure functions of the distribution parameters
+density_cache = ResultCache("densities", int(os.environ.get("WEBAPP_DENSITY_CACHE_MB", 128)) * 2**20, frequency_admission=False)
+
 class Manifold(ABC):
+	# error budget of the data sent to the plots (see TypedArray), far below what is visible on screen
+	# max absolute error of sample and mesh coordinates, in the units of the manifold
+	coordinate_tolerance = 1e-4
+	# max error of the 2d heatmap values, relative to the top of the colorscale (1 for densities scaled to their maximum)
+	density_tolerance = 1e-4
+
 	# optional initial settings for 3d camera
 	@property
 	def camera_settings_3d(self):
@@ -25,14 +42,100 @@ class Manifold(ABC):
 		pass
 
 	# returns samples based on selected distribution and sample options
-	# samples are returned as a tuple (saples_xyz, samples_2d | None)
-	# also converts the sample output type to xyz coordinates
+	# samples are returned as a tuple (saples_xyz, samples_2d | None), arrays may be read only
+	# options are immutable per callback snapshots (see SelectorState), never the shared selectors
+	# results of deterministic sampling methods are cached for all sessions
+	def update_sample(self, selected_distribution, selected_sampling_method, sample_options, distribution_options):
+		dist = self.distributions[selected_distribution]
+		sampling_method = dist.sampling_method_dict[selected_sampling_method]
+
+		def compute():
+			return self.convert_sample(sampling_method.sample(sample_options, distribution_options))
+
+		key = self.sample_key(selected_distribution, selected_sampling_method, sample_options, distribution_options)
+		if key is None:
+			return compute()
+
+		def load_or_compute():
+			# slider states of parameter free distributions are prebuilt (see SnapshotBundle)
+			bundled = snapshot_bundle.load(self, key, sampling_method)
+			return bundled if bundled is not None else compute()
+
+		return sample_cache.get_or_compute(key, load_or_compute)
+
+	# samples start to stop of a prefix stable sampling method (see SamplingSchema.prefix_stable), same format as update_sample
+	# only the new samples are computed when the sample count grows, they are not cached
+	def sample_tail(self, selected_distribution, selected_sampling_method, sample_options, distribution_options, start, stop):
+		sampling_method = self.distributions[selected_distribution].sampling_method_dict[selected_sampling_method]
+		return self.convert_sample(sampling_method.sample_tail(sample_options, distribution_options, start, stop))
+
+	# hashable key identifying the samples, None if the sampling method is not deterministic
+	def sample_key(self, selected_distribution, selected_sampling_method, sample_options, distribution_options):
+		dist = self.distributions[selected_distribution]
+		sampling_method = dist.sampling_method_dict[selected_sampling_method]
+		if not sampling_method.deterministic:
+			return None
+
+		return (
+			self.cache_key,
+			selected_distribution,
+			selected_sampling_method,
+			self.options_key(sampling_method.sample_options, sample_options),
+			self.options_key(dist.distribution_options, distribution_options),
+		)
+
+	# converts the output of a sampling method to a tuple (saples_xyz, samples_2d | None)
 	@abstractmethod
-	def update_sample(self,  selected_distribution, sample_options):
+	def convert_sample(self, new_sample):
 		pass
 
+	# identifies the manifold and its parameters in cache keys, override if there are any
+	@property
+	def cache_key(self):
+		return type(self).__name__
+
+	@staticmethod
+	def options_key(options, snapshots):
+		return tuple(opt.cache_key(snapshot) for opt, snapshot in zip(options, snapshots))
+
 	def generate_mesh(self, pdf, *args, **kwargs):
 		pass
+
+	# wireframe the density is extruded on, coarse is the low resolution one used while sliders are dragged
+	# manifolds without a coarse wireframe always use the full one
+	def wireframe(self, coarse=False):
+		coarse_mesh_xyz = getattr(self, "coarse_mesh_xyz", None)
+		if coarse and coarse_mesh_xyz is not None:
+			return coarse_mesh_xyz
+		return self.mesh_xyz
+
+	# returns the extruded density mesh (x, y, z) of the distribution, or None if it has no pdf
+	# cached for all sessions, arrays are read only
+	def density_mesh(self, selected_distribution, distribution_options, coarse=False):
+		dist = self.distributions[selected_distribution]
+
+		def compute():
+			pdf = dist.get_pdf(distribution_options)
+			if pdf is None:
+				return None
+			return tuple(np.ascontiguousarray(c) for c in self.generate_mesh(pdf, coarse=coarse))
+
+		key = ("mesh", self.cache_key, coarse, selected_distribution, self.options_key(dist.distribution_options, distribution_options))
+		return density_cache.get_or_compute(key, compute)
+
+	# returns pdf_2d at the points xy, or None if the distribution has no pdf
+	# grid_key identifies xy (the points are not hashed), eg. the settings the renderer created them from
+	def density_2d(self, selected_distribution, distribution_options, xy, grid_key):
+		dist = self.distributions[selected_distribution]
+
+		def compute():
+			pdf = dist.get_pdf(distribution_options)
+			if pdf is None:
+				return None
+			return np.asarray(self.pdf_2d(xy, pdf))
+
+		key = ("2d", self.cache_key, grid_key, selected_distribution, self.options_key(dist.distribution_options, distribution_options))
+		return density_cache.get_or_compute(key, compute)
 	
 	# uses the objects pararametrization to convert 2d coords to 3d coords and apply pdf
 	# optional, only if the manifold supports 2d plotting
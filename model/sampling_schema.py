@@ -1,6 +1,18 @@
 from abc import ABC, abstractmethod
 
+from util.selectors.selector_state import SelectorState
+
 class SamplingSchema(ABC):
+	# True if the same options always give the same samples (lattices, grids, closed forms)
+	# results of deterministic sampling methods are cached and shared between sessions
+	deterministic = False
+
+	# True if the first N of N + M samples are a valid set of N samples, eg. independent random draws
+	# the renderer then only computes and sends the new samples when the sample count grows, and truncates when it shrinks
+	prefix_stable = False
+	# index of the "Number of Samples" option
+	sample_count_option = 0
+
 	def __init__(self):
 		self.sample_options = []
 
@@ -9,14 +21,29 @@ class SamplingSchema(ABC):
 	def get_name(self):
 		pass
 	
+	# options are read only, they only provide .state (and .idx for index based sliders)
+	# implementations must not store anything on self, instances are shared between sessions and threads
 	@abstractmethod
 	def sample(self, sample_options, distribution_options):
 		pass
 
+	# samples start to stop of a prefix stable sampling method
+	# independent draws do not depend on the samples before, so by default these are just stop - start new samples
+	# sequences (eg. a kronecker sequence without centering) should override this to generate the indices start to stop
+	def sample_tail(self, sample_options, distribution_options, start, stop):
+		tail_options = list(sample_options)
+		tail_options[self.sample_count_option] = SelectorState(stop - start)
+		return self.sample(tuple(tail_options), distribution_options)
+
 	@property
 	def info_md(self):
 		return getattr(self, "_info_md", "")
 
 	@info_md.setter
 	def info_md(self, value):
-		self._info_md = value
\ No newline at end of file
+		self._info_md = value
+
+	# markdown that depends on the distribution options (eg. the acceptance rate of a rejection sampler), shown below info_md
+	# called on every change of the distribution options, so it should be cheap
+	def option_info_md(self, distribution_options):
+		return ""
@@ -1,13 +1,13 @@
 import numpy as np
-import numpy as np
 from scipy.spatial import ConvexHull
-import plotly.figure_factory as ff
 
 from model.distributions.distribution_loader import DistributionLoader
 from model.distributions.sphere.sphere_distribution import SphereDistribution
 from model.manifold import Manifold
 from model.distributions.sphere.uniform.fibonachi_lattice import SphereUniformFibSampling
 from util.selectors.slider import Slider
+from util.artifact_store import artifact_store
+from util.mesh_util import MeshUtil
 
 class Sphere(Manifold):
 	def __init__(self, resolution=200, radius=0.999):
@@ -16,7 +16,8 @@ class Sphere(Manifold):
 		self.distributions = DistributionLoader(SphereDistribution, "model.distributions.sphere").get_distributions()
 
 
-		self.mesh_xyz = self._init_mesh()
+		self.mesh_xyz = artifact_store.load_or_build("sphere_mesh", self._init_mesh, resolution=3000)
+		self.coarse_mesh_xyz = artifact_store.load_or_build("sphere_mesh", self._init_mesh, resolution=400)
 
 		
 
@@ -31,42 +32,29 @@ class Sphere(Manifold):
 
 		return x, y, z
 	
-	def update_sample(self, selected_distribution, selected_sampling_method, sample_options, distribution_options):
-		dist = self.distributions[selected_distribution]
-		sampling_method = dist.sampling_method_dict[selected_sampling_method]
-		return (sampling_method.sample(sample_options, distribution_options), None)
+	def convert_sample(self, new_sample):
+		return (new_sample, None)
+
 
+	def generate_mesh(self, pdf, alpha=1, coarse=False):
+		mesh_xyz = self.wireframe(coarse)
 
-	def generate_mesh(self, pdf, alpha=1):
 		# mesh_xyz has nans for line segments, mask before passing to pdf
-		mask = np.all(np.isfinite(self.mesh_xyz), axis=-1)
-		dens = pdf(self.mesh_xyz[mask])
+		mask = np.all(np.isfinite(mesh_xyz), axis=-1)
+		dens = pdf(mesh_xyz[mask])
 
-		xyz_extruded = np.full_like(self.mesh_xyz, np.nan, dtype=float) # full of nans
+		xyz_extruded = np.full_like(mesh_xyz, np.nan, dtype=float) # full of nans
 
-		xyz_extruded[mask] =  self.mesh_xyz[mask] * (1 + alpha * dens[:, np.newaxis])
+		xyz_extruded[mask] =  mesh_xyz[mask] * (1 + alpha * dens[:, np.newaxis])
 		return xyz_extruded[:,0], xyz_extruded[:,1], xyz_extruded[:,2]
 
 	def _init_mesh(self, resolution=3000):
 		xyz = SphereUniformFibSampling.sample(None, [Slider("Number of Samples", 10, resolution, resolution)] , [])
-		x, y, z = xyz[:,0], xyz[:,1], xyz[:,2]
 
 		hull = ConvexHull(xyz)
 		simplices = hull.simplices
 
-		def cf(xi, yi, zi, zmin=np.min(z), zmax=np.max(z)):
-			if zi > zmax:
-				zi = np.nextafter(zmax, zmin)
-			return zi
-
-		fig = ff.create_trisurf(x=x, y=y, z=z,
-								simplices=simplices,
-								show_colorbar=False,
-								color_func=cf
-								)
-		
-		arr =  np.column_stack((fig.data[1].x, fig.data[1].y, fig.data[1].z))
-		return np.where(arr == None, np.nan, arr).astype(float) # line segments have None in them, put them to nan so we can do mult later
+		return MeshUtil.wireframe(xyz, simplices) # line segments are separated by nan rows, so we can do mult later
 	
 	@staticmethod
 	def spherical_to_cartesian(theta, phi, r=1):
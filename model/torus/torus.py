@@ -1,5 +1,4 @@
 import numpy as np
-import plotly.figure_factory as ff
 from scipy.spatial import Delaunay
 
 from model.distributions.distribution_loader import DistributionLoader
@@ -8,6 +7,8 @@ from model.manifold import Manifold
 from renderer.plot_settings_2d import PlotSettings2D
 from model.distributions.cylinder.uniform.fibonacci_rank_1 import CylinderFibRank1UniformSampling
 from util.selectors.slider_fib import SliderFib
+from util.artifact_store import artifact_store
+from util.mesh_util import MeshUtil
 
 class Torus(Manifold):
 	def __init__(self, resolution=100, r=1, R=3):
@@ -17,8 +18,11 @@ class Torus(Manifold):
 
 		self.r = r
 		self.R = R
+		# the scene is R + r times larger than the unit sphere, so is the error budget
+		self.coordinate_tolerance = Manifold.coordinate_tolerance * (R + r)
 
-		self.mesh_xyz = self._init_mesh()
+		self.mesh_xyz = artifact_store.load_or_build("torus_mesh", self._init_mesh, resolution=(4181, 19), r=self.r, R=self.R)
+		self.coarse_mesh_xyz = artifact_store.load_or_build("torus_mesh", self._init_mesh, resolution=(610, 15), r=self.r, R=self.R)
 
 		axes_2d = (
 			np.arange(0, 2.5 * np.pi, np.pi / 2), # 0, π/2, π, 3π/2, 2π
@@ -51,11 +55,11 @@ class Torus(Manifold):
 		return pdf(np.column_stack((x, y, z)))
 
 	
-	def update_sample(self, selected_distribution, selected_sampling_method, sample_options, distribution_options):
-		dist = self.distributions[selected_distribution]
-		sampling_method = dist.sampling_method_dict[selected_sampling_method]
-		new_sample = sampling_method.sample(sample_options, distribution_options)
+	@property
+	def cache_key(self):
+		return (type(self).__name__, self.r, self.R)
 
+	def convert_sample(self, new_sample):
 		if (new_sample is None) or new_sample.size == 0:
 			samples = np.empty((0, 3), dtype=float)
 			samples_2d = np.empty((0, 2), dtype=float)
@@ -84,21 +88,22 @@ class Torus(Manifold):
 	
 	
 	
-	def generate_mesh(self, pdf, alpha=1):
+	def generate_mesh(self, pdf, alpha=1, coarse=False):
 		#return self.mesh_xyz[:,0], self.mesh_xyz[:,1], self.mesh_xyz[:,2]
+		mesh_xyz = self.wireframe(coarse)
 
 		# mesh_xyz has nans for line segments, mask before passing to pdf
-		mask = np.all(np.isfinite(self.mesh_xyz), axis=-1)
-		dens = pdf(self.mesh_xyz[mask])
+		mask = np.all(np.isfinite(mesh_xyz), axis=-1)
+		dens = pdf(mesh_xyz[mask])
 
-		xyz_extruded = np.full_like(self.mesh_xyz, np.nan, dtype=float) # full of nans
-		tp = self.xyz_to_t_p(self.mesh_xyz[mask][:,0], self.mesh_xyz[mask][:,1], self.mesh_xyz[mask][:,2], self.r, self.R)
+		xyz_extruded = np.full_like(mesh_xyz, np.nan, dtype=float) # full of nans
+		tp = self.xyz_to_t_p(mesh_xyz[mask][:,0], mesh_xyz[mask][:,1], mesh_xyz[mask][:,2], self.r, self.R)
 		xyz_new = self.t_p_to_xyz(tp[0], tp[1], self.r * (1 + alpha * dens), self.R)
 		xyz_extruded[mask] =  np.stack(xyz_new, axis=1)
 		return xyz_extruded[:,0], xyz_extruded[:,1], xyz_extruded[:,2]
 	
 
-	def _init_mesh(self, resolution=(4181, 19)):
+	def _init_mesh(self, resolution=(4181, 19), r=1, R=3):
 		
 		#tp = CylinderFibRank1UniformSampling.sample(None, [SliderFib("Number of Samples", 10, resolution[0], resolution[0], resolution[1])] , [])
 		k = resolution[1]
@@ -106,7 +111,7 @@ class Torus(Manifold):
 		t, p = CylinderFibRank1UniformSampling.get_rank_1(samp_count, k)
 		tp = np.column_stack((t * 2 * np.pi, p * 2 * np.pi))
 
-		x, y, z = self.t_p_to_xyz(tp[:,0], tp[:,1], self.r)
+		xyz = np.column_stack(self.t_p_to_xyz(tp[:,0], tp[:,1], r, R))
 
 		
 
@@ -149,17 +154,5 @@ class Torus(Manifold):
 		simplices_merged = np.vstack((simplices_1, simplices_2, simplices_3, simplices_4))
 		simplices_merged = np.unique(simplices_merged, axis=0)
 
-		def cf(xi, yi, zi, zmin=np.min(z), zmax=np.max(z)):
-			if zi > zmax:
-				zi = np.nextafter(zmax, zmin)
-			return zi
-
-		fig = ff.create_trisurf(x=x, y=y, z=z,
-								simplices=simplices_merged,
-								show_colorbar=False,
-								color_func=cf
-								)
-		
-		arr =  np.column_stack((fig.data[1].x, fig.data[1].y, fig.data[1].z))
-		return np.where(arr == None, np.nan, arr).astype(float) # line segments have None in them, put them to nan so we can do mult later
+		return MeshUtil.wireframe(xyz, simplices_merged) # line segments are separated by nan rows, so we can do mult later
 
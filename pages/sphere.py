@@ -15,16 +15,18 @@ dash.register_page(__name__)
 sphere = Sphere()
 
 renderer = Object3DRenderer(sphere, "sphere")
-options, graph = renderer.get_layout_components()
 
 
-layout = SplitPane(
-	[
-		*options
-	],
-	[
-		*graph
-	],
-	30
+# built on every page load, so distributions that failed to load are no longer listed
+def layout(**kwargs):
+	options, graph = renderer.get_layout_components()
 
-)
\ No newline at end of file
+	return SplitPane(
+		[
+			*options
+		],
+		[
+			*graph
+		],
+		30
+	)
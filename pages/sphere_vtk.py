@@ -7,15 +7,13 @@ import dash_vtk
 import numpy as np
 
 from components.split_pane import SplitPane
-from model.sphere.sphere import Sphere
 
 
 #dash.register_page(__name__)
 
-
-sphere = Sphere()
-x, y, z = sphere.xyz
-sphere.samples = np.array([
+# dash imports this module even though the page is not registered,
+# so do not build a full Sphere() here, the page only needs some points
+samples = np.array([
 	[0,0,1],
 	[0,1,0],
 	[1,0,0]
@@ -48,9 +46,9 @@ layout = SplitPane(
 			property={"color": [1, 0, 0], "pointSize": 6},
 			children=[
 				dash_vtk.PolyData(
-					points=sphere.samples.ravel(),
+					points=samples.ravel(),
 					# verts is an array like [1, 0, 1, 1, 1, 2, ...]
-					verts=np.c_[np.ones(sphere.samples.shape[0], dtype=np.int64), np.arange(sphere.samples.shape[0])].ravel().tolist(),
+					verts=np.c_[np.ones(samples.shape[0], dtype=np.int64), np.arange(samples.shape[0])].ravel().tolist(),
 				)
 			],
 		),
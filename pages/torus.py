@@ -16,15 +16,18 @@ dash.register_page(__name__)
 torus = Torus()
 
 renderer = Object3DAnd2DRenderer(torus, "torus")
-options, graph = renderer.get_layout_components()
-
-layout = SplitPane(
-	[
-		*options
-	],
-	[
-		*graph
-	],
-	30
-
-)
\ No newline at end of file
+
+
+# built on every page load, so distributions that failed to load are no longer listed
+def layout(**kwargs):
+	options, graph = renderer.get_layout_components()
+
+	return SplitPane(
+		[
+			*options
+		],
+		[
+			*graph
+		],
+		30
+	)
@@ -1,8 +1,11 @@
 from dash import html, dcc, callback, Input, Output, ALL, State, Patch, no_update
+import dash
 import numpy as np
 import plotly.graph_objects as go
 
 from renderer.object_3D_renderer import Object3DRenderer
+from util.typed_array import TypedArray
+from util.request_sequencer import request_sequencer
 
 class Object3DAnd2DRenderer(Object3DRenderer):
 	def __init__(self, object, id):
@@ -115,45 +118,40 @@ class Object3DAnd2DRenderer(Object3DRenderer):
 				
 
 	def register_plot_callbacks(self):
-		# updates the plot based on selected sampling options
+		# single update pipeline for the plot in both modes, computes only the parts that depend on the changed inputs
 		@callback(
 			Output(f"graph-{self.id}", "figure", allow_duplicate=True),
+			*self.incremental_outputs(),
 			State(f"mode-selector-{self.id}", "value"),
 			Input(f"mode-done-{self.id}", "data"),
 			Input({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "value"),
+			Input({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "drag_value"),
 			State({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "id"),
 			Input({"type": "sampling", "renderer": self.id, "index": ALL, "manual": ALL}, "value"),
+			Input({"type": "sampling", "renderer": self.id, "index": ALL, "manual": ALL}, "drag_value"),
 			State({"type": "sampling", "renderer": self.id, "index": ALL, "manual": ALL}, "id"),
 			Input("distribution-selector", "value"),
 			Input(f"sampling-selector-{self.id}", "value"),
 			Input(f"distribution-options-{self.id}", "children"),
 			State(f"device-pixel-ratio-{self.id}", "data"),
+			State(f"session-id-{self.id}", "data"),
+			State(f"samples-shown-{self.id}", "data"),
 			prevent_initial_call='initial_duplicate'
 		)
-		def update_plot_sample_callback(mode, _mode_counter, values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr):
-			if mode == "3D View":
-				return self.update_plot_sample(values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr)
-			else:
-				return self.update_plot_sample_2d(values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr)
-		
-		# updates the plot based on selected distribution options
-		@callback(
-			Output(f"graph-{self.id}", "figure", allow_duplicate=True),
-			State(f"mode-selector-{self.id}", "value"),
-			Input(f"mode-done-{self.id}", "data"),
-			Input({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "value"),
-			State({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "id"),
-			Input("distribution-selector", "value"),
-			Input(f"sampling-selector-{self.id}", "value"),
-			Input(f"distribution-options-{self.id}", "children"),
-			prevent_initial_call='initial_duplicate'
-		)
-		def update_plot_dist_callback(mode, _mode_counter, values_dist, ids_dist, selected_distribution, selected_sampling, _):
-			if mode == "3D View":
-				return self.update_plot_dist(values_dist, ids_dist, selected_distribution, selected_sampling, _)
-			else:
-				return self.update_plot_dist_2d(values_dist, ids_dist, selected_distribution, selected_sampling, _)
-	
+		def update_plot_callback(mode, _mode_counter, values_dist, drag_values_dist, ids_dist, values_samp, drag_values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr, session_id, shown):
+			triggered = dash.ctx.triggered_prop_ids
+			# a mode switch replaces the whole figure, so it triggers all products
+			products = self.plot_products(triggered)
+			coarse, values_dist, values_samp = self.dragged_values(triggered, ids_dist, values_dist, drag_values_dist, ids_samp, values_samp, drag_values_samp)
+			shown = shown if self.sampling_options_only(triggered) else None
+			# only the newest request of a slider drag is computed
+			return request_sequencer.run(session_id, (self.id, "plot"), lambda: self.update_plot(products, values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, dpr, mode, shown, coarse))
+
+	def plot_patchers(self, mode=None):
+		if mode == "3D View":
+			return self.patch_samples, self.patch_density, self.extend_samples
+		# the periodic extensions are blocks of shifted copies, they can not simply be extended
+		return self.patch_samples_2d, self.patch_density_2d, None
 
 	def register_mode_callbacks(self):
 		@callback(
@@ -169,43 +167,16 @@ class Object3DAnd2DRenderer(Object3DRenderer):
 			else:
 				return self.fig_2d, new_data
 
-	def update_plot_sample_2d(self, values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr):
-		try:
-			dist_options =  self.object.distributions[selected_distribution].distribution_options
-			sampling_options = self.object.distributions[selected_distribution].sampling_method_dict[selected_sampling].sample_options
-		except KeyError:
-			# got stale values, ignore
-			return no_update
-		
-		# the order of options might not be guaranteed, so we map them by their ids
-		id_value_dist = [(id,v) for id, v in zip(ids_dist, values_dist)]
-		id_value_samp = [(id,v) for id, v in zip(ids_samp, values_samp)]
-		
-
-		# and them sort them, so they are in the same order as sampling_options and dist_options
-		options_samp_new = sorted(id_value_samp, key=lambda x: int(x[0]["index"]))
-		options_dist_new = sorted(id_value_dist, key=lambda x: int(x[0]["index"]))
-
-
-		for opt, (id, new_state) in zip(sampling_options, options_samp_new):
-			opt.update_state(new_state)
-
-		for opt, (id, new_state) in zip(dist_options, options_dist_new):
-			opt.update_state(new_state)
-
-		# samples 
-		samples, samples_2d = self.object.update_sample(selected_distribution, selected_sampling, sampling_options, dist_options)
+	def patch_samples_2d(self, patched_figure, selected_distribution, selected_sampling, sampling_state, dist_state, dpr, coarse=False):
+		if coarse:
+			samples, samples_2d = self.coarse_samples(selected_distribution, selected_sampling, sampling_state, dist_state)
+		else:
+			samples, samples_2d = self.object.update_sample(selected_distribution, selected_sampling, sampling_state, dist_state)
 
-		patched_figure = Patch()
 		tp = samples_2d
 
 		# marker size scaling
-		sample_count = samples.shape[0]
-		if sample_count == 0:
-			marker_size = 0 # no samples, no size
-		else:
-			marker_size = (10 * (sample_count / 100) ** (-0.35)) / dpr
-			marker_size = np.minimum(10,marker_size)
+		marker_size = self.marker_size(samples.shape[0], dpr)
 
 		patched_figure["data"][0].marker.size = marker_size * 1.5
 		patched_figure["data"][1].marker.size = marker_size
@@ -213,10 +184,10 @@ class Object3DAnd2DRenderer(Object3DRenderer):
 		if not self.reverse_x_y_axis:
 			# True: (eg torus: x is p, y is t)
 			# False: (eg cylinder: x is p, y is z)
-			tp[:, [0, 1]] = tp[:, [1, 0]] # swap order, below code assumes self.reverse_x_y_axis is True
+			tp = tp[:, [1, 0]] # swap order (as a copy, samples may be cached), below code assumes self.reverse_x_y_axis is True
 
-		patched_figure["data"][0].x = tp[:, 1]
-		patched_figure["data"][0].y = tp[:, 0]
+		patched_figure["data"][0].x = TypedArray.encode(tp[:, 1], self.object.coordinate_tolerance)
+		patched_figure["data"][0].y = TypedArray.encode(tp[:, 0], self.object.coordinate_tolerance)
 		
 
 
@@ -250,54 +221,41 @@ class Object3DAnd2DRenderer(Object3DRenderer):
 
 
 		if self.per_x or self.per_y:
-			patched_figure["data"][1].x = ext_x
-			patched_figure["data"][1].y = ext_y
-
-		return patched_figure
-
-
-	def update_plot_dist_2d(self, values_dist, ids_dist, selected_distribution, selected_sampling, _):
-		patched_figure = Patch()
-		try:
-			dist_options =  self.object.distributions[selected_distribution].distribution_options
-		except KeyError:
-			# got stale values, ignore
-			return no_update
-		
-		# the order of options might not be guaranteed, so we map them by their ids
-		id_value_dist = [(id,v) for id, v in zip(ids_dist, values_dist)]
-		
-
-		# and them sort them, so they are in the same order as sampling_options and dist_options
-		options_dist_new = sorted(id_value_dist, key=lambda x: int(x[0]["index"]))
-
-
-		for opt, (id, new_state) in zip(dist_options, options_dist_new):
-			opt.update_state(new_state)
-
-		pdf = self.object.distributions[selected_distribution].get_pdf(list(dist_options))
+			patched_figure["data"][1].x = TypedArray.encode(ext_x, self.object.coordinate_tolerance)
+			patched_figure["data"][1].y = TypedArray.encode(ext_y, self.object.coordinate_tolerance)
 
+	# the heatmap grid is small and cached, it is not coarsened while dragging
+	def patch_density_2d(self, patched_figure, selected_distribution, dist_state, coarse=False):
 		# pdf heatmap
 		X, Y = self.color_meshgrid
 		if self.reverse_x_y_axis:
 			xy = np.column_stack((Y.ravel(), X.ravel()))
 		else:
 			xy = np.column_stack((X.ravel(), Y.ravel()))
-		z_flat = self.object.pdf_2d(xy, pdf).reshape(X.shape)
 
-		z = z_flat.reshape(X.shape)
+		# the grid only depends on the plot settings, they identify it in the cache
+		grid_key = (self.object.plot_settings_2d.color_location, X.shape, self.reverse_x_y_axis)
+		z_flat = self.object.density_2d(selected_distribution, dist_state, xy, grid_key)
+		if z_flat is None:
+			return # no pdf, keep the heatmap
 
-		patched_figure["data"][2].z = z
+		z = z_flat.reshape(X.shape)
 
-		return patched_figure
+		# densities scaled to their maximum span the colorscale from 0 to 1, true scale densities can exceed it
+		zmax = max(1.0, float(np.nanmax(z))) if np.isfinite(z).any() else 1.0
+		patched_figure["data"][2].z = TypedArray.encode(z, self.object.density_tolerance * zmax)
+		patched_figure["data"][2].zmax = zmax
 
 	def get_layout_components(self):
-		initial_distribution = self.object.distributions[list(self.object.distributions.keys())[0]]
-		initial_sampling_method = initial_distribution.sampling_methods[0].get_name() if initial_distribution.sampling_methods else "no sampling methods found"
-		initial_sampling_options = [x.get_name() for x in initial_distribution.sampling_methods]
+		# names come from the manifest, so building the layout does not instantiate any distribution
+		initial_distribution_name = next(iter(self.object.distributions), None)
+		initial_sampling_options = self.object.distributions.sampling_method_names(initial_distribution_name) if initial_distribution_name is not None else []
+		initial_sampling_method = initial_sampling_options[0] if initial_sampling_options else "no sampling methods found"
 		
 		options = [
 			dcc.Store(id=f"device-pixel-ratio-{self.id}", data=1),
+			dcc.Store(id=f"session-id-{self.id}"),
+			dcc.Store(id=f"samples-shown-{self.id}"),
 
 			html.P("Select Visualization Mode:"),
 
@@ -320,7 +278,7 @@ class Object3DAnd2DRenderer(Object3DRenderer):
 			dcc.RadioItems(
 				id="distribution-selector",
 				options=(list(self.object.distributions.keys())),
-				value=initial_distribution.get_name() if self.object.distributions else "no distributions found",
+				value=initial_distribution_name if initial_distribution_name is not None else "no distributions found",
 			),
 			html.Br(),
 			dcc.RadioItems(
@@ -343,7 +301,9 @@ class Object3DAnd2DRenderer(Object3DRenderer):
 
 			dcc.Markdown(id=f"sampling-method-info-markdown-{self.id}", mathjax=True),
 
-			dcc.Markdown(id=f"sampling-method-info-markdown-{self.id}", mathjax=True),
+			html.Hr(id=f"sampling-option-info-divider-{self.id}", hidden=True),
+
+			dcc.Markdown(id=f"sampling-option-info-markdown-{self.id}", mathjax=True),
 		]
 
 		graph = [dcc.Graph(id=f"graph-{self.id}", figure=self.fig, config=self.config, style={'height': '100%'})]
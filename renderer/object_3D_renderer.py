@@ -1,11 +1,24 @@
+import hashlib
 from functools import lru_cache
 from dash import html, dcc, callback, Input, Output, ALL, State, Patch, clientside_callback, ClientsideFunction, MATCH, no_update
 import numpy as np
 import plotly.graph_objects as go
 import plotly.figure_factory as ff
 import dash
+from dash.exceptions import PreventUpdate
 
 from renderer.renderer import Renderer
+from util.request_sequencer import request_sequencer
+from util.typed_array import TypedArray
+
+# derived products of the plot, updated separately depending on what changed
+SAMPLES = "samples" # sample markers and their size
+DENSITY = "density" # pdf mesh in 3d, heatmap in 2d
+PLOT_PRODUCTS = (SAMPLES, DENSITY)
+
+# at most this many samples are shown while a slider is dragged, the full set once it is released
+DRAG_SAMPLE_LIMIT = 1000
+
 class Object3DRenderer(Renderer):
 	def __init__(self, object_3D, id, register_3d_callbacks=True):
 		# dash doesnt like duplicate calback functions
@@ -102,6 +115,13 @@ class Object3DRenderer(Renderer):
 			Input(f"graph-{self.id}", "figure"),
 		)
 
+		# random id per page load, identifies the session in the request sequencer
+		clientside_callback(
+			ClientsideFunction(namespace="utils", function_name="getSessionId"),
+			Output(f"session-id-{self.id}", "data"),
+			Input(f"session-id-{self.id}", "id"),
+		)
+
 		# updates wich sampling methods are available once distribution is selected
 		@callback(
 			Output(f"sampling-selector-{self.id}", "options"),
@@ -109,7 +129,11 @@ class Object3DRenderer(Renderer):
 			Input("distribution-selector", "value"),
 		)
 		def update_sampling_methods(selected_distribution):
-			options = list(self.object.distributions[selected_distribution].sampling_method_dict.keys())
+			try:
+				options = list(self.object.distributions[selected_distribution].sampling_method_dict.keys())
+			except KeyError:
+				# failed to load, it is no longer listed once the page is reloaded
+				return [], None
 
 			# set safe initial value
 			initial_value = options[0] 
@@ -128,14 +152,19 @@ class Object3DRenderer(Renderer):
 			Input(f"sampling-selector-{self.id}", "value")
 		)
 		def update_curr_distribution(selected_distribution, selected_sampling):
+			try:
+				dist = self.object.distributions[selected_distribution]
+			except KeyError:
+				return [], [], f"'{selected_distribution}' could not be loaded.", "", False, True
+
 			# ids are given in the same order as options_dist and options_sampling
-			options_dist = self.object.distributions[selected_distribution].distribution_options
+			options_dist = dist.distribution_options
 			options_dist_dcc = [opt.to_dash_component("dist", id, self.id) for id, opt in enumerate(options_dist)]
 
-			options_sampling = self.object.distributions[selected_distribution].sampling_method_dict[selected_sampling]
+			options_sampling = dist.sampling_method_dict[selected_sampling]
 			options_sampling_dcc = [opt.to_dash_component("sampling", id, self.id) for id, opt in enumerate(options_sampling.sample_options)]
 
-			dist_info_md = self.object.distributions[selected_distribution].info_md
+			dist_info_md = dist.info_md
 			sampling_info_md = options_sampling.info_md
 
 			dist_hidden = dist_info_md is None or dist_info_md.strip() == ""
@@ -145,17 +174,39 @@ class Object3DRenderer(Renderer):
 			return options_dist_dcc, options_sampling_dcc, dist_info_md, sampling_info_md, dist_hidden, sampling_hidden
 
 
+		# info of the sampling method that depends on the distribution options
+		@callback(
+			Output(f"sampling-option-info-markdown-{self.id}", "children"),
+			Output(f"sampling-option-info-divider-{self.id}", "hidden"),
+			Input({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "value"),
+			State({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "id"),
+			Input("distribution-selector", "value"),
+			Input(f"sampling-selector-{self.id}", "value"),
+		)
+		def update_sampling_option_info(values_dist, ids_dist, selected_distribution, selected_sampling):
+			try:
+				dist = self.object.distributions[selected_distribution]
+				sampling_method = dist.sampling_method_dict[selected_sampling]
+			except KeyError:
+				return "", True
+
+			dist_state = self.snapshot_options(dist.distribution_options, ids_dist, values_dist)
+			info_md = sampling_method.option_info_md(dist_state)
+			return info_md, info_md is None or info_md.strip() == ""
+
+
 		# optional manual input
 		@callback(
 			Output({"type": "sampling", "renderer": self.id, "index": MATCH, "manual": True}, "value"),
 			Output({"type": "manual_input-sampling", "renderer": self.id, "index": MATCH}, "value"),
 			Input({"type": "manual_input-sampling", "renderer": self.id, "index": MATCH}, "value"),
 			Input({"type": "sampling", "renderer": self.id, "index": MATCH, "manual": True}, "value"),
+			Input({"type": "sampling", "renderer": self.id, "index": MATCH, "manual": True}, "drag_value"),
 			State("distribution-selector", "value"),
 			State(f"sampling-selector-{self.id}", "value"),
 			prevent_initial_call=True,
 		)
-		def manual_input_changed(val, val_silder, selected_distribution, selected_sampling):
+		def manual_input_changed(val, val_silder, drag_val_slider, selected_distribution, selected_sampling):
 			triggered_id = dash.ctx.triggered_id
 			source = triggered_id["type"]
 
@@ -176,24 +227,25 @@ class Object3DRenderer(Renderer):
 			if source == "manual_input-sampling": # manual input changed, update slider
 
 				if (wrapper.check_input is None or wrapper.check_input(val)) and wrapper.slider.is_valid(val):
-					slider_value = wrapper.update_state_manual(val)
+					slider_value = wrapper.slider_value_from_manual(val)
 					return slider_value, no_update
 				else:
 					return no_update, no_update
 				
-			else: # slider changed, update manual input
-				return no_update, wrapper.slider.transfrom_up(val_silder)
+			else: # slider changed or is dragged, update manual input
+				return no_update, wrapper.slider.transfrom_up(self.moved_slider_value(val_silder, drag_val_slider))
 
 		@callback(
 			Output({"type": "dist", "renderer": self.id, "index": MATCH, "manual": True}, "value"),
 			Output({"type": "manual_input-dist", "renderer": self.id, "index": MATCH}, "value"),
 			Input({"type": "manual_input-dist", "renderer": self.id, "index": MATCH}, "value"),
 			Input({"type": "dist", "renderer": self.id, "index": MATCH, "manual": True}, "value"),
+			Input({"type": "dist", "renderer": self.id, "index": MATCH, "manual": True}, "drag_value"),
 			State("distribution-selector", "value"),
 			State(f"sampling-selector-{self.id}", "value"),
 			prevent_initial_call=True,
 		)
-		def manual_input_dist_changed(val_manual, val_slider, selected_distribution, selected_sampling):
+		def manual_input_dist_changed(val_manual, val_slider, drag_val_slider, selected_distribution, selected_sampling):
 			triggered_id = dash.ctx.triggered_id
 			source = triggered_id["type"]
 
@@ -215,138 +267,276 @@ class Object3DRenderer(Renderer):
 				# check_input is given by distribution/ sampling method, if None, no special constraints are given
 				# slider.is_valid is given by the slider itself, can be less strict
 				if (wrapper.check_input is None or wrapper.check_input(val_manual)) and wrapper.slider.is_valid(val_manual):
-					slider_value = wrapper.update_state_manual(val_manual)
+					slider_value = wrapper.slider_value_from_manual(val_manual)
 					return slider_value, no_update
 				return no_update, no_update
 
-			# slider changed, sync manual input display
-			return no_update, wrapper.slider.transfrom_up(val_slider)
+			# slider changed or is dragged, sync manual input display
+			return no_update, wrapper.slider.transfrom_up(self.moved_slider_value(val_slider, drag_val_slider))
+
+	# value of a slider that triggered a manual input callback, its drag value while it is dragged
+	# a slider also reports a value set by a callback (eg. by the manual input) as drag value, that echo is ignored
+	def moved_slider_value(self, value, drag_value):
+		if not self.dragging(dash.ctx.triggered_prop_ids):
+			return value
+		if drag_value is None or drag_value == value:
+			raise PreventUpdate
+		return drag_value
 
 	def _register_3d_plot_callbacks(self):
 
-		# updates the plot based on selected sampling options
+		# single update pipeline for the plot, computes only the parts that depend on the changed inputs
 		@callback(
 			Output(f"graph-{self.id}", "figure", allow_duplicate=True),
+			*self.incremental_outputs(),
 			Input({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "value"),
+			Input({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "drag_value"),
 			State({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "id"),
 			Input({"type": "sampling", "renderer": self.id, "index": ALL, "manual": ALL}, "value"),
+			Input({"type": "sampling", "renderer": self.id, "index": ALL, "manual": ALL}, "drag_value"),
 			State({"type": "sampling", "renderer": self.id, "index": ALL, "manual": ALL}, "id"),
 			Input("distribution-selector", "value"),
 			Input(f"sampling-selector-{self.id}", "value"),
 			Input(f"distribution-options-{self.id}", "children"),
 			State(f"device-pixel-ratio-{self.id}", "data"),
+			State(f"session-id-{self.id}", "data"),
+			State(f"samples-shown-{self.id}", "data"),
 			prevent_initial_call='initial_duplicate'
 		)
-		def update_plot_sample_callback(values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr):
-			return self.update_plot_sample(values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr)
-		
-		# updates the plot based on selected distribution options
-		@callback(
-			Output(f"graph-{self.id}", "figure", allow_duplicate=True),
-			Input({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "value"),
-			State({"type": "dist", "renderer": self.id, "index": ALL, "manual": ALL}, "id"),
-			Input("distribution-selector", "value"),
-			Input(f"sampling-selector-{self.id}", "value"),
-			Input(f"distribution-options-{self.id}", "children"),
-			prevent_initial_call='initial_duplicate'
+		def update_plot_callback(values_dist, drag_values_dist, ids_dist, values_samp, drag_values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr, session_id, shown):
+			triggered = dash.ctx.triggered_prop_ids
+			products = self.plot_products(triggered)
+			coarse, values_dist, values_samp = self.dragged_values(triggered, ids_dist, values_dist, drag_values_dist, ids_samp, values_samp, drag_values_samp)
+			shown = shown if self.sampling_options_only(triggered) else None
+			# only the newest request of a slider drag is computed
+			return request_sequencer.run(session_id, (self.id, "plot"), lambda: self.update_plot(products, values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, dpr, shown=shown, coarse=coarse))
+
+	# the samples of prefix stable sampling methods are extended and truncated instead of replaced (see extend_samples)
+	# the store describes the samples in the plot, it is updated together with them, so both always match
+	# (the browser discards the outputs of outdated requests together)
+	def incremental_outputs(self):
+		return (
+			Output(f"graph-{self.id}", "extendData"),
+			Output(f"graph-{self.id}", "prependData"),
+			Output(f"samples-shown-{self.id}", "data"),
 		)
-		def update_plot_dist_callback(values_dist, ids_dist, selected_distribution, selected_sampling, _):
-			return self.update_plot_dist(values_dist, ids_dist, selected_distribution, selected_sampling, _)
 
-		
-		
-	def update_plot_sample(self, values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, _, dpr):
-		try:
-			dist_options =  self.object.distributions[selected_distribution].distribution_options
-			sampling_options = self.object.distributions[selected_distribution].sampling_method_dict[selected_sampling].sample_options
-		except KeyError:
-			# got stale values, ignore
-			return dash.no_update
-		
-		# the order of options might not be guaranteed, so we map them by their ids
-		id_value_dist = [(id,v) for id, v in zip(ids_dist, values_dist)]
-		id_value_samp = [(id,v) for id, v in zip(ids_samp, values_samp)]
-		
-
-		# and them sort them, so they are in the same order as sampling_options and dist_options
-		options_samp_new = sorted(id_value_samp, key=lambda x: int(x[0]["index"]))
-		options_dist_new = sorted(id_value_dist, key=lambda x: int(x[0]["index"]))
-
-
-		for opt, (id, new_state) in zip(sampling_options, options_samp_new):
-			opt.update_state(new_state)
-
-		for opt, (id, new_state) in zip(dist_options, options_dist_new):
-			opt.update_state(new_state)
-
-		# samples 
-		samples, _ = self.object.update_sample(selected_distribution, selected_sampling, sampling_options, dist_options)
-
-
-		patched_figure = Patch()
-
-
-		patched_figure["data"][1].x = samples[:, 0]
-		patched_figure["data"][1].y = samples[:, 1]
-		patched_figure["data"][1].z = samples[:, 2]
+	# sliders send drag_value while they are dragged and value once they are released (updatemode="mouseup")
+	# a drag only needs a coarse update, the release is followed by the full one
+	@staticmethod
+	def dragging(triggered_prop_ids):
+		return len(triggered_prop_ids) > 0 and all(prop_id.endswith(".drag_value") for prop_id in triggered_prop_ids)
+
+	# whether the update is coarse and the option values to plot, with the drag values of the dragged sliders
+	# a slider also reports a value set by a callback (eg. by the manual input) as drag value, that is no drag
+	def dragged_values(self, triggered_prop_ids, ids_dist, values_dist, drag_values_dist, ids_samp, values_samp, drag_values_samp):
+		if not self.dragging(triggered_prop_ids):
+			return False, values_dist, values_samp
+
+		dragged_dist = self.drag_values(triggered_prop_ids, ids_dist, values_dist, drag_values_dist)
+		dragged_samp = self.drag_values(triggered_prop_ids, ids_samp, values_samp, drag_values_samp)
+		return (dragged_dist != values_dist or dragged_samp != values_samp), dragged_dist, dragged_samp
+
+	# values with the drag values of the dragged sliders, the others might hold drag values of earlier drags
+	@staticmethod
+	def drag_values(triggered_prop_ids, ids, values, drag_values):
+		dragged = [component_id for prop_id, component_id in triggered_prop_ids.items() if prop_id.endswith(".drag_value")]
+		return [
+			drag_value if component_id in dragged and drag_value is not None else value
+			for component_id, value, drag_value in zip(ids, values, drag_values)
+		]
 
-		# set size based on number of samples
-		if samples.size == 0:
-			marker_size = 0 
-		else:
-			sample_count = samples.shape[0]
-			marker_size = (10 * (sample_count / 100) ** (-0.35)) / dpr
-			marker_size = np.minimum(10,marker_size) 
-		
+	# only sampling options changed, anything else (eg. a mode switch) might have replaced the samples in the plot
+	@staticmethod
+	def sampling_options_only(triggered_prop_ids):
+		return len(triggered_prop_ids) > 0 and all(
+			isinstance(component_id, dict) and component_id.get("type") == "sampling"
+			for component_id in triggered_prop_ids.values()
+		)
 
-		patched_figure["data"][1].marker.size = marker_size	
-		return patched_figure
-	
-	def update_plot_dist(self, values_dist, ids_dist, selected_distribution, selected_sampling, _):
-		dist_options =  self.object.distributions[selected_distribution].distribution_options
+	# parts of the plot that depend on the triggering inputs
+	# samples (and their marker size) depend on everything, the density only on the distribution and its options
+	def plot_products(self, triggered_prop_ids):
+		products = set()
+		for component_id in triggered_prop_ids.values():
+			if isinstance(component_id, dict) and component_id.get("type") == "sampling":
+				products.add(SAMPLES)
+			elif component_id == f"sampling-selector-{self.id}":
+				products.add(SAMPLES)
+			else:
+				products.update(PLOT_PRODUCTS)
+
+		# initial call, nothing triggered
+		return products or set(PLOT_PRODUCTS)
+
+	@staticmethod
+	def snapshot_options(options, ids, values):
+		# builds immutable per callback states for the options, the shared option objects are never modified
+		# so concurrent sessions can not overwrite each others values mid computation
 
 		# the order of options might not be guaranteed, so we map them by their ids
-		id_value_dist = [(id,v) for id, v in zip(ids_dist, values_dist)]
+		# and sort them, so they are in the same order as options
+		id_values = sorted(zip(ids, values), key=lambda x: int(x[0]["index"]))
+		values_sorted = [v for _, v in id_values]
+
+		# options without a value (eg. sliders not rendered yet) keep their initial state
+		return tuple(
+			opt.snapshot(values_sorted[i]) if i < len(values_sorted) else opt.default_snapshot()
+			for i, opt in enumerate(options)
+		)
 
-		options_dist_new = sorted(id_value_dist, key=lambda x: int(x[0]["index"]))
+	# samples and density are patched by these, the 2d renderer switches them depending on the mode
+	# the last one extends the samples, None if the mode does not support it
+	def plot_patchers(self, mode=None):
+		return self.patch_samples, self.patch_density, self.extend_samples
 
+	# computes the requested products and returns them as one combined patch
+	# with the extend and prepend data of incremental sample updates and the description of the samples in the plot
+	# shown is the description of the samples currently in the plot, None to replace them
+	# coarse updates (while dragging) use at most DRAG_SAMPLE_LIMIT samples (see coarse_samples) and the coarse density mesh
+	def update_plot(self, products, values_dist, ids_dist, values_samp, ids_samp, selected_distribution, selected_sampling, dpr, mode=None, shown=None, coarse=False):
+		try:
+			dist = self.object.distributions[selected_distribution]
+			dist_options = dist.distribution_options
+			sampling_options = dist.sampling_method_dict[selected_sampling].sample_options
+		except KeyError:
+			# got stale values, ignore
+			raise PreventUpdate
 
-		for opt, (id, new_state) in zip(dist_options, options_dist_new):
-			opt.update_state(new_state)
+		# snapshots are built once and shared by all products
+		dist_state = self.snapshot_options(dist_options, ids_dist, values_dist)
+		sampling_state = self.snapshot_options(sampling_options, ids_samp, values_samp)
 
+		patch_samples, patch_density, extend_samples = self.plot_patchers(mode)
 
-		# meshed density function plot plot
 		patched_figure = Patch()
+		extend_data, prepend_data, samples_shown = no_update, no_update, no_update
+		if SAMPLES in products:
+			samples_shown = self.samples_shown(selected_distribution, selected_sampling, sampling_state, dist_state, mode) if extend_samples is not None else None
+			if shown is not None and samples_shown is not None and shown["key"] == samples_shown["key"]:
+				# only the sample count changed, also while its slider is dragged, so the plot is not coarsened
+				# and the release finds the samples it extends in the plot
+				if shown["count"] != samples_shown["count"]:
+					extend_data, prepend_data = extend_samples(patched_figure, selected_distribution, selected_sampling, sampling_state, dist_state, dpr, shown["count"], samples_shown["count"])
+			else:
+				patch_samples(patched_figure, selected_distribution, selected_sampling, sampling_state, dist_state, dpr, coarse)
+				if coarse and samples_shown is not None:
+					# the coarse samples are a prefix (see coarse_samples), the release extends them
+					samples_shown = dict(samples_shown, count=min(samples_shown["count"], DRAG_SAMPLE_LIMIT))
+		if DENSITY in products:
+			patch_density(patched_figure, selected_distribution, dist_state, coarse)
+		return patched_figure, extend_data, prepend_data, samples_shown
+
+	# describes the samples of a prefix stable sampling method by their count and a hash of everything else they depend on
+	# None if the sampling method is not prefix stable
+	def samples_shown(self, selected_distribution, selected_sampling, sampling_state, dist_state, mode):
+		dist = self.object.distributions[selected_distribution]
+		sampling_method = dist.sampling_method_dict[selected_sampling]
+		if not sampling_method.prefix_stable:
+			return None
+
+		i = sampling_method.sample_count_option
+		options = [opt for j, opt in enumerate(sampling_method.sample_options) if j != i]
+		states = [state for j, state in enumerate(sampling_state) if j != i]
+		key = (
+			self.object.cache_key,
+			mode,
+			selected_distribution,
+			selected_sampling,
+			self.object.options_key(options, states),
+			self.object.options_key(dist.distribution_options, dist_state),
+		)
+		return {"key": hashlib.sha1(repr(key).encode()).hexdigest(), "count": int(sampling_state[i].state)}
+
+	# marker size based on number of samples
+	@staticmethod
+	def marker_size(sample_count, dpr):
+		if sample_count == 0:
+			return 0 # no samples, no size
+		marker_size = (10 * (sample_count / 100) ** (-0.35)) / dpr
+		return np.minimum(10, marker_size)
+
+	# indices of the samples shown while dragging, a fixed random subset per count, so it does not flicker between frames
+	# a stride would show patterns of the lattices (eg. spirals of the fibonacci lattice) instead
+	@staticmethod
+	@lru_cache(maxsize=64)
+	def decimation(sample_count):
+		if sample_count <= DRAG_SAMPLE_LIMIT:
+			return slice(None)
+		indices = np.sort(np.random.default_rng(sample_count).choice(sample_count, DRAG_SAMPLE_LIMIT, replace=False))
+		indices.flags.writeable = False
+		return indices
+
+	# samples shown while dragging, at most DRAG_SAMPLE_LIMIT, same format as update_sample
+	# prefix stable sampling methods only compute the first ones, the others are computed in full and decimated
+	def coarse_samples(self, selected_distribution, selected_sampling, sampling_state, dist_state):
+		sampling_method = self.object.distributions[selected_distribution].sampling_method_dict[selected_sampling]
+		if sampling_method.prefix_stable:
+			sample_count = int(sampling_state[sampling_method.sample_count_option].state)
+			return self.object.sample_tail(selected_distribution, selected_sampling, sampling_state, dist_state, 0, min(sample_count, DRAG_SAMPLE_LIMIT))
+
+		samples, samples_2d = self.object.update_sample(selected_distribution, selected_sampling, sampling_state, dist_state)
+		decimation = self.decimation(samples.shape[0])
+		return samples[decimation], (samples_2d[decimation] if samples_2d is not None else None)
+
+	def patch_samples(self, patched_figure, selected_distribution, selected_sampling, sampling_state, dist_state, dpr, coarse=False):
+		if coarse:
+			samples, _ = self.coarse_samples(selected_distribution, selected_sampling, sampling_state, dist_state)
+		else:
+			samples, _ = self.object.update_sample(selected_distribution, selected_sampling, sampling_state, dist_state)
+
+		# binary typed arrays, much smaller and faster to serialize than json number lists
+		# reduced to the error budget of the manifold
+		patched_figure["data"][1].x = TypedArray.encode(samples[:, 0], self.object.coordinate_tolerance)
+		patched_figure["data"][1].y = TypedArray.encode(samples[:, 1], self.object.coordinate_tolerance)
+		patched_figure["data"][1].z = TypedArray.encode(samples[:, 2], self.object.coordinate_tolerance)
+
+		patched_figure["data"][1].marker.size = self.marker_size(samples.shape[0], dpr)
+
+	# changes the number of samples in the plot from count_shown to count, without resending the others
+	# returns the extend data (new samples) and prepend data (truncation) of the graph
+	def extend_samples(self, patched_figure, selected_distribution, selected_sampling, sampling_state, dist_state, dpr, count_shown, count):
+		extend_data, prepend_data = no_update, no_update
+		if count > count_shown:
+			samples, _ = self.object.sample_tail(selected_distribution, selected_sampling, sampling_state, dist_state, count_shown, count)
+			# plotly.js does not decode typed array specs in extendTraces, these are sent as lists
+			extend_data = [{"x": [samples[:, 0]], "y": [samples[:, 1]], "z": [samples[:, 2]]}, [1]]
+		else:
+			# prepending nothing with at most count points keeps the first count samples
+			prepend_data = [{"x": [[]], "y": [[]], "z": [[]]}, [1], count]
 
-		
-		pdf = self.object.distributions[selected_distribution].get_pdf(list(dist_options))
-		if pdf is not None:
-			x, y, z  = self.object.generate_mesh(pdf)
+		patched_figure["data"][1].marker.size = self.marker_size(count, dpr)
+		return extend_data, prepend_data
+
+	def patch_density(self, patched_figure, selected_distribution, dist_state, coarse=False):
+		# meshed density function plot
+		mesh = self.object.density_mesh(selected_distribution, dist_state, coarse)
+		if mesh is not None:
+			x, y, z = mesh
 		else:
 			x, y, z = [], [], []
 
-		patched_figure["data"][2].x = x
-		patched_figure["data"][2].y = y
-		patched_figure["data"][2].z = z
+		# nan gaps between the wireframe lines are kept by the float typed arrays
+		patched_figure["data"][2].x = TypedArray.encode(x, self.object.coordinate_tolerance)
+		patched_figure["data"][2].y = TypedArray.encode(y, self.object.coordinate_tolerance)
+		patched_figure["data"][2].z = TypedArray.encode(z, self.object.coordinate_tolerance)
 
-		return patched_figure
-		
-		
-		
-		
 	def get_layout_components(self):
-		initial_distribution = self.object.distributions[list(self.object.distributions.keys())[0]]
-		initial_sampling_method = initial_distribution.sampling_methods[0].get_name() if initial_distribution.sampling_methods else "no sampling methods found"
-		initial_sampling_options = [x.get_name() for x in initial_distribution.sampling_methods]
+		# names come from the manifest, so building the layout does not instantiate any distribution
+		initial_distribution_name = next(iter(self.object.distributions), None)
+		initial_sampling_options = self.object.distributions.sampling_method_names(initial_distribution_name) if initial_distribution_name is not None else []
+		initial_sampling_method = initial_sampling_options[0] if initial_sampling_options else "no sampling methods found"
 		
 		options = [
 			dcc.Store(id=f"device-pixel-ratio-{self.id}", data=1),
+			dcc.Store(id=f"session-id-{self.id}"),
+			dcc.Store(id=f"samples-shown-{self.id}"),
 			html.Br(),
 			html.P("Select Distribution and Sampling Method:"),
 			dcc.RadioItems(
 				id="distribution-selector",
 				options=(list(self.object.distributions.keys())),
-				value=initial_distribution.get_name() if self.object.distributions else "no distributions found",
+				value=initial_distribution_name if initial_distribution_name is not None else "no distributions found",
 			),
 			html.Br(),
 			dcc.RadioItems(
@@ -369,6 +559,10 @@ class Object3DRenderer(Renderer):
 
 			dcc.Markdown(id=f"sampling-method-info-markdown-{self.id}", mathjax=True),
 
+			html.Hr(id=f"sampling-option-info-divider-{self.id}", hidden=True),
+
+			dcc.Markdown(id=f"sampling-option-info-markdown-{self.id}", mathjax=True),
+
 
 		]
 
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from model.distributions.sphere.bingham.random import BinghamRandomSampling
+from util.fisher_bingham_util import FisherBinghamUtil
+from util.selectors.selector_state import SelectorState
+
+sampler = BinghamRandomSampling()
+
+SAMPLE_COUNT = 100000
+LAMBDAS = [(0, 0), (10, 0), (10, 10), (50, 3)]
+
+
+@pytest.fixture(autouse=True)
+def seeded(monkeypatch):
+	# the sampler draws from a fresh generator, seed it so the test does not fail at random
+	default_rng = np.random.default_rng
+	monkeypatch.setattr(np.random, "default_rng", lambda seed=None: default_rng(0))
+
+
+def sample(lambda_1, lambda_2, sample_count):
+	return sampler.sample((SelectorState(sample_count),), (SelectorState(lambda_1), SelectorState(lambda_2)))
+
+
+# E[x²] and E[y²] of the density exp(-λ₁x² - λ₂y²) are -∂ log C / ∂λᵢ, by central differences
+def second_moments(lambda_1, lambda_2, step=1e-4):
+	d_1 = FisherBinghamUtil.bingham_log_normalizer(lambda_1 + step, lambda_2) - FisherBinghamUtil.bingham_log_normalizer(lambda_1 - step, lambda_2)
+	d_2 = FisherBinghamUtil.bingham_log_normalizer(lambda_1, lambda_2 + step) - FisherBinghamUtil.bingham_log_normalizer(lambda_1, lambda_2 - step)
+	return -d_1 / (2 * step), -d_2 / (2 * step)
+
+
+@pytest.mark.parametrize("lambda_1, lambda_2", LAMBDAS)
+def test_001_second_moments_match_normalizer(lambda_1, lambda_2):
+	samples = sample(lambda_1, lambda_2, SAMPLE_COUNT)
+
+	squares = np.square(samples[:, :2])
+	standard_error = np.std(squares, axis=0) / np.sqrt(SAMPLE_COUNT)
+	assert np.all(np.abs(np.mean(squares, axis=0) - second_moments(lambda_1, lambda_2)) < 5 * standard_error + 1e-4)
+
+
+@pytest.mark.parametrize("sample_count", [1, 10, 999, 10000])
+@pytest.mark.parametrize("lambda_1, lambda_2", LAMBDAS)
+def test_002_returns_sample_count_points(lambda_1, lambda_2, sample_count):
+	samples = sample(lambda_1, lambda_2, sample_count)
+
+	assert samples.shape == (sample_count, 3)
+	assert np.allclose(np.linalg.norm(samples, axis=1), 1)
@@ -0,0 +1,61 @@
+import json
+import sys
+
+import pytest
+
+from model.distributions.distribution_loader import DistributionRegistry
+
+PACKAGE = "distribution_loader_test_plugins"
+
+DISTRIBUTION_MODULE = '''
+class Distribution:
+	def get_name(self):
+		return "Working"
+'''
+
+MANIFEST = [
+	{"name": "Working", "module": f"{PACKAGE}.working", "class": "Distribution", "distribution_options": [], "sampling_methods": []},
+	{"name": "Broken", "module": f"{PACKAGE}.missing", "class": "Distribution", "distribution_options": [], "sampling_methods": []},
+]
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+	package = tmp_path / PACKAGE
+	package.mkdir()
+	(package / "__init__.py").write_text("")
+	(package / "working.py").write_text(DISTRIBUTION_MODULE)
+	(package / "manifest.json").write_text(json.dumps(MANIFEST))
+
+	monkeypatch.syspath_prepend(str(tmp_path))
+	yield DistributionRegistry(object, PACKAGE)
+
+	for name in [name for name in sys.modules if name.startswith(PACKAGE)]:
+		del sys.modules[name]
+
+
+def test_001_lists_manifest_without_loading(registry):
+	assert list(registry) == ["Working", "Broken"]
+	assert not registry.is_loaded("Working")
+
+
+def test_002_broken_distribution_is_dropped(registry):
+	with pytest.raises(KeyError):
+		registry["Broken"]
+
+	assert list(registry) == ["Working"]
+	assert len(registry) == 1
+	assert "Broken" not in registry
+
+	# reported once, later lookups fail without importing again
+	with pytest.raises(KeyError):
+		registry["Broken"]
+
+
+def test_003_load_all_drops_broken_distributions(registry, capsys):
+	registry.load_all()
+
+	assert "Could not load distribution 'Broken'" in capsys.readouterr().out
+	assert list(registry) == ["Working"]
+	assert registry["Working"].get_name() == "Working"
+	assert dict(registry).keys() == {"Working"}
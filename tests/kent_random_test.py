@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("kent_distribution")
+
+from model.distributions.sphere.kent.random import KentRandomSampling
+from util.fisher_bingham_util import FisherBinghamUtil
+from util.selectors.selector_state import SelectorState
+
+sampler = KentRandomSampling()
+
+SAMPLE_COUNT = 100000
+# κ < 0.5 uses uniform proposals, larger κ the normal envelope, β = κ / 2 is the largest β the sampler allows
+KAPPA_BETAS = [(0, 0), (0.3, 0.1), (0.4, 0.2), (1, 0), (1, 0.5), (10, 2), (10, 5), (50, 25)]
+
+
+@pytest.fixture(autouse=True)
+def seeded(monkeypatch):
+	# the sampler draws from a fresh generator, seed it so the test does not fail at random
+	default_rng = np.random.default_rng
+	monkeypatch.setattr(np.random, "default_rng", lambda seed=None: default_rng(0))
+
+
+def sample(kappa, beta, sample_count):
+	return sampler.sample((SelectorState(sample_count),), (SelectorState(kappa), SelectorState(beta)))
+
+
+# E[z] and E[y² - x²] of the density exp(κz + β(y² - x²)) are ∂ log C / ∂κ and ∂ log C / ∂β, by central differences
+def moments(kappa, beta, step=1e-4):
+	d_kappa = FisherBinghamUtil.kent_log_normalizer(kappa + step, beta) - FisherBinghamUtil.kent_log_normalizer(kappa - step, beta)
+	d_beta = FisherBinghamUtil.kent_log_normalizer(kappa, beta + step) - FisherBinghamUtil.kent_log_normalizer(kappa, beta - step)
+	return d_kappa / (2 * step), d_beta / (2 * step)
+
+
+@pytest.mark.parametrize("kappa, beta", KAPPA_BETAS)
+def test_001_moments_match_normalizer(kappa, beta):
+	assert sampler.envelope(kappa, beta).uniform == (kappa < 0.5)
+
+	samples = sample(kappa, beta, SAMPLE_COUNT)
+
+	assert samples.shape == (SAMPLE_COUNT, 3)
+	statistics = np.column_stack((samples[:, 2], np.square(samples[:, 1]) - np.square(samples[:, 0])))
+	standard_error = np.std(statistics, axis=0) / np.sqrt(SAMPLE_COUNT)
+	assert np.all(np.abs(np.mean(statistics, axis=0) - moments(kappa, beta)) < 5 * standard_error + 1e-4)
+
+
+@pytest.mark.parametrize("sample_count", [1, 10, 999, 10000])
+@pytest.mark.parametrize("kappa, beta", [(0.3, 0.1), (10, 5)])
+def test_002_returns_sample_count_points(kappa, beta, sample_count):
+	samples = sample(kappa, beta, sample_count)
+
+	assert samples.shape == (sample_count, 3)
+	assert np.allclose(np.linalg.norm(samples, axis=1), 1)
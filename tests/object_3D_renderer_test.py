@@ -0,0 +1,99 @@
+from dash import no_update
+
+from model.sphere.sphere import Sphere
+from renderer.object_3D_renderer import Object3DRenderer, SAMPLES, DRAG_SAMPLE_LIMIT
+
+RENDERER_ID = "sphere-test"
+DISTRIBUTION = "Uniform"
+SAMPLING = "Random" # prefix stable
+
+renderer = Object3DRenderer(Sphere(), RENDERER_ID)
+slider = renderer.object.distributions[DISTRIBUTION].sampling_method_dict[SAMPLING].sample_options[0].slider
+ids_samp = [{"type": "sampling", "renderer": RENDERER_ID, "index": 0, "manual": True}]
+
+
+def update_samples(sample_count, shown, coarse):
+	return renderer.update_plot({SAMPLES}, [], [], [slider.transfrom_down(sample_count)], ids_samp, DISTRIBUTION, SAMPLING, 1, shown=shown, coarse=coarse)
+
+
+def sample_operations(patched_figure):
+	return [op for op in patched_figure._operations if op["location"][:2] == ["data", 1] and op["location"][2] in ("x", "y", "z")]
+
+
+def test_001_drag_sample_count_extends():
+	_, _, _, shown = update_samples(100, None, False)
+	assert shown["count"] == 100
+
+	# every frame of the drag only sends the new samples, the plot keeps a prefix of the samples
+	patched_figure, extend_data, prepend_data, shown = update_samples(2000, shown, True)
+	assert sample_operations(patched_figure) == []
+	assert extend_data is not no_update and prepend_data is no_update
+	assert len(extend_data[0]["x"][0]) == 1900
+	assert shown["count"] == 2000
+
+	# the release at the last drag value has nothing left to send
+	patched_figure, extend_data, prepend_data, shown = update_samples(2000, shown, False)
+	assert sample_operations(patched_figure) == []
+	assert extend_data is no_update and prepend_data is no_update
+	assert shown["count"] == 2000
+
+	# a release at another value than the last frame extends as well
+	_, extend_data, _, shown = update_samples(2500, shown, False)
+	assert len(extend_data[0]["x"][0]) == 500
+	assert shown["count"] == 2500
+
+
+def test_002_drag_sample_count_truncates():
+	_, _, _, shown = update_samples(1000, None, False)
+
+	patched_figure, extend_data, prepend_data, shown = update_samples(200, shown, True)
+	assert sample_operations(patched_figure) == []
+	assert extend_data is no_update and prepend_data[2] == 200
+	assert shown["count"] == 200
+
+
+def test_003_drag_keeps_a_prefix():
+	# without a matching description of the plot, a drag frame replaces the samples with the first of them
+	patched_figure, extend_data, _, shown = update_samples(5000, None, True)
+	assert len(sample_operations(patched_figure)) == 3
+	assert extend_data is no_update
+	assert shown["count"] == DRAG_SAMPLE_LIMIT
+
+	# which the release extends
+	patched_figure, extend_data, _, shown = update_samples(5000, shown, False)
+	assert sample_operations(patched_figure) == []
+	assert len(extend_data[0]["x"][0]) == 5000 - DRAG_SAMPLE_LIMIT
+	assert shown["count"] == 5000
+
+
+def test_004_decimated_drag_is_replaced_on_release():
+	# samples of sampling methods that are not prefix stable are decimated while dragging, the release replaces them
+	patched_figure, extend_data, _, shown = renderer.update_plot({SAMPLES}, [], [], [], [], DISTRIBUTION, "Cartesian Grid", 1, coarse=True)
+	assert len(sample_operations(patched_figure)) == 3
+	assert extend_data is no_update
+	assert shown is None
+
+
+def test_005_drag_value_echo_is_no_drag():
+	slider_id = ids_samp[0]
+	triggered = {'{"index":0,"manual":true,"renderer":"sphere-test","type":"sampling"}.drag_value': slider_id}
+
+	coarse, _, values_samp = renderer.dragged_values(triggered, [], [], [], ids_samp, [2.0], [3.0])
+	assert coarse and values_samp == [3.0]
+
+	# a slider reports a value set by a callback as drag value as well
+	coarse, _, values_samp = renderer.dragged_values(triggered, [], [], [], ids_samp, [2.0], [2.0])
+	assert not coarse and values_samp == [2.0]
+
+
+def test_006_option_info_shows_acceptance_rate():
+	distribution = renderer.object.distributions["Bingham"]
+	sampling_method = distribution.sampling_method_dict["Random"]
+	dist_state = tuple(option.default_snapshot() for option in distribution.distribution_options)
+
+	info_md = sampling_method.option_info_md(dist_state)
+
+	acceptance = sampling_method.acceptance(sampling_method.lambdas(dist_state))
+	assert 0 < acceptance <= 1
+	assert f"{acceptance:.1%}" in info_md
+	assert renderer.object.distributions[DISTRIBUTION].sampling_method_dict[SAMPLING].option_info_md(()) == ""
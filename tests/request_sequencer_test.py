@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+from dash.exceptions import PreventUpdate
+
+from util.request_sequencer import RequestSequencer
+
+TIMEOUT = 5
+
+
+class Request(threading.Thread):
+	"""runs one request of a session in its own thread, like a threaded server"""
+	def __init__(self, sequencer, session_id, stream, value, release=None):
+		super().__init__(daemon=True)
+		self.sequencer = sequencer
+		self.session_id = session_id
+		self.stream = stream
+		self.value = value
+		self.release = release
+		self.started = threading.Event() # set once compute runs
+		self.computed = False
+		self.result = None
+		self.dropped = False
+
+	def compute(self):
+		self.started.set()
+		if self.release is not None:
+			assert self.release.wait(TIMEOUT)
+		self.computed = True
+		return self.value
+
+	def run(self):
+		try:
+			self.result = self.sequencer.run(self.session_id, self.stream, self.compute)
+		except PreventUpdate:
+			self.dropped = True
+
+
+def wait_for_tickets(sequencer, session_id, count):
+	# the request threads took their tickets and wait for their turn
+	deadline = time.monotonic() + TIMEOUT
+	while sequencer._sessions[session_id].tickets < count:
+		assert time.monotonic() < deadline
+		time.sleep(0.001)
+
+
+def start_blocking(sequencer, session_id, stream="plot"):
+	release = threading.Event()
+	request = Request(sequencer, session_id, stream, "first", release)
+	request.start()
+	assert request.started.wait(TIMEOUT)
+	return request, release
+
+
+def test_001_without_session_computes():
+	sequencer = RequestSequencer()
+	assert sequencer.run(None, "plot", lambda: 1) == 1
+	assert sequencer.stats()["sessions"] == 0
+
+
+def test_002_waiting_request_is_dropped():
+	sequencer = RequestSequencer()
+	first, release = start_blocking(sequencer, "session")
+
+	waiting = Request(sequencer, "session", "plot", "waiting")
+	waiting.start()
+	wait_for_tickets(sequencer, "session", 2)
+
+	newest = Request(sequencer, "session", "plot", "newest")
+	newest.start()
+	waiting.join(TIMEOUT)
+	# dropped as soon as the newer request arrived, while the first one still computes
+	assert waiting.dropped and not waiting.computed
+
+	release.set()
+	first.join(TIMEOUT)
+	newest.join(TIMEOUT)
+
+	# the first one finished after the newest arrived, it is computed but abandoned
+	assert first.computed and first.dropped
+	assert newest.computed and newest.result == "newest"
+	assert sequencer.stats() == {"sessions": 1, "computed": 2, "dropped": 1, "abandoned": 1}
+
+
+def test_003_newest_request_is_never_dropped():
+	sequencer = RequestSequencer()
+	first, release = start_blocking(sequencer, "session")
+
+	requests = []
+	for i in range(20):
+		request = Request(sequencer, "session", "plot", i)
+		request.start()
+		requests.append(request)
+		wait_for_tickets(sequencer, "session", i + 2)
+
+	release.set()
+	for request in [first, *requests]:
+		request.join(TIMEOUT)
+		assert not request.is_alive()
+
+	assert [r.dropped for r in requests] == [True] * 19 + [False]
+	assert requests[-1].result == 19
+	assert sum(r.computed for r in requests) == 1
+
+
+def test_004_streams_and_sessions_are_independent():
+	sequencer = RequestSequencer()
+	first, release = start_blocking(sequencer, "session", "plot")
+
+	# another stream of the same session waits for its turn, but is not dropped by the plot stream
+	other_stream = Request(sequencer, "session", "info", "info")
+	other_stream.start()
+	wait_for_tickets(sequencer, "session", 2)
+
+	# other sessions are not blocked at all
+	assert sequencer.run("other session", "plot", lambda: "other") == "other"
+
+	release.set()
+	first.join(TIMEOUT)
+	other_stream.join(TIMEOUT)
+	assert first.result == "first" and not first.dropped
+	assert other_stream.result == "info" and not other_stream.dropped
+
+
+def test_005_exception_releases_session():
+	sequencer = RequestSequencer()
+
+	def fail():
+		raise ValueError("compute failed")
+
+	with pytest.raises(ValueError):
+		sequencer.run("session", "plot", fail)
+	assert sequencer.run("session", "plot", lambda: "next") == "next"
+
+
+def test_006_idle_sessions_are_swept():
+	sequencer = RequestSequencer(session_timeout=0.05)
+	sequencer.run("idle", "plot", lambda: None)
+	busy, release = start_blocking(sequencer, "busy")
+
+	time.sleep(0.1)
+	sequencer.run("new", "plot", lambda: None)
+
+	# the idle session is forgotten, the one that is still computing is kept
+	assert set(sequencer._sessions) == {"busy", "new"}
+
+	release.set()
+	busy.join(TIMEOUT)
+	assert busy.result == "first"
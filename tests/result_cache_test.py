@@ -0,0 +1,145 @@
+import threading
+
+import numpy as np
+import pytest
+
+from util.result_cache import ResultCache
+
+# 100 float64 values
+ENTRY_BYTES = 800
+
+
+def entry(value=0.0):
+	return np.full(100, value)
+
+
+def test_001_byte_budget_evicts_least_recently_used():
+	cache = ResultCache("test", 3 * ENTRY_BYTES, frequency_admission=False)
+	for key in "abc":
+		cache.put(key, entry())
+	cache.get("a") # a is now the most recently used
+
+	cache.put("d", entry())
+
+	assert cache.get("b") is None
+	assert all(cache.get(key) is not None for key in "acd")
+	assert cache.stats()["bytes"] == 3 * ENTRY_BYTES
+	assert cache.stats()["evicted"] == 1
+
+
+def test_002_entries_larger_than_budget_are_not_cached():
+	cache = ResultCache("test", ENTRY_BYTES // 2)
+	value = cache.put("a", entry(1.0))
+
+	assert value[0] == 1.0
+	assert cache.get("a") is None
+	assert cache.stats()["rejected"] == 1
+	assert cache.stats()["bytes"] == 0
+
+
+def test_003_tuples_count_all_arrays():
+	cache = ResultCache("test", 3 * ENTRY_BYTES, frequency_admission=False)
+	cache.put("pair", (entry(), entry()))
+	cache.put("none", (entry(), None))
+
+	assert cache.stats()["bytes"] == 3 * ENTRY_BYTES
+
+
+def test_004_frequency_admission_keeps_popular_entries():
+	cache = ResultCache("test", 2 * ENTRY_BYTES)
+	for key in "ab":
+		for _ in range(3):
+			cache.get(key)
+		cache.put(key, entry())
+
+	# one-off keys (eg. while dragging a slider) do not replace the popular ones
+	for i in range(10):
+		cache.get_or_compute(f"drag {i}", entry)
+	assert cache.get("a") is not None and cache.get("b") is not None
+	assert cache.stats()["rejected"] == 10
+
+	# a key requested more often than the least recently used entry replaces it
+	for _ in range(5):
+		cache.get("c")
+	cache.put("c", entry())
+	assert cache.get("c") is not None
+	assert cache.get("a") is None
+
+
+def test_005_frequencies_age():
+	cache = ResultCache("test", ENTRY_BYTES, reset_interval=10)
+	for _ in range(4):
+		cache.get("old")
+	cache.put("old", entry())
+
+	# the frequency of old halves with every interval, new keys win eventually
+	for i in range(20):
+		cache.get(f"other {i}")
+	cache.get("new")
+	cache.get("new")
+	cache.put("new", entry())
+	assert cache.get("new") is not None
+
+
+def test_006_arrays_are_read_only():
+	cache = ResultCache("test", 10 * ENTRY_BYTES)
+
+	value = cache.put("a", entry())
+	with pytest.raises(ValueError):
+		value[0] = 1.0
+	assert not cache.get("a").flags.writeable
+
+	# views are copied, they would keep their (larger) base alive
+	base = np.zeros(1000)
+	view = cache.put("view", base[:100])
+	assert view.base is None and not view.flags.writeable
+	assert base.flags.writeable
+
+	xyz, samples_2d = cache.put("pair", (entry(), entry()[:, None]))
+	assert not xyz.flags.writeable and not samples_2d.flags.writeable
+
+
+def test_007_none_is_not_cached():
+	cache = ResultCache("test", ENTRY_BYTES)
+	assert cache.get_or_compute("a", lambda: None) is None
+	assert cache.stats()["entries"] == 0
+
+
+def test_008_get_or_compute_under_threads():
+	cache = ResultCache("test", 20 * ENTRY_BYTES, frequency_admission=False)
+	thread_count = 16
+	barrier = threading.Barrier(thread_count)
+	computed = []
+	wrong = [] # assertions in threads would not fail the test
+	results = [None] * thread_count
+
+	def compute(key):
+		computed.append(key)
+		return entry(key)
+
+	def request(i):
+		barrier.wait()
+		results[i] = cache.get_or_compute(-1, lambda: compute(-1))
+
+		# then 32 keys, more than fit, evicting each other
+		barrier.wait()
+		for j in range(100):
+			key = (i * 7 + j) % 32
+			value = cache.get_or_compute(key, lambda: compute(key))
+			if value[0] != key:
+				wrong.append(key)
+
+	threads = [threading.Thread(target=request, args=(i,)) for i in range(thread_count)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	# concurrent misses may compute twice, but all of them get the value that was cached first
+	assert 1 <= computed.count(-1) <= thread_count
+	assert all(result is results[0] for result in results)
+	assert wrong == []
+
+	stats = cache.stats()
+	assert stats["bytes"] == stats["entries"] * ENTRY_BYTES <= cache.max_bytes
+	assert stats["hits"] + stats["misses"] == thread_count * 101
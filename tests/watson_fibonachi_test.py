@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from scipy.special import erf, erfi, erfinv
+
+pytest.importorskip("pyrecest")
+
+from model.distributions.sphere.watson.fibonachi import WatsonFibonachiSampling, ERFI_TABLE_END
+from util.selectors.selector_state import SelectorState
+
+sampler = WatsonFibonachiSampling()
+
+KAPPAS = [-50, -10, -1, 0, 1, 10, 50]
+
+
+# inverse of erfi by bisection, slow but independent of the sampler
+def erfi_inv_bisection(y):
+	z = np.abs(y)
+	lo = np.zeros_like(z)
+	hi = np.full_like(z, 27.0) # erfi overflows before 27
+	for _ in range(100):
+		mid = (lo + hi) / 2
+		above = erfi(mid) > z
+		lo = np.where(above, lo, mid)
+		hi = np.where(above, mid, hi)
+	return np.copysign((lo + hi) / 2, y)
+
+
+# w = cos θ of the exact centered quantiles (i + 1/2) / N, with θ increasing from the pole
+# the density of w is proportional to exp(κ w²)
+def exact_quantiles(kappa, sample_count):
+	u = (np.arange(sample_count) + 0.5) / sample_count
+	if kappa > 0:
+		return erfi_inv_bisection(erfi(np.sqrt(kappa)) * (1 - 2 * u)) / np.sqrt(kappa)
+	if kappa < 0:
+		return erfinv(erf(np.sqrt(-kappa)) * (1 - 2 * u)) / np.sqrt(-kappa)
+	return 1 - 2 * u
+
+
+@pytest.mark.parametrize("sample_count", [1, 10, 999, 10000])
+@pytest.mark.parametrize("kappa", KAPPAS)
+def test_001_sample_events_matches_exact_quantiles(kappa, sample_count):
+	samples = sampler.sample_events((SelectorState(sample_count),), (SelectorState(kappa),))
+
+	assert samples.shape == (sample_count, 3)
+	assert np.allclose(np.linalg.norm(samples, axis=1), 1)
+	assert np.max(np.abs(samples[:, 2] - exact_quantiles(kappa, sample_count))) < 1e-5
+
+
+# sorted y on both sides of the end of the table at sinh(ERFI_TABLE_END), from tiny values up to where erfi overflows
+def erfi_inv_inputs():
+	boundary = np.sinh(ERFI_TABLE_END)
+	y = np.unique(np.concatenate((np.logspace(-300, 300, 2001), boundary * np.linspace(0.5, 2, 2001), [boundary])))
+	return np.concatenate((-y[::-1], [0.0], y))
+
+
+def test_002_erfi_inv_matches_newton():
+	y = erfi_inv_inputs()
+	y = y[np.abs(y) < 1e100] # the asymptotic start of newton needs more iterations for larger y
+
+	x = sampler.erfi_inv(y)
+
+	assert np.allclose(x, sampler.erfi_inv_newton(y, iters=20), rtol=1e-10, atol=0)
+
+
+def test_003_erfi_of_erfi_inv_is_identity():
+	y = erfi_inv_inputs()
+
+	x = sampler.erfi_inv(y)
+
+	assert np.allclose(erfi(x), y, rtol=1e-9, atol=0)
+	# continuous and increasing across the end of the table
+	assert np.all(np.diff(x) > 0)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from scipy.special import erf, erfi
+from scipy.stats import kstest
+
+from model.distributions.sphere.watson.random_sampling import WatsonRandomSampling
+from util.selectors.selector_state import SelectorState
+
+sampler = WatsonRandomSampling()
+
+SAMPLE_COUNT = 20000
+# girdle (κ <= -1, half normal proposals), weak girdle and uniform (uniform proposals), bipolar (exponential proposals)
+KAPPAS = [-50, -10, -1, -0.5, 0, 0.5, 1, 10, 50]
+
+
+@pytest.fixture(autouse=True)
+def seeded(monkeypatch):
+	# the sampler draws from a fresh generator, seed it so the test does not fail at random
+	default_rng = np.random.default_rng
+	monkeypatch.setattr(np.random, "default_rng", lambda seed=None: default_rng(0))
+
+
+# cdf of the cosine t of the polar angle, the density is proportional to exp(κt²) on [-1, 1]
+def cosine_cdf(kappa):
+	if kappa > 0:
+		root = np.sqrt(kappa)
+		return lambda t: (erfi(root * t) + erfi(root)) / (2 * erfi(root))
+	if kappa < 0:
+		root = np.sqrt(-kappa)
+		return lambda t: (erf(root * t) + erf(root)) / (2 * erf(root))
+	return lambda t: (t + 1) / 2
+
+
+@pytest.mark.parametrize("kappa", KAPPAS)
+def test_001_cosines_follow_the_distribution(kappa):
+	samples = sampler.sample((SelectorState(SAMPLE_COUNT),), (SelectorState(kappa),))
+
+	assert samples.shape == (SAMPLE_COUNT, 3)
+	assert np.allclose(np.linalg.norm(samples, axis=1), 1)
+	assert kstest(samples[:, 2], cosine_cdf(kappa)).pvalue > 1e-3
+
+
+@pytest.mark.parametrize("sample_count", [1, 10, 999])
+@pytest.mark.parametrize("kappa", [-10, 0, 10])
+def test_002_returns_sample_count_points(kappa, sample_count):
+	samples = sampler.sample((SelectorState(sample_count),), (SelectorState(kappa),))
+
+	assert samples.shape == (sample_count, 3)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from scipy.special import logsumexp
+
+import util.wrapped_normal_util as wrapped_normal_util
+from util.wrapped_normal_util import WrappedNormalUtil, WRAP_TOLERANCE
+
+MEAN = np.array([0.5, -1.0])
+PERIODIC = [(True, True), (True, False), (False, True)]
+
+
+def points():
+	# random points and the mean itself, where degenerate densities peak
+	x = np.random.default_rng(0).uniform(-np.pi, np.pi, (2000, 2))
+	return np.vstack((x, MEAN))
+
+
+def covariance(sigma_0, sigma_1, rho):
+	return np.array([[sigma_0**2, rho * sigma_0 * sigma_1], [rho * sigma_0 * sigma_1, sigma_1**2]])
+
+
+def spatial(monkeypatch, *args):
+	# the fourier series is never shorter than the spatial sum without margin
+	monkeypatch.setattr(wrapped_normal_util, "FOURIER_MARGIN", 1e-300)
+	return WrappedNormalUtil.relative_density(*args)
+
+
+def fourier(monkeypatch, *args):
+	# the spatial sum is never shorter than the fourier series with many more wraps
+	wraps = WrappedNormalUtil.wraps
+	monkeypatch.setattr(WrappedNormalUtil, "wraps", staticmethod(lambda sigma, tolerance=WRAP_TOLERANCE: wraps(sigma, tolerance) + 1000))
+	return WrappedNormalUtil.relative_density(*args)
+
+
+# sum over many more copies than needed, in the log domain, scaled like relative_density
+def reference(x, mean, cov, periodic, wraps=6):
+	cov = WrappedNormalUtil.regularize(cov)
+	precision = np.linalg.inv(cov)
+
+	ranges = [np.arange(-wraps, wraps + 1) if p else np.zeros(1) for p in periodic]
+	offsets = 2 * np.pi * np.stack(np.meshgrid(*ranges, indexing="ij"), axis=-1).reshape(-1, 2)
+	d = (x - mean)[:, np.newaxis, :] + offsets # (points, copies, 2)
+	q = np.einsum("pci,ij,pcj->pc", d, precision, d)
+	log_density = logsumexp(-0.5 * q, axis=1)
+	return np.exp(log_density - np.max(log_density))
+
+
+@pytest.mark.parametrize("periodic", PERIODIC)
+@pytest.mark.parametrize("rho", [0.0, 0.5, -0.8])
+@pytest.mark.parametrize("sigma_0, sigma_1", [(0.3, 0.3), (0.3, 2.0), (0.7, 1.2), (2.0, 3.0), (3.0, 0.7)])
+def test_001_spatial_and_fourier_agree(monkeypatch, sigma_0, sigma_1, rho, periodic):
+	x = points()
+	cov = covariance(sigma_0, sigma_1, rho)
+
+	spatial_density = spatial(monkeypatch, x, MEAN, cov, periodic)
+	monkeypatch.undo()
+	fourier_density = fourier(monkeypatch, x, MEAN, cov, periodic)
+
+	assert np.max(np.abs(spatial_density - fourier_density)) < 1e-4
+
+
+@pytest.mark.parametrize("periodic", PERIODIC)
+@pytest.mark.parametrize("rho", [0.0, 0.5, -0.8])
+@pytest.mark.parametrize("sigma_0, sigma_1", [(0.3, 2.0), (2.0, 3.0)])
+def test_002_matches_reference(sigma_0, sigma_1, rho, periodic):
+	x = points()
+	cov = covariance(sigma_0, sigma_1, rho)
+
+	density = WrappedNormalUtil.relative_density(x, MEAN, cov, periodic)
+
+	assert np.max(np.abs(density - reference(x, MEAN, cov, periodic))) < 1e-4
+
+
+# the sliders reach σ = 0 and |ρ| = 1, the covariance is regularized to a narrow peak or ridge
+@pytest.mark.parametrize("periodic", PERIODIC)
+@pytest.mark.parametrize("sigma_0, sigma_1, rho", [
+	(0.0, 0.0, 0.0),
+	(0.0, 1.0, 0.0),
+	(1.0, 0.0, 0.5),
+	(1.0, 1.0, 1.0),
+	(1.0, 1.0, -1.0),
+	(0.5, 2.0, 1.0),
+	(2.0, 0.5, -1.0),
+])
+def test_003_degenerate_covariances(sigma_0, sigma_1, rho, periodic):
+	x = points()
+	cov = covariance(sigma_0, sigma_1, rho)
+
+	density = WrappedNormalUtil.relative_density(x, MEAN, cov, periodic)
+
+	assert np.all(np.isfinite(density))
+	assert density[-1] == pytest.approx(1.0)
+	assert np.max(np.abs(density - reference(x, MEAN, cov, periodic))) < 1e-4
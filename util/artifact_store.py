@@ -0,0 +1,168 @@
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+# bump to invalidate all stored artifacts, eg. when an installed package a builder depends on changes
+# changes of the project code are picked up by the code version (see ArtifactStore.code_version)
+ARTIFACT_VERSION = 1
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ARTIFACT_DIR_ENV = "WEBAPP_ARTIFACT_DIR"
+DEFAULT_ARTIFACT_DIR = PROJECT_ROOT / ".artifacts"
+
+
+class ArtifactStore:
+	"""
+	Versioned on-disk store for expensive, deterministic numpy arrays (manifold meshes, lattice grids).
+
+	Artifacts are keyed by name, build parameters and the code version of the builder,
+	so changing the builder, any project module it depends on or the parameters never serves a stale array.
+	Stored arrays are opened memory mapped and read only. All worker processes
+	therefore start without recomputing anything and share the same page cache memory.
+
+	The directory can be set with the WEBAPP_ARTIFACT_DIR environment variable.
+	"""
+	def __init__(self, root=None):
+		self.root = Path(root or os.environ.get(ARTIFACT_DIR_ENV, DEFAULT_ARTIFACT_DIR))
+
+	def path(self, name, params, version):
+		key = json.dumps({"params": params, "version": version}, sort_keys=True)
+		digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+		return self.root / name / f"{digest}.npy"
+
+	# returns the stored array for name and arguments, calls build(*args, **kwargs) and stores the result if missing
+	# arguments must be json serializable, they are part of the key
+	def load_or_build(self, name, build, *args, **kwargs):
+		params = {"args": args, "kwargs": kwargs}
+		path = self.path(name, params, self.code_version(build))
+
+		try:
+			return self._open(path)
+		except (OSError, ValueError):
+			pass # missing or truncated, rebuild
+
+		array = np.asarray(build(*args, **kwargs))
+
+		try:
+			self._save(path, array)
+			return self._open(path)
+		except OSError as e:
+			# eg. read only filesystem, still works, but every process keeps its own copy
+			print(f"Could not store artifact '{path}': {e}")
+			array.flags.writeable = False
+			return array
+
+	@staticmethod
+	def _open(path):
+		# asarray drops the memmap subclass, the view still reads from the mapped file
+		return np.asarray(np.load(path, mmap_mode="r"))
+
+	@staticmethod
+	def _save(path, array):
+		path.parent.mkdir(parents=True, exist_ok=True)
+
+		# write to a temporary file and rename, so concurrently starting workers never see a partial file
+		fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				np.save(f, array, allow_pickle=False)
+			os.replace(tmp_path, path)
+		except BaseException:
+			os.unlink(tmp_path)
+			raise
+
+	# hash of the source of the module defining build (a function or module) and of every project module it depends on,
+	# eg. the mesh builders of the manifolds call the fibonacci lattices and MeshUtil
+	@staticmethod
+	def code_version(build):
+		module = build if inspect.ismodule(build) else inspect.getmodule(build)
+		if module is not None and ArtifactStore.is_project_module(module):
+			source = "\n".join(ArtifactStore.module_source(m) for m in ArtifactStore.project_dependencies(module))
+		else:
+			# compiled function or installed package, use the version of the package providing it instead
+			package = (getattr(build, "__module__", None) or getattr(build, "__name__", "")).split(".")[0]
+			try:
+				source = f"{package}=={importlib.metadata.version(package)}"
+			except importlib.metadata.PackageNotFoundError:
+				source = f"{package}.{getattr(build, '__qualname__', '')}"
+
+		return hashlib.sha1(f"{ARTIFACT_VERSION}:{source}".encode()).hexdigest()[:12]
+
+	@staticmethod
+	def is_project_module(module):
+		path = getattr(module, "__file__", None)
+		if path is None:
+			return False
+		path = Path(path).resolve()
+		return path.is_relative_to(PROJECT_ROOT) and "site-packages" not in path.parts
+
+	# the module and all project modules reachable through its globals (imported modules, classes, functions and instances),
+	# sorted by name, so the order does not depend on the import order
+	@staticmethod
+	@lru_cache(maxsize=None)
+	def project_dependencies(module):
+		found = {}
+		pending = [module]
+		while pending:
+			module = pending.pop()
+			if module.__name__ in found:
+				continue
+			found[module.__name__] = module
+
+			for value in vars(module).values():
+				dependency = ArtifactStore.defining_module(value)
+				if dependency is not None and dependency.__name__ not in found and ArtifactStore.is_project_module(dependency):
+					pending.append(dependency)
+
+		return tuple(found[name] for name in sorted(found))
+
+	# module a global name comes from
+	@staticmethod
+	def defining_module(value):
+		if inspect.ismodule(value):
+			return value
+		if not (inspect.isclass(value) or inspect.isroutine(value)):
+			value = type(value) # instances, eg. the process wide artifact_store
+		name = getattr(value, "__module__", None)
+		return sys.modules.get(name) if isinstance(name, str) else None
+
+	@staticmethod
+	@lru_cache(maxsize=None)
+	def module_source(module):
+		return inspect.getsource(module)
+
+
+# process wide store, shared by all manifolds and samplers
+artifact_store = ArtifactStore()
+
+
+if __name__ == "__main__":
+	# prebuilds the artifacts of all manifolds and distributions, eg. while building the docker image:
+	# PYTHONPATH=$PWD poetry run python util/artifact_store.py
+	from model.sphere.sphere import Sphere
+	from model.torus.torus import Torus
+	from model.cylinder.cylinder import Cylinder
+
+	from model.distributions.distribution_loader import DistributionLoader
+	from util.gaus_util import GausUtil
+	from util.normalization_table import NormalizationTable
+
+	for manifold in (Sphere, Torus, Cylinder):
+		manifold()
+	# distributions are loaded lazily, their modules register the normalization tables on import
+	DistributionLoader.load_all()
+	# grids of the default slider states of the frolov sampling methods, other states are only cached in memory
+	GausUtil.prebuild_uniform_grids()
+	# the tables of the loaded distributions, otherwise built on first use
+	for table in NormalizationTable.tables:
+		table.check()
+		print(f"Normalization table '{table.name}': max interpolation error {table.error:.2e}")
+	print(f"Artifacts stored in '{artifact_store.root}'")
@@ -0,0 +1,118 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import dawsn, erf, ive
+
+# nodes of the gauss-legendre rule for the 1d integrals of the normalization constants
+QUADRATURE_NODES = 400
+
+
+class FisherBinghamUtil:
+	"""
+	Unnormalized densities of the Fisher-Bingham family on the unit sphere, log f(x) = γᵀx + xᵀAx.
+
+	von Mises-Fisher (γ = κμ, A = 0), Watson (A = κμμᵀ), Bingham (A = M diag(Z) Mᵀ)
+	and Kent (γ = κγ₁, A = β(γ₂γ₂ᵀ - γ₃γ₃ᵀ)) are special cases.
+	The parameters are set up once per distribution state, the points are evaluated in one pass.
+
+	The log normalization constants log ∫ exp(γᵀx + xᵀAx) dx over the sphere have closed forms for von Mises-Fisher
+	and Watson. For Bingham and Kent the integral over the longitude has a closed form (a bessel function),
+	the remaining integral over z is computed with a gauss-legendre rule. The integrals are too slow for every update,
+	they are tabulated over the slider domains (see NormalizationTable).
+	All log normalizers take arrays of parameters.
+	"""
+
+	# log density at the points x (n, 3), gamma (3,) and A (3, 3) symmetric, either may be None
+	# in the eigenbasis of A = R diag(d) Rᵀ it is Σ dᵢpᵢ² + vᵢpᵢ with the projections pᵢ = rᵢᵀx and v = Rᵀγ,
+	# one matrix vector product per direction that has a weight, no (n, 3) temporaries
+	@staticmethod
+	def log_density(x, gamma=None, A=None):
+		x = np.asarray(x, dtype=float)
+		gamma = np.zeros(3) if gamma is None else np.asarray(gamma, dtype=float)
+		if A is None:
+			d, R = np.zeros(3), np.eye(3)
+		else:
+			d, R = np.linalg.eigh(A)
+		v = R.T @ gamma
+
+		log_density = np.zeros(x.shape[0])
+		for i in range(3):
+			if d[i] == 0 and v[i] == 0:
+				continue
+			p = x @ R[:, i]
+			log_density += (d[i] * p + v[i]) * p
+		return log_density
+
+	# density at the points x, scaled so that its maximum over the points is 1
+	@staticmethod
+	def relative_density(x, gamma=None, A=None):
+		log_density = FisherBinghamUtil.log_density(x, gamma, A)
+		if log_density.size == 0:
+			return log_density
+		return np.exp(log_density - np.max(log_density))
+
+	# exactly sample_count draws by batch rejection with the numpy generator rng
+	# propose(rng, size) returns size proposals (size, ...) and their log acceptance probabilities
+	# every batch is sized by the acceptance rate seen so far (initially the expected one), usually one or two batches are enough
+	@staticmethod
+	def rejection_sample(propose, sample_count, rng, acceptance=0.5):
+		batches = []
+		accepted = 0
+		proposed = 0
+		while accepted < sample_count or not batches:
+			rate = max(accepted / proposed if proposed else acceptance, 0.01)
+			size = int(np.ceil((sample_count - accepted) / rate * 1.1)) + 16
+			proposals, log_acceptance = propose(rng, size)
+			batch = proposals[np.log(rng.random(size)) < log_acceptance]
+			batches.append(batch)
+			accepted += len(batch)
+			proposed += size
+		return np.concatenate(batches)[:sample_count]
+
+	# exp(κzᵀx): 4π sinh(κ) / κ
+	@staticmethod
+	def vmf_log_normalizer(kappa):
+		kappa = np.asarray(kappa, dtype=float)
+		safe = np.maximum(kappa, 1e-8)
+		return np.where(kappa < 1e-8, np.log(4 * np.pi), np.log(2 * np.pi) + safe + np.log1p(-np.exp(-2 * safe)) - np.log(safe))
+
+	# exp(κ(zᵀx)²): 4π ₁F₁(1/2; 3/2; κ), with the dawson function for κ > 0 and erf for κ < 0
+	@staticmethod
+	def watson_log_normalizer(kappa):
+		kappa = np.asarray(kappa, dtype=float)
+		root = np.sqrt(np.maximum(np.abs(kappa), 1e-8))
+		positive = kappa + np.log(dawsn(root) / root)
+		negative = np.log(np.sqrt(np.pi) * erf(root) / (2 * root))
+		return np.log(4 * np.pi) + np.where(np.abs(kappa) < 1e-8, 0.0, np.where(kappa > 0, positive, negative))
+
+	# nodes and weights of the gauss-legendre rule on [-1, 1], computing them takes longer than the integrals
+	@staticmethod
+	@lru_cache(maxsize=1)
+	def quadrature():
+		return np.polynomial.legendre.leggauss(QUADRATURE_NODES)
+
+	# exp(-λ₁x₁² - λ₂x₂²), λ ≥ 0: 2π ∫ exp(-s(λ₁ + λ₂) / 2) I₀(s(λ₁ - λ₂) / 2) dz with s = 1 - z²
+	@staticmethod
+	def bingham_log_normalizer(lambda_1, lambda_2):
+		lambda_1, lambda_2 = np.broadcast_arrays(np.asarray(lambda_1, dtype=float), np.asarray(lambda_2, dtype=float))
+		z, w = FisherBinghamUtil.quadrature()
+		s = 1 - np.square(z)
+		l_1 = lambda_1[..., np.newaxis]
+		l_2 = lambda_2[..., np.newaxis]
+		# ive(0, a) = I₀(a) exp(-a), the exponent is -s min(λ₁, λ₂) <= 0
+		integrand = np.exp(-s * np.minimum(l_1, l_2)) * ive(0, s * np.abs(l_1 - l_2) / 2)
+		return np.log(2 * np.pi) + np.log(integrand @ w)
+
+	# exp(κzᵀx + β((yᵀx)² - (xᵀx)²)): 2π ∫ exp(κz) I₀(βs) dz with s = 1 - z²
+	@staticmethod
+	def kent_log_normalizer(kappa, beta):
+		kappa, beta = np.broadcast_arrays(np.asarray(kappa, dtype=float), np.asarray(beta, dtype=float))
+		z, w = FisherBinghamUtil.quadrature()
+		s = 1 - np.square(z)
+		k = kappa[..., np.newaxis]
+		b = np.abs(beta[..., np.newaxis])
+		# exp(κz) I₀(βs) = exp(κz + βs) ive(0, βs), shifted by the largest exponent
+		exponent = k * z + b * s
+		shift = np.max(exponent, axis=-1, keepdims=True)
+		integrand = np.exp(exponent - shift) * ive(0, b * s)
+		return np.log(2 * np.pi) + shift[..., 0] + np.log(integrand @ w)
@@ -1,7 +1,19 @@
+import os
+
 import numpy as np
 from scipy.stats import norm
 from deterministic_gaussian_sampling_fibonacci import get_uniform_grid
 
+from util.artifact_store import artifact_store
+from util.result_cache import ResultCache
+
+FROLOV_VARIANTS = ("ClassicalFrolov", "ImprovedFrolov", "Fibonacci")
+# grids of the default sample count of the sliders are stored with the artifacts (and prebuilt, see util/artifact_store.py)
+# all other sample counts are only cached in memory, the many slider states and manual inputs would fill the disk
+PREBUILT_SAMPLE_COUNTS = (100,)
+
+frolov_grid_cache = ResultCache("frolov_grids", int(os.environ.get("WEBAPP_FROLOV_CACHE_MB", 32)) * 2**20)
+
 
 class GausUtil:
 	@staticmethod
@@ -31,8 +43,24 @@ class GausUtil:
 
 		return gaus
 	
+	# uniform Frolov grid on [0, 1]^dim, read only
+	# the grids only depend on their arguments, so they are computed once per process (or stored, see PREBUILT_SAMPLE_COUNTS)
+	@staticmethod
+	def get_uniform_grid(dim, sample_count, variant="ClassicalFrolov"):
+		args = (int(dim), int(sample_count), variant)
+		if args[1] in PREBUILT_SAMPLE_COUNTS:
+			return artifact_store.load_or_build("frolov_grid", get_uniform_grid, *args)
+		return frolov_grid_cache.get_or_compute(("frolov_grid", *args), lambda: np.asarray(get_uniform_grid(*args)))
+
+	# stores the grids of the default sample counts, eg. while building the docker image
+	@staticmethod
+	def prebuild_uniform_grids():
+		for variant in FROLOV_VARIANTS:
+			for sample_count in PREBUILT_SAMPLE_COUNTS:
+				GausUtil.get_uniform_grid(2, sample_count, variant)
+
 	@staticmethod
 	def sample_frolov_gaussian(mu, cov, sample_count, variant="ClassicalFrolov"):
-		grid = get_uniform_grid(2, sample_count, variant)
+		grid = GausUtil.get_uniform_grid(2, sample_count, variant)
 		gaus_grid = GausUtil.transform_grid_gaussian(grid, mu, cov)
 		return gaus_grid
\ No newline at end of file
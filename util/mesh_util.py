@@ -0,0 +1,17 @@
+import numpy as np
+
+class MeshUtil:
+
+	""" Generate the wireframe lines of a triangulated surface.
+		Same output as the edge trace of plotly.figure_factory.create_trisurf, but vectorized
+		and without building a figure.
+		xyz: array of shape (n, 3) with the vertices
+		simplices: array of shape (m, 3) with the vertex indices of each triangle
+		Returns: array of shape (5*m, 3), every triangle is a closed line (4 points) followed by a nan row as line break
+	"""
+	@staticmethod
+	def wireframe(xyz, simplices):
+		closed = xyz[simplices[:, [0, 1, 2, 0]]] # (m, 4, 3)
+		breaks = np.full((simplices.shape[0], 1, 3), np.nan)
+
+		return np.concatenate((closed, breaks), axis=1).reshape(-1, 3)
@@ -0,0 +1,82 @@
+import itertools
+from functools import cached_property
+
+import numpy as np
+
+from util.artifact_store import artifact_store, ArtifactStore
+
+
+class NormalizationTable:
+	"""
+	Log normalization constants of a distribution, tabulated over the slider domain and interpolated multilinearly,
+	so true scale densities cost a lookup instead of a numerical integral per update.
+
+	The table is stored in the artifact store on twice the resolution of the interpolation grid.
+	The nodes in between (the midpoints of the cells, where linear interpolation is least accurate)
+	give the error bound: the largest deviation of the interpolation from the exact value there,
+	in log space, so it is the relative error of the density.
+	Slider states that lie on the grid are exact.
+
+	Built on first use, prebuilt with the other artifacts (see util/artifact_store.py),
+	the prebuild fails if the error bound exceeds the tolerance.
+	"""
+	# all tables, so the artifacts can be prebuilt
+	tables = []
+
+	# log_normalizer: exact, vectorized function of the parameters (eg. FisherBinghamUtil.kent_log_normalizer)
+	# axes: (start, stop, count) per parameter, count nodes of the interpolation grid
+	# tolerance: largest allowed error, relative error of the density (2% are not visible on the colorscale)
+	def __init__(self, name, log_normalizer, axes, tolerance=0.02):
+		self.name = name
+		self.log_normalizer = log_normalizer
+		self.axes = tuple((float(start), float(stop), int(count)) for start, stop, count in axes)
+		self.tolerance = tolerance
+		NormalizationTable.tables.append(self)
+
+	# exact values on the refined grid, every other node is an interpolation node
+	@cached_property
+	def table(self):
+		log_normalizer = self.log_normalizer
+
+		def build(axes, version):
+			grid = np.meshgrid(*[np.linspace(start, stop, 2 * count - 1) for start, stop, count in axes], indexing="ij")
+			return log_normalizer(*grid)
+
+		# the code version of the exact function is part of the key, the builder only calls it
+		return artifact_store.load_or_build(self.name, build, axes=self.axes, version=ArtifactStore.code_version(log_normalizer))
+
+	@cached_property
+	def values(self):
+		return self.table[(slice(None, None, 2),) * len(self.axes)]
+
+	# largest absolute error of the interpolated log normalization constant
+	@cached_property
+	def error(self):
+		grid = np.meshgrid(*[np.linspace(start, stop, 2 * count - 1) for start, stop, count in self.axes], indexing="ij")
+		return float(np.max(np.abs(self.lookup(*grid) - self.table)))
+
+	# raises if the interpolation is less accurate than the tolerance, eg. after coarsening the axes
+	def check(self):
+		if self.error > self.tolerance:
+			raise ValueError(f"Normalization table '{self.name}' has an interpolation error of {self.error:.2e}, more than {self.tolerance:.2e}, refine its axes.")
+
+	# interpolated log normalization constant, parameters outside of the axes are clamped to them
+	def lookup(self, *params):
+		params = np.broadcast_arrays(*[np.asarray(p, dtype=float) for p in params])
+
+		indices = []
+		weights = []
+		for p, (start, stop, count) in zip(params, self.axes):
+			t = np.clip((p - start) / (stop - start) * (count - 1), 0, count - 1)
+			i = np.minimum(np.floor(t).astype(int), count - 2)
+			indices.append(i)
+			weights.append(t - i)
+
+		# weighted sum over the corners of the cell
+		value = 0.0
+		for corner in itertools.product((0, 1), repeat=len(params)):
+			weight = 1.0
+			for c, w in zip(corner, weights):
+				weight = weight * (w if c else 1 - w)
+			value = value + weight * self.values[tuple(i + c for i, c in zip(indices, corner))]
+		return value
@@ -0,0 +1,109 @@
+import threading
+import time
+
+from dash.exceptions import PreventUpdate
+
+
+class RequestSequencer:
+	"""
+	Drops outdated plot updates of a session, eg. while a slider is dragged (drag_value),
+	the browser sends a request per step but only shows the result of the newest one.
+
+	Requests are numbered in arrival order per session and stream (eg. renderer and callback).
+	Every session computes at most one request at a time, the others wait for their turn.
+	A request that is waiting when a newer one of the same stream arrives is dropped without computing,
+	one that finished computing after a newer one arrived is abandoned (not sent).
+	The newest request of a stream is never dropped, so the plot always ends up in the latest state.
+
+	Sessions are identified by an id generated in the browser (see assets/dpr.js), requests without one are computed as usual.
+	Requests only queue up in the process with threaded servers (gunicorn threads, flask threaded=True),
+	a single threaded worker handles them one after another anyway.
+
+	The state lives in the process: with several gunicorn workers (the default of gunicorn.conf.py), the requests of a session
+	are spread over them and each worker only drops the outdated requests it sees itself. The others are computed,
+	the browser still only shows the newest result. Run the workers behind a load balancer with sticky sessions
+	to drop all of them, or a single worker with more threads (WEB_CONCURRENCY=1).
+	"""
+	def __init__(self, session_timeout=600):
+		self.session_timeout = session_timeout
+
+		self._sessions = {}
+		self._lock = threading.Lock()
+		self._last_sweep = time.monotonic()
+
+		self.computed = 0
+		self.dropped = 0
+		self.abandoned = 0
+
+	# returns compute(), raises PreventUpdate if a newer request of the same session and stream arrived
+	def run(self, session_id, stream, compute):
+		if session_id is None:
+			return compute()
+
+		session = self._session(session_id)
+		with session.condition:
+			session.tickets += 1
+			ticket = session.tickets
+			session.latest[stream] = ticket
+			session.condition.notify_all() # older requests of the stream stop waiting
+
+			while session.busy and session.latest[stream] == ticket:
+				session.condition.wait()
+			if session.latest[stream] != ticket:
+				self.dropped += 1
+				raise PreventUpdate
+			session.busy = True
+
+		try:
+			result = compute()
+		finally:
+			with session.condition:
+				session.busy = False
+				session.last_used = time.monotonic()
+				session.condition.notify_all()
+
+		self.computed += 1
+		if session.latest[stream] != ticket:
+			self.abandoned += 1
+			raise PreventUpdate
+		return result
+
+	def _session(self, session_id):
+		with self._lock:
+			now = time.monotonic()
+			if now - self._last_sweep > self.session_timeout:
+				self._sweep(now)
+
+			session = self._sessions.get(session_id)
+			if session is None:
+				session = self._sessions[session_id] = _Session()
+			session.last_used = now
+			return session
+
+	# forgets sessions that were idle for session_timeout, eg. closed tabs
+	def _sweep(self, now):
+		self._last_sweep = now
+		for session_id, session in list(self._sessions.items()):
+			if not session.busy and now - session.last_used > self.session_timeout:
+				del self._sessions[session_id]
+
+	def stats(self):
+		return {
+			"sessions": len(self._sessions),
+			"computed": self.computed,
+			"dropped": self.dropped,
+			"abandoned": self.abandoned,
+		}
+
+
+class _Session:
+	def __init__(self):
+		self.condition = threading.Condition()
+		self.busy = False
+		self.tickets = 0
+		self.latest = {} # stream -> newest ticket
+		self.last_used = time.monotonic()
+
+
+# process wide sequencer, shared by all renderers
+request_sequencer = RequestSequencer()
@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ResultCache:
+	"""
+	Thread safe in-memory cache for results made of numpy arrays, bounded by their size in bytes.
+
+	Least recently used entries are evicted first. With frequency_admission, a new entry only
+	replaces the least recently used one if its key was requested more often (TinyLFU),
+	so a burst of one-off values (eg. while dragging a slider) does not flush the popular ones.
+	Request frequencies are halved every reset_interval requests, so they follow changing usage.
+
+	Cached arrays are made read only, callers that need to modify them have to copy.
+	"""
+	def __init__(self, name, max_bytes, frequency_admission=True, reset_interval=10000):
+		self.name = name
+		self.max_bytes = max_bytes
+		self.frequency_admission = frequency_admission
+		self.reset_interval = reset_interval
+
+		self._entries = OrderedDict() # key -> (value, nbytes)
+		self._bytes = 0
+		self._frequency = {}
+		self._requests = 0
+		self._lock = threading.Lock()
+
+		self.hits = 0
+		self.misses = 0
+		self.rejected = 0
+		self.evicted = 0
+
+	def get(self, key, default=None):
+		with self._lock:
+			self._count(key)
+			entry = self._entries.get(key)
+			if entry is None:
+				self.misses += 1
+				return default
+
+			self.hits += 1
+			self._entries.move_to_end(key)
+			return entry[0]
+
+	def put(self, key, value):
+		value = self._freeze(value)
+		nbytes = self._nbytes(value)
+
+		with self._lock:
+			if key in self._entries:
+				return self._entries[key][0]
+			if nbytes > self.max_bytes:
+				self.rejected += 1
+				return value
+
+			while self._bytes + nbytes > self.max_bytes:
+				victim = next(iter(self._entries))
+				if self.frequency_admission and self._frequency.get(key, 0) <= self._frequency.get(victim, 0):
+					self.rejected += 1
+					return value
+				_, victim_bytes = self._entries.pop(victim)
+				self._bytes -= victim_bytes
+				self.evicted += 1
+
+			self._entries[key] = (value, nbytes)
+			self._bytes += nbytes
+			return value
+
+	# returns the cached value for key, or computes, caches and returns it
+	# compute runs outside of the lock, concurrent misses for the same key may compute it twice
+	# None results are not cached
+	def get_or_compute(self, key, compute):
+		value = self.get(key)
+		if value is not None:
+			return value
+
+		value = compute()
+		if value is None:
+			return None
+		return self.put(key, value)
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self._bytes = 0
+
+	def stats(self):
+		with self._lock:
+			requests = self.hits + self.misses
+			return {
+				"name": self.name,
+				"entries": len(self._entries),
+				"bytes": self._bytes,
+				"max_bytes": self.max_bytes,
+				"hits": self.hits,
+				"misses": self.misses,
+				"hit_rate": self.hits / requests if requests else 0.0,
+				"rejected": self.rejected,
+				"evicted": self.evicted,
+			}
+
+	def _count(self, key):
+		self._frequency[key] = self._frequency.get(key, 0) + 1
+		self._requests += 1
+
+		if self._requests >= self.reset_interval:
+			# aging, also forgets keys that were only requested once
+			self._frequency = {k: c // 2 for k, c in self._frequency.items() if c > 1}
+			self._requests = 0
+
+	@staticmethod
+	def _freeze(value):
+		if isinstance(value, np.ndarray):
+			if value.base is not None:
+				value = value.copy() # views would keep (and hide the size of) their base array alive
+			value.flags.writeable = False
+			return value
+		if isinstance(value, tuple):
+			return tuple(ResultCache._freeze(v) for v in value)
+		return value
+
+	@staticmethod
+	def _nbytes(value):
+		if isinstance(value, np.ndarray):
+			return value.nbytes
+		if isinstance(value, tuple):
+			return sum(ResultCache._nbytes(v) for v in value)
+		return 0
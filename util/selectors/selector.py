@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from util.selectors.selector_state import SelectorState
+
 class Selector(ABC):
 	def __init__(self):
 		# this is the id of the last time the to_dash_component method was called
@@ -25,3 +27,29 @@ class Selector(ABC):
 		# by default all values are valid
 		# override in subclasses if needed
 		return True
+
+	# returns an immutable state for the given dash slider value, without modifying the selector
+	# selectors are shared between all sessions, so callbacks must use this instead of update_state
+	def snapshot(self, value):
+		return SelectorState(self.transfrom_up(value))
+
+	# immutable state of the initial value of the selector
+	def default_snapshot(self):
+		return SelectorState(self.state, getattr(self, "idx", None))
+
+	# all dash values the selector can take, None if there are too many (continuous sliders)
+	def enumerate_values(self):
+		return None
+
+	# step of the dash slider in units of the state, None if the states are discrete anyway
+	def state_step(self):
+		return None
+
+	# hashable key of a snapshot, for caching results
+	# continuous states are expressed in slider steps and rounded, so floating point noise
+	# does not matter, but values between the steps (eg. from manual input) stay distinct
+	def cache_key(self, snapshot):
+		step = self.state_step()
+		if step is None:
+			return snapshot.state
+		return round(float(snapshot.state) / step, 6)
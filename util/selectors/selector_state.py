@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SelectorState:
+	"""
+	Immutable snapshot of a selector value for a single callback invocation.
+
+	Exposes the same attributes as the selectors (state, and idx for index based sliders),
+	so sampling methods and distributions can read it without knowing the difference.
+	Unlike the selectors themselves, snapshots are never shared between sessions.
+	"""
+	state: object
+	idx: int = None
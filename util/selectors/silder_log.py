@@ -77,9 +77,12 @@ class LogSlider(Selector):
 				tooltip={"placement": "bottom", "always_visible": True, "transform": "transform_log_nice"},
 				step=self.calculate_step(),
 				marks=self.calculate_marks(),
-				updatemode="drag",
+				updatemode="mouseup", # value on release, drag_value while dragging (coarse plot updates)
 			)
 		])
 	
+	def enumerate_values(self):
+		return [self.log_min + i * self.calculate_step() for i in range(SLIDER_OPT_AMOUNT + 1)]
+
 	def update_state(self, new_state):
 		self.state = self.transfrom_up(new_state)
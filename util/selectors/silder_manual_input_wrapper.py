@@ -34,16 +34,28 @@ class SliderManualInputWrapper():
 	def update_state(self, new_state): # only called by slider callback, gauranteed valid
 		self.slider.update_state(new_state)
 
-	def update_state_manual(self, manual_value):
-		#Update from a manual text/number input; converts to slider domain if needed."""
+	def slider_value_from_manual(self, manual_value):
+		# converts a manual text/number input to the slider domain if needed
+		# does not touch the slider state, the plot callbacks pick up the new slider value
 		if hasattr(self.slider, "transfrom_down"):
 			slider_value = self.slider.transfrom_down(manual_value)
 		else:
 			slider_value = manual_value
 
-		self.slider.update_state(slider_value)
 		return slider_value
 
+	def snapshot(self, value):
+		return self.slider.snapshot(value)
+
+	def default_snapshot(self):
+		return self.slider.default_snapshot()
+
+	def enumerate_values(self):
+		return self.slider.enumerate_values()
+
+	def cache_key(self, snapshot):
+		return self.slider.cache_key(snapshot)
+
 	@property
 	def state(self):
 		return self.slider.state
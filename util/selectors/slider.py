@@ -1,5 +1,6 @@
 from dash import dcc, html
 from util.selectors.selector import Selector
+from util.selectors.selector_state import SelectorState
 
 SLIDER_OPT_AMOUNT = 30
 SLIDER_MARK_AMOUNT = 5
@@ -63,9 +64,18 @@ class Slider(Selector):
 				tooltip={"placement": "bottom", "always_visible": True},
 				step=self.calculate_step(),
 				marks=self.calculate_marks(),
-				updatemode="drag",
+				updatemode="mouseup", # value on release, drag_value while dragging (coarse plot updates)
 			)
 		])
 	
+	def enumerate_values(self):
+		values = list(range(self.min, self.max + 1, self.calculate_step()))
+		if values[-1] != self.max:
+			values.append(self.max) # max is also reachable, even if it is not on a step
+		return values
+
+	def snapshot(self, value):
+		return SelectorState(int(value))
+
 	def update_state(self, new_state):
-		self.state = int(new_state)
+		self.state = self.snapshot(new_state).state
@@ -1,6 +1,7 @@
 from dash import dcc, html
 import numpy as np
 from util.selectors.selector import Selector
+from util.selectors.selector_state import SelectorState
 import sympy as sp
 
 
@@ -37,7 +38,7 @@ class SliderFib(Selector):
 				tooltip={"placement": "bottom", "always_visible": True, "transform": "transform_fib" if not self.minus_1 else "transform_fib_m1"},
 				step=1,
 				marks=self.calculate_marks(),
-				updatemode="drag",
+				updatemode="mouseup", # value on release, drag_value while dragging (coarse plot updates)
 			)
 		])
 	
@@ -54,9 +55,16 @@ class SliderFib(Selector):
 		return marks
 
 	
+	def enumerate_values(self):
+		return list(range(self.min, self.max + 1))
+
+	def snapshot(self, value):
+		return SelectorState(self.transfrom_up(value), int(value))
+
 	def update_state(self, new_state):
-		self.state = int(sp.fibonacci(new_state) - (1 if self.minus_1 else 0))
-		self.idx = int(new_state)
+		snapshot = self.snapshot(new_state)
+		self.state = snapshot.state
+		self.idx = snapshot.idx
 
 	def transfrom_up(self, x):
 		return int(sp.fibonacci(x) - (1 if self.minus_1 else 0))
@@ -1,4 +1,5 @@
 from dash import dcc, html
+import numpy as np
 from util.selectors.selector import Selector
 
 SLIDER_OPT_AMOUNT = 100
@@ -33,9 +34,20 @@ class FloatSlider(Selector):
 				max=self.max,
 				value=self.state,
 				tooltip=tooltip,
-				updatemode="drag",
+				updatemode="mouseup", # value on release, drag_value while dragging (coarse plot updates)
 			)
 		])
 	
 	def update_state(self, new_state):
 		self.state = new_state
+
+	# no step is given to dcc.Slider, it picks 1, 2 or 5 times a power of ten, about 1/100 of the range
+	def state_step(self):
+		return FloatSlider.default_step(self.min, self.max)
+
+	# same as calcStep of dcc.Slider
+	@staticmethod
+	def default_step(low, high):
+		v = (abs(high - low) + np.finfo(float).eps) / 100
+		n = np.floor(np.log10(v))
+		return float(min((10 ** n, 2 * 10 ** n, 5 * 10 ** n), key=lambda step: abs(step - v)))
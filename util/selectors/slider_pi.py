@@ -1,5 +1,6 @@
 from dash import dcc, html
 from util.selectors.selector import Selector
+from util.selectors.slider_float import FloatSlider
 import numpy as np
 
 SLIDER_OPT_AMOUNT = 100
@@ -85,7 +86,7 @@ class PiSlider(Selector):
 				max=self.max,
 				value=self.transfrom_down(self.state),
 				tooltip=tooltip,
-				updatemode="drag",
+				updatemode="mouseup", # value on release, drag_value while dragging (coarse plot updates)
 				marks=self.calculate_marks(),
 			)
 		])
@@ -94,6 +95,9 @@ class PiSlider(Selector):
 		self.state = self.transfrom_up(new_state)
 
 
+	def state_step(self):
+		return FloatSlider.default_step(self.min, self.max) * np.pi
+
 	def transfrom_up(self, x):
 		return x * np.pi
 	
@@ -1,6 +1,7 @@
 from dash import dcc, html
 import numpy as np
 from util.selectors.selector import Selector
+from util.selectors.selector_state import SelectorState
 import sympy as sp
 
 
@@ -35,7 +36,7 @@ class SliderSquare(Selector):
 				tooltip={"placement": "bottom", "always_visible": True, "transform": "transform_square"},
 				step=1,
 				marks=self.calculate_marks(),
-				updatemode="drag",
+				updatemode="mouseup", # value on release, drag_value while dragging (coarse plot updates)
 			)
 		])
 	
@@ -49,9 +50,16 @@ class SliderSquare(Selector):
 		return marks
 
 	
+	def enumerate_values(self):
+		return list(range(self.min, self.max + 1))
+
+	def snapshot(self, value):
+		return SelectorState(self.transfrom_up(value), int(value))
+
 	def update_state(self, new_state):
-		self.state = int((new_state**2))
-		self.idx = int(new_state)
+		snapshot = self.snapshot(new_state)
+		self.state = snapshot.state
+		self.idx = snapshot.idx
 
 	def transfrom_up(self, x):
 		return int((x**2))
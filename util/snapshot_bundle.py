@@ -0,0 +1,133 @@
+import functools
+import hashlib
+import inspect
+import itertools
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from util.artifact_store import artifact_store, ArtifactStore
+
+BUNDLE_DIR_NAME = "snapshots"
+
+
+class SnapshotBundle:
+	"""
+	Prebuilt samples for every state the sliders can reach, for distributions without parameters
+	(the uniform ones) and deterministic sampling methods.
+
+	Every state is stored as .npy files with the converted samples (xyz and, if the manifold has one, 2d),
+	named by the hash of the sample key and the source of the manifold and sampling method modules,
+	so changed code never serves stale samples. States that are not in the bundle are computed as usual.
+
+	The arrays are stored as plain uncompressed .npy files: decompressing them, unpacking .npz archives
+	or parsing prebuilt json patches takes longer than computing most lattices, reading .npy files does not.
+
+	Build (eg. while building the docker image, after the artifacts):
+	$ PYTHONPATH=$PWD poetry run python util/snapshot_bundle.py
+	"""
+	def __init__(self, root=None):
+		self.root = Path(root or artifact_store.root / BUNDLE_DIR_NAME)
+
+	# path of the xyz samples, the 2d samples are stored next to it
+	def path(self, manifold, key, sampling_method):
+		versions = self.code_version(type(manifold), type(sampling_method))
+		digest = hashlib.sha1(repr((key, versions)).encode()).hexdigest()
+		return self.root / type(manifold).__name__.lower() / f"{digest}.xyz.npy"
+
+	@staticmethod
+	def path_2d(path):
+		return path.with_name(path.name.replace(".xyz.npy", ".2d.npy"))
+
+	# returns (samples_xyz, samples_2d | None) if the state is in the bundle, otherwise None
+	# key is the sample key of the manifold, its last part the key of the distribution options
+	def load(self, manifold, key, sampling_method):
+		if key[-1]:
+			return None # distribution with parameters, never bundled
+
+		path = self.path(manifold, key, sampling_method)
+		index = self.index(path.parent)
+		if path.name not in index:
+			return None # eg. a manual input, not bundled
+		try:
+			samples = np.load(path, allow_pickle=False)
+			# manifolds without 2d parametrization have no 2d file
+			samples_2d = np.load(self.path_2d(path), allow_pickle=False) if self.path_2d(path).name in index else None
+		except (OSError, ValueError):
+			return None # broken, compute it instead
+		return samples, samples_2d
+
+	# names of the bundled files in a directory, listed once, so states that are not bundled never touch the disk
+	# the bundle is built before the server starts (states bundled later are computed until it restarts)
+	@functools.lru_cache(maxsize=None)
+	def index(self, directory):
+		try:
+			return frozenset(entry.name for entry in os.scandir(directory))
+		except OSError:
+			return frozenset() # no bundle
+
+	# source versions of the modules that produce the samples, depends on the classes only
+	@staticmethod
+	@functools.lru_cache(maxsize=None)
+	def code_version(*classes):
+		return tuple(ArtifactStore.code_version(inspect.getmodule(c)) for c in classes)
+
+	def build(self, manifold):
+		count = 0
+		for name in manifold.distributions:
+			dist = manifold.distributions[name]
+			if dist.distribution_options:
+				continue # parameters are continuous, too many states
+
+			for sampling_method in dist.sampling_methods:
+				if not sampling_method.deterministic:
+					continue
+
+				values = [opt.enumerate_values() for opt in sampling_method.sample_options]
+				if any(v is None for v in values):
+					continue
+
+				for combination in itertools.product(*values):
+					sampling_state = tuple(opt.snapshot(v) for opt, v in zip(sampling_method.sample_options, combination))
+					count += self.build_state(manifold, name, sampling_method, sampling_state)
+		return count
+
+	def build_state(self, manifold, selected_distribution, sampling_method, sampling_state):
+		key = manifold.sample_key(selected_distribution, sampling_method.get_name(), sampling_state, ())
+		path = self.path(manifold, key, sampling_method)
+		if path.exists():
+			return 0
+
+		samples, samples_2d = manifold.convert_sample(sampling_method.sample(sampling_state, ()))
+
+		path.parent.mkdir(parents=True, exist_ok=True)
+		# 2d first, the state only counts as bundled once the xyz file exists
+		if samples_2d is not None:
+			self._save(self.path_2d(path), samples_2d)
+		self._save(path, samples)
+		return 1
+
+	@staticmethod
+	def _save(path, array):
+		# atomic, the server might be reading the bundle while it is (re)built
+		fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+		with os.fdopen(fd, "wb") as f:
+			np.save(f, array, allow_pickle=False)
+		os.replace(tmp_path, path)
+
+
+# process wide bundle, in the artifact directory
+snapshot_bundle = SnapshotBundle()
+
+
+if __name__ == "__main__":
+	from model.sphere.sphere import Sphere
+	from model.torus.torus import Torus
+	from model.cylinder.cylinder import Cylinder
+
+	for manifold in (Sphere(), Torus(), Cylinder()):
+		count = snapshot_bundle.build(manifold)
+		print(f"{type(manifold).__name__}: {count} new snapshots")
+	print(f"Snapshot bundle stored in '{snapshot_bundle.root}'")
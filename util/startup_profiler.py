@@ -0,0 +1,276 @@
+import functools
+import importlib.abc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from importlib.metadata import version, PackageNotFoundError
+
+PROFILE_ENV = "WEBAPP_STARTUP_PROFILE"
+REPORT_VERSION = 1
+
+# constructors and builders that are timed in addition to the imports, as (module, qualified name, label function)
+# they are wrapped as soon as their module has been imported, so the profiler itself imports nothing
+TIMED_CALLS = [
+	("dash.dash", "Dash.__init__", None),
+	("model.sphere.sphere", "Sphere.__init__", None),
+	("model.torus.torus", "Torus.__init__", None),
+	("model.cylinder.cylinder", "Cylinder.__init__", None),
+	("model.distributions.gaus1d.gaus1d", "Gaus1D.__init__", None),
+	("model.distributions.gaus2d.gaus2d", "Gaus2D.__init__", None),
+	("model.distributions.conditional.conditional", "Conditional.__init__", None),
+	("model.distributions.distribution_loader", "DistributionLoader.__init__", lambda self, type, type_package: type_package),
+	("model.distributions.distribution_loader", "DistributionRegistry._instantiate", lambda self, entry: entry["name"]),
+	("util.artifact_store", "ArtifactStore.load_or_build", lambda self, name, *args, **kwargs: name),
+	("renderer.object_3D_renderer", "Object3DRenderer.__init__", lambda self, object_3D, id, *args, **kwargs: id),
+	("renderer.object_3D_and_2D_renderer", "Object3DAnd2DRenderer.__init__", lambda self, object, id: id),
+	("renderer.selfcontained_distribution_renderer", "SelfContainedDistributionRenderer.__init__", None),
+]
+
+
+class StartupProfiler(importlib.abc.MetaPathFinder):
+	"""
+	Records how long the app takes to start: the import time of every module (cumulative and self)
+	and the duration of the constructors listed in TIMED_CALLS.
+
+	Enabled by setting WEBAPP_STARTUP_PROFILE to the path of the json report, eg.
+	$ WEBAPP_STARTUP_PROFILE=startup.json poetry run python app.py
+	$ WEBAPP_STARTUP_PROFILE=startup.json poetry run gunicorn app:server
+	or without starting the server (optionally compares against an older report):
+	$ PYTHONPATH=$PWD poetry run python util/startup_profiler.py startup.json [old_startup.json]
+
+	Does nothing unless installed, app.py installs it before importing anything else.
+	"""
+	def __init__(self):
+		self.imports = []
+		self.calls = []
+		self.installed = False
+		self.start = None
+		self.report_path = None
+
+		self._local = threading.local()
+		self._timed_calls = {}
+		for module, qualname, label in TIMED_CALLS:
+			self._timed_calls.setdefault(module, []).append((qualname, label))
+
+	def install(self, report_path=None):
+		if self.installed:
+			return
+		self.installed = True
+		self.report_path = report_path
+		self.start = time.perf_counter()
+		sys.meta_path.insert(0, self)
+
+		# modules imported before the profiler was installed, eg. when running with gunicorn
+		for module in list(self._timed_calls):
+			if module in sys.modules:
+				self._wrap_calls(sys.modules[module])
+
+	def install_from_env(self):
+		report_path = os.environ.get(PROFILE_ENV)
+		if report_path:
+			self.install(report_path)
+
+	def uninstall(self):
+		if self in sys.meta_path:
+			sys.meta_path.remove(self)
+		self.installed = False
+
+	def _stack(self):
+		if not hasattr(self._local, "stack"):
+			self._local.stack = []
+		return self._local.stack
+
+	# MetaPathFinder: asks the remaining finders for the spec and times the execution of the module
+	def find_spec(self, name, path, target=None):
+		if getattr(self._local, "finding", False):
+			return None
+
+		self._local.finding = True
+		try:
+			for finder in sys.meta_path[sys.meta_path.index(self) + 1:]:
+				find_spec = getattr(finder, "find_spec", None)
+				spec = find_spec(name, path, target) if find_spec else None
+				if spec is not None:
+					break
+			else:
+				return None
+		finally:
+			self._local.finding = False
+
+		loader = spec.loader
+		# builtin and frozen importers are classes shared by all their modules, do not patch them
+		# same for loaders that are already patched, eg. a zipimporter shared by a whole archive
+		if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module") or "exec_module" in vars(loader):
+			return spec
+
+		exec_module = loader.exec_module
+
+		def timed_exec_module(module):
+			try:
+				self._time(self._record_import, name, exec_module, module)
+			finally:
+				del loader.exec_module
+			self._wrap_calls(module)
+
+		loader.exec_module = timed_exec_module
+		return spec
+
+	def _time(self, record, label, function, *args, **kwargs):
+		stack = self._stack()
+		stack.append(0.0) # accumulates the time of nested entries
+		start = time.perf_counter()
+		try:
+			return function(*args, **kwargs)
+		finally:
+			duration = time.perf_counter() - start
+			nested = stack.pop()
+			if stack:
+				stack[-1] += duration
+			record(label, start - self.start, duration, duration - nested, len(stack))
+
+	def _record_import(self, name, start, cumulative, self_time, depth):
+		self.imports.append({"module": name, "start": start, "cumulative": cumulative, "self": self_time, "depth": depth})
+
+	def _record_call(self, label, start, cumulative, self_time, depth):
+		self.calls.append({"call": label, "start": start, "seconds": cumulative, "self": self_time, "depth": depth})
+
+	def _wrap_calls(self, module):
+		for qualname, label in self._timed_calls.get(module.__name__, []):
+			owner_name, attr = qualname.rsplit(".", 1)
+			owner = getattr(module, owner_name, None)
+			function = getattr(owner, attr, None) if owner is not None else None
+			if function is None or getattr(function, "_startup_profiled", False):
+				continue
+
+			def make_wrapper(function, qualname, label):
+				@functools.wraps(function)
+				def wrapper(*args, **kwargs):
+					if not self.installed:
+						return function(*args, **kwargs)
+					name = qualname
+					if label is not None:
+						try:
+							name = f"{qualname}({label(*args, **kwargs)})"
+						except Exception:
+							pass
+					return self._time(self._record_call, name, function, *args, **kwargs)
+				wrapper._startup_profiled = True
+				return wrapper
+
+			setattr(owner, attr, make_wrapper(function, qualname, label))
+
+	def report(self):
+		total = time.perf_counter() - self.start if self.start is not None else 0.0
+
+		# self time per top level package, eg. how much pyrecest costs including all its submodules
+		packages = {}
+		for entry in self.imports:
+			package = entry["module"].split(".")[0]
+			packages[package] = packages.get(package, 0.0) + entry["self"]
+
+		return {
+			"version": REPORT_VERSION,
+			"created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+			"python": platform.python_version(),
+			"packages_versions": self._versions(packages),
+			"total_seconds": total,
+			"import_seconds": sum(e["self"] for e in self.imports), # module level code, without the timed calls
+			"packages": dict(sorted(packages.items(), key=lambda x: -x[1])),
+			"imports": sorted(self.imports, key=lambda x: -x["cumulative"]),
+			"calls": sorted(self.calls, key=lambda x: x["start"]), # nested calls finish first
+		}
+
+	@staticmethod
+	def _versions(packages):
+		versions = {}
+		for package in packages:
+			try:
+				versions[package] = version(package)
+			except (PackageNotFoundError, ValueError):
+				pass
+		return versions
+
+	# writes the json report and prints the summary, stops profiling
+	def finish(self, report_path=None):
+		if not self.installed:
+			return None
+		self.uninstall()
+
+		report = self.report()
+		report_path = report_path or self.report_path
+		if report_path:
+			with open(report_path, "w", encoding="utf-8") as f:
+				json.dump(report, f, indent="\t")
+
+		print(self.summary(report))
+		if report_path:
+			print(f"Startup profile written to '{report_path}'")
+		return report
+
+	@staticmethod
+	def summary(report, top=15):
+		lines = [f"Startup: {report['total_seconds']:.2f} s total, {report['import_seconds']:.2f} s importing modules", ""]
+
+		lines.append(f"{'package':<40} {'self [s]':>10}")
+		for package, seconds in list(report["packages"].items())[:top]:
+			lines.append(f"{package:<40} {seconds:>10.3f}")
+
+		lines.append("")
+		lines.append(f"{'module':<60} {'cumul. [s]':>10} {'self [s]':>10}")
+		for entry in report["imports"][:top]:
+			lines.append(f"{entry['module']:<60} {entry['cumulative']:>10.3f} {entry['self']:>10.3f}")
+
+		lines.append("")
+		lines.append(f"{'call':<60} {'cumul. [s]':>10} {'self [s]':>10}")
+		for entry in report["calls"]:
+			name = "  " * entry["depth"] + entry["call"]
+			lines.append(f"{name:<60} {entry['seconds']:>10.3f} {entry['self']:>10.3f}")
+
+		return "\n".join(lines)
+
+	# compares the packages and calls of two reports, eg. of two releases
+	@staticmethod
+	def compare(old, new, top=15):
+		lines = [f"Startup: {old['total_seconds']:.2f} s -> {new['total_seconds']:.2f} s ({new['total_seconds'] - old['total_seconds']:+.2f} s)", ""]
+
+		def diff_table(title, old_values, new_values):
+			keys = set(old_values) | set(new_values)
+			rows = sorted(keys, key=lambda k: -abs(new_values.get(k, 0.0) - old_values.get(k, 0.0)))[:top]
+			lines.append(f"{title:<60} {'old [s]':>10} {'new [s]':>10} {'diff [s]':>10}")
+			for k in rows:
+				o, n = old_values.get(k, 0.0), new_values.get(k, 0.0)
+				lines.append(f"{k:<60} {o:>10.3f} {n:>10.3f} {n - o:>+10.3f}")
+			lines.append("")
+
+		def calls(report):
+			totals = {}
+			for entry in report["calls"]:
+				totals[entry["call"]] = totals.get(entry["call"], 0.0) + entry["seconds"]
+			return totals
+
+		diff_table("package", old["packages"], new["packages"])
+		diff_table("call", calls(old), calls(new))
+		return "\n".join(lines)
+
+
+# process wide profiler
+startup_profiler = StartupProfiler()
+
+
+if __name__ == "__main__":
+	report_path = sys.argv[1] if len(sys.argv) > 1 else "startup_profile.json"
+
+	# app.py installs the profiler and writes the report
+	os.environ[PROFILE_ENV] = report_path
+	import app
+
+	if len(sys.argv) > 2:
+		with open(sys.argv[2], encoding="utf-8") as f:
+			old = json.load(f)
+		with open(report_path, encoding="utf-8") as f:
+			new = json.load(f)
+		print()
+		print(StartupProfiler.compare(old, new))
@@ -0,0 +1,84 @@
+import base64
+import math
+import os
+
+import numpy as np
+
+PRECISION_ENV = "WEBAPP_PAYLOAD_PRECISION"
+# float64: exact values
+# float32: floats are sent as float32 if that stays within the error budget, half the bytes
+# decimals: floats are rounded to the decimals of the error budget and sent as json lists, readable eg. in the browser devtools
+PRECISION_MODES = ("float64", "float32", "decimals")
+
+# numpy dtypes plotly.js can decode, with their typed array short names
+PLOTLY_DTYPES = {
+	np.dtype("float64"): "f8",
+	np.dtype("float32"): "f4",
+	np.dtype("int32"): "i4",
+	np.dtype("uint32"): "u4",
+	np.dtype("int16"): "i2",
+	np.dtype("uint16"): "u2",
+	np.dtype("int8"): "i1",
+	np.dtype("uint8"): "u1",
+}
+
+
+class TypedArray:
+	"""
+	Encodes numpy arrays as plotly.js typed array specs ({dtype, bdata, shape}),
+	the base64 of the raw little endian bytes instead of a json list of decimal numbers.
+
+	Plotly only converts arrays like this when they are passed through a figure (go.Figure, go.Scatter3d, ...),
+	values assigned to a Patch are serialized by dash as plain json lists, so callbacks have to encode them.
+	Supported by plotly.js >= 2.28, dash serves the plotly.js of the installed plotly package.
+
+	With a tolerance (the maximum absolute error the plot can afford, eg. the error budget of a manifold),
+	floats are reduced according to the precision mode, set with WEBAPP_PAYLOAD_PRECISION (default float32).
+	"""
+	precision = os.environ.get(PRECISION_ENV, "float32")
+
+	@staticmethod
+	def encode(array, tolerance=None):
+		array = np.asarray(array)
+
+		# an empty bdata string is not recognized as typed array by plotly.js
+		if array.size == 0:
+			return []
+
+		if tolerance is not None and array.dtype.kind == "f":
+			if TypedArray.precision == "decimals":
+				return np.round(array, TypedArray.decimals(tolerance))
+			if TypedArray.precision == "float32" and TypedArray.float32_error(array) <= tolerance:
+				array = array.astype(np.float32)
+
+		# plotly.js does not accept 64 bit integers or bools, send them as floats
+		dtype = array.dtype if array.dtype in PLOTLY_DTYPES else np.dtype("float64")
+
+		# columns of the sample arrays are strided views, bdata needs contiguous little endian bytes
+		data = np.ascontiguousarray(array, dtype=dtype.newbyteorder("<"))
+
+		spec = {
+			"dtype": PLOTLY_DTYPES[dtype],
+			"bdata": base64.b64encode(data).decode("ascii"),
+		}
+		if data.ndim > 1:
+			spec["shape"] = ",".join(str(s) for s in data.shape)
+		return spec
+
+	# largest absolute error of casting the array to float32 (half a unit in the last place of the largest value)
+	@staticmethod
+	def float32_error(array):
+		finite = array[np.isfinite(array)] # nans are the gaps of wireframes
+		if finite.size == 0:
+			return 0.0
+		return float(np.max(np.abs(finite))) * 2.0**-24
+
+	# number of decimals that rounds within tolerance
+	@staticmethod
+	def decimals(tolerance):
+		return max(0, math.ceil(-math.log10(2 * tolerance)))
+
+
+if TypedArray.precision not in PRECISION_MODES:
+	print(f"Unknown {PRECISION_ENV} '{TypedArray.precision}', expected one of {PRECISION_MODES}, using float64")
+	TypedArray.precision = "float64"
@@ -0,0 +1,167 @@
+import numpy as np
+
+# neglected wraps contribute less than this, relative to the peak of the density
+# matches the error budget of the plotted densities (see Manifold.density_tolerance)
+WRAP_TOLERANCE = 1e-4
+# the fourier series is cut where its coefficients drop below this fraction of the tolerance,
+# the neglected coefficients of wide distributions decay slowly and add up
+FOURIER_MARGIN = 0.1
+# points per block of the correlated kernel, bounds the temporary (points x wraps) arrays
+CHUNK_SIZE = 8192
+
+
+class WrappedNormalUtil:
+	"""
+	Density of 2d normal distributions wrapped on periodic axes (torus: both axes, cylinder: the first one).
+
+	There are two forms of the wrapped normal, both summed until the neglected terms are below tolerance:
+	- spatial: the sum over all shifted copies of the normal, few copies for narrow distributions
+	- fourier: the fourier series (theta function), coefficients exp(-nᵀΣn / 2), few terms for wide distributions
+	Every evaluation uses the form with fewer terms, so the cost stays bounded for all σ.
+
+	All terms are evaluated in one broadcast pass over (points x terms).
+	If the axes are uncorrelated the sum factors into one 1d sum per axis,
+	with one periodic axis it factors into the normal of the other axis and the wrapped conditional.
+	"""
+
+	# number of wraps in each direction, so that the first neglected copy is below tolerance everywhere
+	# differences to the mean are reduced to [-π, π), so the nearest neglected copy is at least 2πk + π away
+	# the marginal sigma bounds the quadratic form of correlated distributions as well
+	@staticmethod
+	def wraps(sigma, tolerance=WRAP_TOLERANCE):
+		reach = sigma * np.sqrt(-2 * np.log(tolerance)) # distance at which a copy drops below tolerance
+		return max(0, int(np.ceil((reach - np.pi) / (2 * np.pi))))
+
+	# highest frequency of the 1d fourier series with a coefficient exp(-n²σ² / 2) above the margin
+	@staticmethod
+	def frequencies(sigma, tolerance=WRAP_TOLERANCE):
+		return int(np.floor(np.sqrt(-2 * np.log(FOURIER_MARGIN * tolerance)) / sigma))
+
+	# density at the points x (n, 2), scaled so that its maximum over the points is 1
+	# periodic marks the wrapped axes, (True, True) or one of them
+	# computed in the log domain, so narrow and degenerate (σ = 0, |ρ| = 1) distributions still have a maximum
+	@staticmethod
+	def relative_density(x, mean, cov, periodic=(True, True), tolerance=WRAP_TOLERANCE):
+		x = np.asarray(x, dtype=float)
+		if x.shape[0] == 0:
+			return np.zeros(0)
+
+		cov = WrappedNormalUtil.regularize(cov)
+		periodic = np.asarray(periodic, dtype=bool)
+
+		# differences to the nearest copy of the mean
+		d = x - np.asarray(mean, dtype=float)
+		d[:, periodic] = WrappedNormalUtil.reduce(d[:, periodic])
+
+		sigma = np.sqrt(np.diag(cov))
+
+		if not periodic.all():
+			# normal of the linear axis b times the wrapped conditional of the periodic axis a
+			a, b = (0, 1) if periodic[0] else (1, 0)
+			slope = cov[a, b] / cov[b, b]
+			sigma_conditional = np.sqrt(cov[a, a] - slope * cov[a, b])
+			d_conditional = WrappedNormalUtil.reduce(d[:, a] - slope * d[:, b])
+			log_density = WrappedNormalUtil.log_wrapped_1d(d_conditional, sigma_conditional, tolerance) - 0.5 * np.square(d[:, b] / sigma[b])
+		elif cov[0, 1] == 0:
+			# separable, product of two 1d wrapped normals
+			log_density = WrappedNormalUtil.log_wrapped_1d(d[:, 0], sigma[0], tolerance) + WrappedNormalUtil.log_wrapped_1d(d[:, 1], sigma[1], tolerance)
+		else:
+			log_density = WrappedNormalUtil.log_wrapped_2d(d, cov, tolerance)
+
+		return np.exp(log_density - np.max(log_density))
+
+	# log of the unnormalized wrapped 1d normal at the differences d in [-π, π)
+	@staticmethod
+	def log_wrapped_1d(d, sigma, tolerance=WRAP_TOLERANCE):
+		k = WrappedNormalUtil.wraps(sigma, tolerance)
+		n = WrappedNormalUtil.frequencies(sigma, tolerance)
+
+		if n < 2 * k + 1:
+			# 1 + 2 Σ exp(-n²σ² / 2) cos(n d), proportional to the spatial sum
+			frequencies = np.arange(1, n + 1)
+			coefficients = np.exp(-0.5 * np.square(frequencies * sigma))
+			return WrappedNormalUtil.log_fourier(d[:, np.newaxis] * frequencies, coefficients)
+
+		offsets = 2 * np.pi * np.arange(-k, k + 1)
+		shifted = (d[:, np.newaxis] + offsets) / sigma
+		return WrappedNormalUtil.log_sum_gaussians(np.square(shifted, out=shifted))
+
+	# log of the unnormalized wrapped 2d normal at the differences d (n, 2) in [-π, π)²
+	@staticmethod
+	def log_wrapped_2d(d, cov, tolerance=WRAP_TOLERANCE):
+		sigma = np.sqrt(np.diag(cov))
+		k = [WrappedNormalUtil.wraps(s, tolerance) for s in sigma]
+		spatial_terms = (2 * k[0] + 1) * (2 * k[1] + 1)
+
+		# frequencies with nᵀΣn <= bound fill an ellipse of area π bound / sqrt(det Σ), half of them are needed
+		bound = -2 * np.log(FOURIER_MARGIN * tolerance)
+		if np.pi * bound / (2 * np.sqrt(np.linalg.det(cov))) < spatial_terms:
+			frequencies = WrappedNormalUtil.frequencies_2d(cov, bound)
+			coefficients = np.exp(-0.5 * np.einsum("ij,jk,ik->i", frequencies, cov, frequencies))
+			return WrappedNormalUtil.log_fourier(d @ frequencies.T, coefficients)
+
+		o_0, o_1 = np.meshgrid(2 * np.pi * np.arange(-k[0], k[0] + 1), 2 * np.pi * np.arange(-k[1], k[1] + 1), indexing="ij")
+		o_0, o_1 = o_0.ravel(), o_1.ravel()
+		precision = np.linalg.inv(cov)
+		p_00, p_01, p_11 = precision[0, 0], precision[0, 1], precision[1, 1]
+
+		log_density = np.empty(d.shape[0])
+		for start in range(0, d.shape[0], CHUNK_SIZE):
+			d_0 = d[start:start + CHUNK_SIZE, 0, np.newaxis] + o_0 # (chunk, wraps)
+			d_1 = d[start:start + CHUNK_SIZE, 1, np.newaxis] + o_1
+			q = p_00 * d_0 * d_0
+			q += 2 * p_01 * d_0 * d_1
+			d_1 *= d_1
+			q += p_11 * d_1
+			log_density[start:start + CHUNK_SIZE] = WrappedNormalUtil.log_sum_gaussians(q)
+		return log_density
+
+	# integer frequencies n != 0 with nᵀΣn <= bound, one of each pair ±n (the series is symmetric)
+	@staticmethod
+	def frequencies_2d(cov, bound):
+		# bounding box of the ellipse
+		extent = np.floor(np.sqrt(bound * np.diag(np.linalg.inv(cov)))).astype(int)
+		n_0, n_1 = np.meshgrid(np.arange(0, extent[0] + 1), np.arange(-extent[1], extent[1] + 1), indexing="ij")
+		frequencies = np.column_stack((n_0.ravel(), n_1.ravel()))
+
+		half = (frequencies[:, 0] > 0) | ((frequencies[:, 0] == 0) & (frequencies[:, 1] > 0))
+		frequencies = frequencies[half]
+		inside = np.einsum("ij,jk,ik->i", frequencies, cov, frequencies) <= bound
+		return frequencies[inside]
+
+	# log(1 + 2 Σ coefficients cos(phases)) over the terms (axis 1) of the phases (points x terms), overwrites phases
+	# truncation can leave values slightly below zero where the density is below tolerance anyway
+	@staticmethod
+	def log_fourier(phases, coefficients):
+		np.cos(phases, out=phases)
+		series = 1 + 2 * (phases @ coefficients)
+		return np.log(np.maximum(series, np.finfo(float).tiny))
+
+	# log(sum(exp(-q / 2))) over the wraps (axis 1) of the quadratic forms q, overwrites q
+	# shifted by the smallest q of each point, so the nearest copy never underflows
+	# far copies of narrow ridges are clamped to exp(-700), subnormal results make exp many times slower
+	@staticmethod
+	def log_sum_gaussians(q):
+		q_min = np.min(q, axis=1)
+		q -= q_min[:, np.newaxis]
+		np.minimum(q, 1400, out=q)
+		q *= -0.5
+		np.exp(q, out=q)
+		return np.log(np.sum(q, axis=1)) - 0.5 * q_min
+
+	# angles to [-π, π)
+	@staticmethod
+	def reduce(angles):
+		return (angles + np.pi) % (2 * np.pi) - np.pi
+
+	# sliders allow σ = 0 and |ρ| = 1, a tiny jitter keeps the covariance invertible
+	# the density then is a very narrow ridge instead of a line
+	@staticmethod
+	def regularize(cov):
+		cov = np.array(cov, dtype=float)
+		jitter = 1e-9 * max(np.trace(cov), 1.0)
+		if cov[0, 1] == 0:
+			return cov + jitter * np.eye(2)
+		if np.linalg.det(cov) <= jitter * np.trace(cov):
+			cov = cov + jitter * np.eye(2)
+		return cov